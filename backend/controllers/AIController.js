@@ -32,7 +32,7 @@ class AIController {
    * POST /api/ai/grammar
    */
   grammarCheck = asyncHandler(async (req, res) => {
-    const { text, language = 'en' } = req.body;
+    const { text, language = 'en', incremental = false } = req.body;
 
     // Validate input
     if (!text || typeof text !== 'string' || text.trim().length === 0) {
@@ -65,7 +65,9 @@ class AIController {
       // Call ML service through client
       const mlData = await mlClient.grammarCheck({
         text: text.trim(),
-        language: language
+        language: language,
+        // Re-checks of an edited document only send changed paragraphs to the LLM
+        incremental: incremental === true
       });
 
       const correctedText = mlData.corrected_text;
@@ -1,5 +1,20 @@
+const crypto = require('crypto');
 const axios = require('axios');
 
+// Seconds each job status request may be held by the ML service (long-poll)
+const JOB_POLL_SECONDS = 30;
+// Longest a job is followed before giving up (matches the client timeout)
+const JOB_TIMEOUT_MS = 180000;
+// HTTP status the synchronous endpoints answer with, by error code of a failed job
+const JOB_ERROR_STATUS = {
+  LLM_UNAVAILABLE: 503,
+  LLM_TIMEOUT: 503,
+  LLM_ERROR: 503,
+  DETECTION_FAILED: 500,
+  SERVICE_ERROR: 500,
+  JOB_FAILED: 500,
+};
+
 /**
  * ML Service Client
  *
@@ -14,6 +29,9 @@ const axios = require('axios');
  * - Centralized error handling
  * - Health check capability
  * - Request/response interceptors
+ * - W3C trace context (traceparent) on every request
+ * - Humanization and AI detection run as ML service jobs (no connection held
+ *   open for the whole LLM call) when the jobs API is mounted
  */
 class MLClient {
   constructor() {
@@ -34,12 +52,24 @@ class MLClient {
       },
     });
 
+    // Start a W3C trace for each ML call (unless the caller passed one) so the
+    // ML service's spans and our error logs share a trace ID
+    this.client.interceptors.request.use((config) => {
+      if (!config.headers.traceparent) {
+        const traceId = crypto.randomBytes(16).toString('hex');
+        const spanId = crypto.randomBytes(8).toString('hex');
+        config.headers.traceparent = `00-${traceId}-${spanId}-01`;
+      }
+      return config;
+    });
+
     // Add response interceptor for error handling
     this.client.interceptors.response.use(
       (response) => response,
       (error) => {
         const response = error.response;
-        const url = error.config?.url;
+        const traceId = error.config?.headers?.traceparent?.split('-')[1];
+        const url = `${error.config?.url}${traceId ? ` trace=${traceId}` : ''}`;
         
         if (response) {
           // ML Service responded with an error status (4xx, 5xx)
@@ -127,9 +157,9 @@ class MLClient {
   async humanize(data) {
     try {
       console.log('Sending humanize request to ML service:', data);
-      const response = await this.client.post('/humanize', data);
-      console.log('Received response from ML service:', response.status, response.data);
-      return response.data;
+      const result = await this.runJobOrPost('humanize', '/humanize', data);
+      console.log('Received response from ML service:', result);
+      return result;
     } catch (error) {
       console.error('Humanization failed:', error.message);
       console.error('Error details:', error.response?.data || error);
@@ -162,13 +192,99 @@ class MLClient {
    */
   async aiDetection(data) {
     try {
-      const response = await this.client.post('/ai-detect/check', data);
-      return response.data;
+      return await this.runJobOrPost('ai-detect', '/ai-detect/check', data);
     } catch (error) {
       console.error('AI detection failed:', error.message);
       throw error;
     }
   }
+
+  /**
+   * Submit a long-running request as a background job
+   * @param {string} kind - Job kind: 'humanize', 'ai-detect', 'translate' or 'grammar'
+   * @param {Object} data - Request data for the corresponding service
+   * @returns {Promise<Object>} { jobId, status }
+   */
+  async submitJob(kind, data) {
+    try {
+      const response = await this.client.post(`/jobs/${kind}`, data);
+      return response.data;
+    } catch (error) {
+      console.error(`Job submission (${kind}) failed:`, error.message);
+      throw error;
+    }
+  }
+
+  /**
+   * Get a job's status, optionally long-polling until it finishes
+   * @param {string} jobId - Job identifier returned by submitJob
+   * @param {number} waitSeconds - Seconds the ML service may hold the request (max 60)
+   * @returns {Promise<Object>} { jobId, kind, status, result, error }
+   */
+  async getJob(jobId, waitSeconds = 0) {
+    try {
+      const response = await this.client.get(`/jobs/${jobId}`, { params: { wait: waitSeconds } });
+      return response.data;
+    } catch (error) {
+      console.error(`Job status (${jobId}) failed:`, error.message);
+      throw error;
+    }
+  }
+
+  /**
+   * Submit a job and long-poll it until it finishes
+   * @param {string} kind - Job kind (see submitJob)
+   * @param {Object} data - Request data for the corresponding service
+   * @param {number} timeoutMs - Give up after this long
+   * @returns {Promise<Object>} The job result (same shape as the synchronous response)
+   * @throws {Error} With status and data like a synchronous call's error if the job failed
+   */
+  async runJob(kind, data, timeoutMs = JOB_TIMEOUT_MS) {
+    const deadline = Date.now() + timeoutMs;
+    const { jobId } = await this.submitJob(kind, data);
+
+    for (;;) {
+      const remaining = deadline - Date.now();
+      if (remaining <= 0) {
+        const timeoutError = new Error(`ML job ${jobId} timed out`);
+        timeoutError.status = 503;
+        throw timeoutError;
+      }
+
+      const job = await this.getJob(jobId, Math.min(JOB_POLL_SECONDS, Math.ceil(remaining / 1000)));
+      if (job.status === 'completed') {
+        return job.result;
+      }
+      if (job.status === 'failed') {
+        const detail = job.error || {};
+        const jobError = new Error(detail.message || `ML job ${jobId} failed`);
+        jobError.status = JOB_ERROR_STATUS[detail.error] || 400;
+        jobError.data = { detail };
+        throw jobError;
+      }
+    }
+  }
+
+  /**
+   * Run a request as a job, or post it synchronously if the jobs API is not
+   * mounted (the ML service runs several workers or has JOBS_ENABLED=false)
+   * @param {string} kind - Job kind
+   * @param {string} path - Synchronous endpoint for the same request
+   * @param {Object} data - Request data
+   * @returns {Promise<Object>} ML service response
+   */
+  async runJobOrPost(kind, path, data) {
+    try {
+      return await this.runJob(kind, data);
+    } catch (error) {
+      // Unknown route (FastAPI's plain "Not Found"), unlike a job that expired
+      if (error.status === 404 && typeof error.data?.detail !== 'object') {
+        const response = await this.client.post(path, data);
+        return response.data;
+      }
+      throw error;
+    }
+  }
 }
 
 // Create and export singleton instance
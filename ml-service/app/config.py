@@ -5,5 +5,143 @@ This module defines global constants for Ollama model configuration
 to ensure consistent model usage across the application.
 """
 
-OLLAMA_URL = "http://localhost:11434"
-OLLAMA_MODEL = "mistral"
\ No newline at end of file
+import os
+
+OLLAMA_URL = os.getenv("OLLAMA_URL", "http://localhost:11434")
+OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "mistral")
+
+# Ollama backend pool: comma-separated server URLs (defaults to OLLAMA_URL).
+# Requests go to the least-loaded healthy backend.
+OLLAMA_URLS = [url.strip() for url in os.getenv("OLLAMA_URLS", OLLAMA_URL).split(",") if url.strip()]
+# Pin models to backends: "mistral=http://gpu1:11434,http://gpu2:11434;phi3=http://cpu1:11434"
+OLLAMA_MODEL_PINS = os.getenv("OLLAMA_MODEL_PINS", "")
+# Active health check period in seconds (multi-backend pools only; 0 disables)
+OLLAMA_HEALTH_INTERVAL = float(os.getenv("OLLAMA_HEALTH_INTERVAL", "15"))
+# Consecutive failures that eject a backend, and how long it stays out (seconds)
+OLLAMA_EJECT_FAILURES = int(os.getenv("OLLAMA_EJECT_FAILURES", "3"))
+OLLAMA_EJECT_SECONDS = float(os.getenv("OLLAMA_EJECT_SECONDS", "30"))
+
+# Shared model host: when set (e.g. "127.0.0.1:50055"), HTTP workers forward
+# plagiarism/translation inference to a single process that owns the models
+# instead of loading their own copy. The manager socket unpickles what it
+# receives, so MODEL_HOST_AUTHKEY is required (no default) whenever it is used.
+MODEL_HOST_ADDRESS = os.getenv("MODEL_HOST_ADDRESS", "")
+MODEL_HOST_AUTHKEY = os.getenv("MODEL_HOST_AUTHKEY", "").encode()
+
+# Inference pool: number of worker processes running CPU-bound model work
+# (embeddings, MarianMT). 0 runs it in the server's thread pool instead.
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "0"))
+# torch intra-op threads per inference worker (0 keeps torch's default)
+TORCH_INTRA_OP_THREADS = int(os.getenv("TORCH_INTRA_OP_THREADS", "0"))
+
+# Model routing tiers: with OLLAMA_FAST_MODEL set (e.g. "llama3.2:1b"), the
+# listed operations use it for inputs up to OLLAMA_FAST_MAX_WORDS words, or up to
+# OLLAMA_FAST_PRESSURE_MAX_WORDS while OLLAMA_FAST_QUEUE_DEPTH calls are queued
+OLLAMA_FAST_MODEL = os.getenv("OLLAMA_FAST_MODEL", "")
+OLLAMA_FAST_OPERATIONS = [op.strip() for op in os.getenv("OLLAMA_FAST_OPERATIONS", "grammar,translate").split(",") if op.strip()]
+OLLAMA_FAST_MAX_WORDS = int(os.getenv("OLLAMA_FAST_MAX_WORDS", "60"))
+OLLAMA_FAST_QUEUE_DEPTH = int(os.getenv("OLLAMA_FAST_QUEUE_DEPTH", "4"))
+OLLAMA_FAST_PRESSURE_MAX_WORDS = int(os.getenv("OLLAMA_FAST_PRESSURE_MAX_WORDS", "300"))
+
+# Maximum concurrent Ollama requests per backend from one process; extra calls
+# queue. Match this to the Ollama servers' OLLAMA_NUM_PARALLEL.
+OLLAMA_MAX_CONCURRENCY = int(os.getenv("OLLAMA_MAX_CONCURRENCY", "2"))
+
+# Context size (num_ctx) sent with every LLM request. Fixed rather than sized
+# per call: Ollama reloads the model whenever num_ctx changes
+OLLAMA_NUM_CTX = int(os.getenv("OLLAMA_NUM_CTX", "4096"))
+
+# AI detection splits texts longer than this many words into windows that fit
+# the model context (OLLAMA_NUM_CTX minus the instruction prompt and the reply)
+AI_DETECTION_CHUNK_WORDS = int(os.getenv("AI_DETECTION_CHUNK_WORDS", "800"))
+
+# Stylometric fast path: answer AI detection locally when the score is at or
+# beyond the threshold (>= threshold or <= 100 - threshold); otherwise ask the LLM.
+# Off by default, and only takes effect with a trained STYLOMETRY_MODEL_PATH
+# (scripts/train_stylometry.py): the built-in weights are placeholders
+AI_DETECTION_FAST_PATH = os.getenv("AI_DETECTION_FAST_PATH", "false").lower() in ("1", "true", "yes")
+AI_DETECTION_FAST_PATH_THRESHOLD = float(os.getenv("AI_DETECTION_FAST_PATH_THRESHOLD", "90"))
+# JSON logistic model for the stylometric classifier (scripts/train_stylometry.py);
+# without one, stylometric scores are not used anywhere
+STYLOMETRY_MODEL_PATH = os.getenv("STYLOMETRY_MODEL_PATH", "")
+# Detection results kept (LRU) so repeated checks of the same text are free
+AI_DETECTION_CACHE_SIZE = int(os.getenv("AI_DETECTION_CACHE_SIZE", "1024"))
+
+# Structured LLM output: "schema" sends the JSON schema as Ollama's `format`
+# (Ollama >= 0.5), "json" sends format=json, "off" relies on prompting alone
+OLLAMA_STRUCTURED_OUTPUT = os.getenv("OLLAMA_STRUCTURED_OUTPUT", "schema").lower()
+
+# How long Ollama keeps a model (and its cached prompt prefix) loaded after a
+# call, sent as `keep_alive` on every request (e.g. "30m", "1h", "-1" = forever)
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+if OLLAMA_KEEP_ALIVE.lstrip("-").isdigit():
+    # Bare numbers are seconds and must be sent as JSON numbers
+    OLLAMA_KEEP_ALIVE = int(OLLAMA_KEEP_ALIVE)
+
+# Model residency: load these models on every backend at startup (default: the
+# configured default and fast models), and keep a model warm with a load-only
+# heartbeat every OLLAMA_KEEP_WARM_INTERVAL seconds while it has seen real
+# traffic in the last OLLAMA_KEEP_WARM_WINDOW seconds (interval 0 = off)
+OLLAMA_PRELOAD = os.getenv("OLLAMA_PRELOAD", "true").lower() in ("1", "true", "yes")
+OLLAMA_PRELOAD_MODELS = [m.strip() for m in os.getenv("OLLAMA_PRELOAD_MODELS", "").split(",") if m.strip()] or [
+    m for m in (OLLAMA_MODEL, OLLAMA_FAST_MODEL) if m
+]
+OLLAMA_KEEP_WARM_INTERVAL = float(os.getenv("OLLAMA_KEEP_WARM_INTERVAL", "300"))
+OLLAMA_KEEP_WARM_WINDOW = float(os.getenv("OLLAMA_KEEP_WARM_WINDOW", "3600"))
+
+# Startup warm-up: before /health/ready reports ready, run a synthetic request
+# through the embedding model and each listed MarianMT pair ("all" = every OPUS
+# pair, empty = none); false only loads the embedding model, without inference
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "true").lower() in ("1", "true", "yes")
+WARMUP_TRANSLATION_PAIRS = [p.strip() for p in os.getenv("WARMUP_TRANSLATION_PAIRS", "all").split(",") if p.strip()]
+# Whether readiness also requires a reachable Ollama backend with the preloaded
+# models (OLLAMA_PRELOAD_MODELS) loaded
+READINESS_REQUIRE_OLLAMA = os.getenv("READINESS_REQUIRE_OLLAMA", "true").lower() in ("1", "true", "yes")
+
+# Incremental grammar checks: longest unit (chars) sent to the LLM on its own,
+# and how many corrected units are cached for re-checks of edited texts
+GRAMMAR_UNIT_CHARS = int(os.getenv("GRAMMAR_UNIT_CHARS", "1200"))
+GRAMMAR_CACHE_SIZE = int(os.getenv("GRAMMAR_CACHE_SIZE", "4096"))
+
+# Humanization rewrites texts paragraph by paragraph in parallel; paragraphs
+# longer than this many characters are split into runs of sentences
+HUMANIZE_UNIT_CHARS = int(os.getenv("HUMANIZE_UNIT_CHARS", "1200"))
+
+# AI-calibrated humanization: deadline in seconds from the start of a request
+# after which no more calibration is attempted (0 = off), and the number of
+# candidate rewrites generated in parallel per calibration pass
+HUMANIZE_CALIBRATION_BUDGET = float(os.getenv("HUMANIZE_CALIBRATION_BUDGET", "30"))
+HUMANIZE_CALIBRATION_CANDIDATES = int(os.getenv("HUMANIZE_CALIBRATION_CANDIDATES", "2"))
+
+# Uvicorn worker processes started by run.py
+WORKERS = int(os.getenv("WORKERS", "1"))
+
+# Async job API: concurrent jobs and how long finished results are kept (seconds).
+# Jobs live in process memory, so a poll only finds a job on the worker that took
+# it: the API is on by default with one HTTP worker and off with WORKERS > 1,
+# where an explicit JOBS_ENABLED=true is ignored with a warning
+JOBS_REQUESTED = os.getenv("JOBS_ENABLED", "true" if WORKERS <= 1 else "false").lower() in ("1", "true", "yes")
+JOBS_ENABLED = JOBS_REQUESTED and WORKERS <= 1
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_RESULT_TTL = int(os.getenv("JOB_RESULT_TTL", "900"))
+
+# Batch endpoints: maximum items per request, and texts per padded MarianMT generate
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "256"))
+TRANSLATION_BATCH_SIZE = int(os.getenv("TRANSLATION_BATCH_SIZE", "16"))
+
+# Document pipeline: characters per processed chunk, chunks in flight per
+# document, and the largest accepted upload (bytes)
+DOCUMENT_CHUNK_CHARS = int(os.getenv("DOCUMENT_CHUNK_CHARS", "2000"))
+DOCUMENT_MAX_IN_FLIGHT = int(os.getenv("DOCUMENT_MAX_IN_FLIGHT", "2"))
+DOCUMENT_MAX_BYTES = int(os.getenv("DOCUMENT_MAX_BYTES", str(50 * 1024 * 1024)))
+
+# Admin profiling: token required in X-Admin-Token to use /admin/profiling
+# (empty disables it), sampling interval, and the longest window profile
+PROFILING_TOKEN = os.getenv("PROFILING_TOKEN", "")
+PROFILING_INTERVAL_MS = int(os.getenv("PROFILING_INTERVAL_MS", "5"))
+PROFILING_MAX_SECONDS = int(os.getenv("PROFILING_MAX_SECONDS", "300"))
+
+# Distributed tracing (needs opentelemetry-sdk and the OTLP HTTP exporter);
+# spans go to OTEL_EXPORTER_OTLP_ENDPOINT (default http://localhost:4318)
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "false").lower() in ("1", "true", "yes")
+TRACING_SERVICE_NAME = os.getenv("TRACING_SERVICE_NAME", "verbalq-ml-service")
@@ -9,6 +9,8 @@ This application provides REST endpoints for various NLP operations:
 """
 
 from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 import time
 import os
@@ -16,8 +18,27 @@ import os
 # Disable Hugging Face symlinks warning on Windows
 os.environ["HF_HUB_DISABLE_SYMLINKS_WARNING"] = "1"
 
-from .routers import grammar, translation, humanize, plagiarism, ai_detection
-from .models.schemas import HealthResponse, LanguageResponse, TranslationLanguagesResponse
+from .routers import grammar, translation, humanize, plagiarism, ai_detection, jobs, documents, profiling
+from .config import JOBS_ENABLED, JOBS_REQUESTED, WORKERS
+from .models.schemas import HealthResponse, LanguageResponse, ReadinessResponse
+from .services.inference_pool import inference_pool
+from .services.model_warmer import model_warmer
+from .services.readiness import readiness
+from .utils.metrics import metrics
+from .utils.profiler import profiler
+from .utils.responses import FastJSONResponse, StaticResponse, model_response
+from .utils.tracing import server_span, set_attributes
+
+
+HTTP_REQUESTS = metrics.counter(
+    "ml_http_requests_total", "HTTP requests by method, route and status", ["method", "route", "status"]
+)
+HTTP_REQUEST_SECONDS = metrics.histogram(
+    "ml_http_request_duration_seconds", "HTTP request latency by route", ["method", "route"]
+)
+HTTP_IN_FLIGHT = metrics.gauge(
+    "ml_http_requests_in_flight", "HTTP requests currently being served"
+)
 
 
 # Create FastAPI application
@@ -26,7 +47,8 @@ app = FastAPI(
     description="AI-powered NLP services for text processing",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=FastJSONResponse,
 )
 
 # Configure CORS for local development
@@ -44,6 +66,61 @@ app.include_router(translation.router)
 app.include_router(humanize.router)
 app.include_router(plagiarism.router)
 app.include_router(ai_detection.router)
+if JOBS_ENABLED:
+    # The job store is per process: single-worker deployments only
+    app.include_router(jobs.router)
+elif JOBS_REQUESTED:
+    print(f"⚠️ JOBS_ENABLED ignored with WORKERS={WORKERS}: the in-memory job store needs one worker, /jobs is not mounted")
+app.include_router(documents.router)
+app.include_router(profiling.router)
+
+
+@app.on_event("startup")
+async def warm_up_models():
+    """
+    Load and warm up the embedding and MarianMT models in the background;
+    /health/ready reports the worker ready once this is done.
+    """
+    readiness.start()
+
+
+@app.on_event("startup")
+async def start_model_warmer():
+    """Load the Ollama models in the background and start keep-warm heartbeats."""
+    model_warmer.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_inference_pool():
+    """Stop inference worker processes when the server shuts down."""
+    inference_pool.shutdown()
+
+
+# Constant responses, serialized once
+HEALTH_RESPONSE = StaticResponse(HealthResponse(
+    status="OK",
+    version="1.0.0",
+    services={
+        "grammar": "LanguageTool",
+        "translation": "MarianMT",
+        "humanization": "BART",
+        "plagiarism": "TF-IDF + Cosine Similarity"
+    }
+))
+LIVENESS_RESPONSE = StaticResponse({"status": "alive"})
+LANGUAGES_RESPONSE = StaticResponse(LanguageResponse(
+    success=True,
+    languages=[
+        {"code": "en", "name": "English"},
+        {"code": "hi", "name": "Hindi"},
+        {"code": "fr", "name": "French"},
+        {"code": "de", "name": "German"},
+        {"code": "es", "name": "Spanish"},
+        {"code": "ko", "name": "Korean"},
+        {"code": "ar", "name": "Arabic"},
+        {"code": "zh", "name": "Chinese"}
+    ]
+))
 
 
 @app.get("/health", response_model=HealthResponse)
@@ -53,16 +130,30 @@ async def health_check():
 
     Returns service status and version information.
     """
-    return HealthResponse(
-        status="OK",
-        version="1.0.0",
-        services={
-            "grammar": "LanguageTool",
-            "translation": "MarianMT",
-            "humanization": "BART",
-            "plagiarism": "TF-IDF + Cosine Similarity"
-        }
-    )
+    return HEALTH_RESPONSE()
+
+
+@app.get("/health/live")
+async def liveness_check():
+    """
+    Liveness probe: the process is up and its event loop is responsive.
+
+    Does not depend on models or Ollama; restart the worker only if this fails.
+    """
+    return LIVENESS_RESPONSE()
+
+
+@app.get("/health/ready", response_model=ReadinessResponse, responses={503: {"model": ReadinessResponse}})
+async def readiness_check():
+    """
+    Readiness probe: 200 once the startup warm-up has run a synthetic request
+    through the embedding model and each MarianMT pair and (unless
+    READINESS_REQUIRE_OLLAMA=false) Ollama is reachable with its preloaded
+    models warm; 503 with the per-component state otherwise.
+    """
+    # May probe Ollama over HTTP
+    status = await run_in_threadpool(readiness.status)
+    return model_response(ReadinessResponse(**status), status_code=200 if status["ready"] else 503)
 
 
 @app.get("/languages", response_model=LanguageResponse)
@@ -70,50 +161,16 @@ async def get_languages():
     """
     Get list of supported languages for all services.
     """
-    languages = [
-        {"code": "en", "name": "English"},
-        {"code": "hi", "name": "Hindi"},
-        {"code": "fr", "name": "French"},
-        {"code": "de", "name": "German"},
-        {"code": "es", "name": "Spanish"},
-        {"code": "ko", "name": "Korean"},
-        {"code": "ar", "name": "Arabic"},
-        {"code": "zh", "name": "Chinese"}
-    ]
-    
-    return LanguageResponse(
-        success=True,
-        languages=languages
-    )
-
-
-@app.get("/translate/languages", response_model=TranslationLanguagesResponse)
-async def get_translation_languages():
-    """
-    Get supported translation language pairs.
-    """
-    # Common translation pairs
-    supported_pairs = [
-        {"from_lang": "en", "to_lang": "es"},
-        {"from_lang": "en", "to_lang": "fr"},
-        {"from_lang": "en", "to_lang": "de"},
-        {"from_lang": "en", "to_lang": "hi"},
-        {"from_lang": "en", "to_lang": "ar"},
-        {"from_lang": "en", "to_lang": "zh"},
-        {"from_lang": "en", "to_lang": "ko"},
-        {"from_lang": "es", "to_lang": "en"},
-        {"from_lang": "fr", "to_lang": "en"},
-        {"from_lang": "de", "to_lang": "en"},
-        {"from_lang": "hi", "to_lang": "en"},
-        {"from_lang": "ar", "to_lang": "en"},
-        {"from_lang": "zh", "to_lang": "en"},
-        {"from_lang": "ko", "to_lang": "en"}
-    ]
-    
-    return TranslationLanguagesResponse(
-        success=True,
-        supportedPairs=supported_pairs
-    )
+    return LANGUAGES_RESPONSE()
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics():
+    """
+    Prometheus metrics: per-route HTTP latency, Ollama queue wait and stage
+    timings, model encode/generate times, cache hits and model load times.
+    """
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
 
 
 @app.middleware("http")
@@ -123,9 +180,42 @@ async def add_process_time_header(request: Request, call_next):
     Useful for monitoring and debugging.
     """
     start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
+    with server_span(request.method, request.url.path, request.headers) as current:
+        with HTTP_IN_FLIGHT.track_inprogress():
+            response = await call_next(request)
+        process_time = time.time() - start_time
+        response.headers["X-Process-Time"] = str(process_time)
+
+        # Label by route template (not raw path) to keep cardinality bounded
+        route = request.scope.get("route")
+        route_path = getattr(route, "path", "unmatched")
+        if current is not None:
+            current.update_name(f"{request.method} {route_path}")
+            set_attributes(current, **{"http.route": route_path, "http.status_code": response.status_code})
+    HTTP_REQUESTS.inc(method=request.method, route=route_path, status=str(response.status_code))
+    HTTP_REQUEST_SECONDS.observe(process_time, method=request.method, route=route_path)
+    return response
+
+
+@app.middleware("http")
+async def profile_request(request: Request, call_next):
+    """
+    Profile a single request when it carries X-Profile with the admin token.
+
+    The profile ID is returned in X-Profile-Id; download it from
+    /admin/profiling/{id}. Sampling is process-wide, so concurrent requests
+    show up in the same profile.
+    """
+    token = request.headers.get("x-profile")
+    if token is None or not profiling.is_authorized(token):
+        return await call_next(request)
+
+    session = profiler.start("request", label=f"{request.method} {request.url.path}")
+    try:
+        response = await call_next(request)
+    finally:
+        profiler.stop(session.id)
+    response.headers["X-Profile-Id"] = session.id
     return response
 
 
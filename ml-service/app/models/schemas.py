@@ -1,6 +1,8 @@
-from pydantic import BaseModel, Field, validator
-from typing import List, Optional, Literal
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, ValidationInfo, field_validator
+from typing import Any, Dict, List, Optional, Literal
 from enum import Enum
+from ..config import BATCH_MAX_ITEMS
+from ..utils.normalization import NormalizedText, analyze_text, normalize_text, strip_text
 
 
 class ToneEnum(str, Enum):
@@ -25,12 +27,15 @@ class LanguageEnum(str, Enum):
 class GrammarCheckRequest(BaseModel):
     text: str = Field(..., min_length=1, max_length=10000, description="Text to check for grammar issues")
     language: LanguageEnum = Field(default=LanguageEnum.en, description="Language code for grammar checking")
+    incremental: bool = Field(
+        default=False,
+        description="Check paragraph by paragraph, reusing cached corrections for unchanged paragraphs",
+    )
 
-    @validator('text')
-    def validate_text(cls, v):
-        if not v.strip():
-            raise ValueError('Text cannot be empty or only whitespace')
-        return v.strip()
+    @field_validator('text')
+    @classmethod
+    def validate_text(cls, v: str) -> str:
+        return strip_text(v)
 
 
 class GrammarIssue(BaseModel):
@@ -46,7 +51,7 @@ class GrammarCheckResponse(BaseModel):
     # Optional structured corrections list returned by LLM
     corrections: List[dict] = Field(
         default_factory=list,
-        description="List of individual corrections with incorrect text, correction, and explanation",
+        description="List of individual corrections with incorrect text, correction, explanation and offset",
     )
     method: str = Field(default="llm", description="Method used for correction (llm)")
 
@@ -57,15 +62,15 @@ class TranslationRequest(BaseModel):
     source_lang: LanguageEnum = Field(..., description="Source language code")
     target_lang: LanguageEnum = Field(..., description="Target language code")
 
-    @validator('text')
-    def validate_text(cls, v):
-        if not v.strip():
-            raise ValueError('Text cannot be empty or only whitespace')
-        return v.strip()
+    @field_validator('text')
+    @classmethod
+    def validate_text(cls, v: str) -> str:
+        return strip_text(v)
 
-    @validator('target_lang')
-    def validate_different_languages(cls, v, values):
-        if 'source_lang' in values and v == values['source_lang']:
+    @field_validator('target_lang')
+    @classmethod
+    def validate_different_languages(cls, v: LanguageEnum, info: ValidationInfo) -> LanguageEnum:
+        if 'source_lang' in info.data and v == info.data['source_lang']:
             raise ValueError('Source and target languages must be different')
         return v
 
@@ -82,12 +87,15 @@ class HumanizeRequest(BaseModel):
     text: str = Field(..., min_length=1, max_length=5000, description="Text to humanize")
     tone: ToneEnum = Field(..., description="Desired tone for humanization")
     language: LanguageEnum = Field(default=LanguageEnum.en, description="Language code for humanization")
+    split_paragraphs: bool = Field(
+        default=True,
+        description="Rewrite paragraphs concurrently and reassemble them in order",
+    )
 
-    @validator('text')
-    def validate_text(cls, v):
-        if not v.strip():
-            raise ValueError('Text cannot be empty or only whitespace')
-        return v.strip()
+    @field_validator('text')
+    @classmethod
+    def validate_text(cls, v: str) -> str:
+        return strip_text(v)
 
 
 class HumanizeResponse(BaseModel):
@@ -101,11 +109,10 @@ class PlagiarismCheckRequest(BaseModel):
     text: str = Field(..., min_length=1, max_length=10000, description="Text to check for plagiarism")
     language: LanguageEnum = Field(default=LanguageEnum.en, description="Language code for plagiarism checking")
 
-    @validator('text')
-    def validate_text(cls, v):
-        if not v.strip():
-            raise ValueError('Text cannot be empty or only whitespace')
-        return v.strip()
+    @field_validator('text')
+    @classmethod
+    def validate_text(cls, v: str) -> str:
+        return strip_text(v)
 
 
 class MatchedSentence(BaseModel):
@@ -125,18 +132,35 @@ class PlagiarismCheckResponse(BaseModel):
 class AIDetectionRequest(BaseModel):
     text: str = Field(..., min_length=1, max_length=10000, description="Text to analyze for AI generation detection")
     language: str = Field(default="en", description="Language code for AI detection (e.g., 'en', 'es', 'fr')")
+    # Word count and sentence spans, computed once on first use
+    _normalized: Optional[NormalizedText] = PrivateAttr(default=None)
+
+    @field_validator('text')
+    @classmethod
+    def validate_text(cls, v: str) -> str:
+        # Collapse whitespace and fix punctuation spacing/runs in one place
+        return normalize_text(v)
+
+    @field_validator('language')
+    @classmethod
+    def normalize_language(cls, v: str) -> str:
+        return v.strip().lower()
 
-    @validator('text')
-    def validate_text(cls, v):
-        # Basic normalization: trim and collapse excessive whitespace
-        cleaned = ' '.join(v.split())
-        if not cleaned:
-            raise ValueError('Text cannot be empty or only whitespace')
-        return cleaned
+    def normalized(self) -> NormalizedText:
+        """Word count and sentence spans of the text, shared by router and service."""
+        if self._normalized is None or self._normalized.text is not self.text:
+            self._normalized = analyze_text(self.text, self.language)
+        return self._normalized
 
-    @validator('language')
-    def normalize_language(cls, v):
-        return v.strip().lower()
+
+class AIDetectionSegment(BaseModel):
+    index: int = Field(..., ge=0, description="Position of the segment in the text")
+    start: int = Field(..., ge=0, description="Character offset where the segment starts")
+    end: int = Field(..., ge=0, description="Character offset where the segment ends")
+    wordCount: int = Field(..., ge=0, description="Number of words in the segment")
+    aiProbability: float = Field(..., ge=0.0, le=100.0, description="Segment probability of AI generation (0-100%)")
+    humanProbability: float = Field(..., ge=0.0, le=100.0, description="Segment probability of human writing (0-100%)")
+    label: str = Field(..., description="Segment classification label: 'AI' or 'Human'")
 
 
 class AIDetectionResponse(BaseModel):
@@ -145,6 +169,58 @@ class AIDetectionResponse(BaseModel):
     humanProbability: float = Field(..., ge=0.0, le=100.0, description="Probability that text is human-written (0-100%)")
     label: str = Field(..., description="Classification label: 'AI' or 'Human'")
     confidence: str = Field(..., description="Confidence level: 'Low', 'Medium', or 'High'")
+    segments: List[AIDetectionSegment] = Field(
+        default_factory=list,
+        description="Per-segment scores when a long text was analyzed in chunks",
+    )
+    method: str = Field(default="llm", description="Method used for detection (stylometric, llm, llm-chunked)")
+
+
+# Batch Schemas
+class GrammarCheckBatchRequest(BaseModel):
+    items: List[GrammarCheckRequest] = Field(..., min_length=1, max_length=BATCH_MAX_ITEMS, description="Texts to check")
+
+
+class TranslationBatchRequest(BaseModel):
+    items: List[TranslationRequest] = Field(..., min_length=1, max_length=BATCH_MAX_ITEMS, description="Texts to translate")
+
+
+class PlagiarismCheckBatchRequest(BaseModel):
+    items: List[PlagiarismCheckRequest] = Field(..., min_length=1, max_length=BATCH_MAX_ITEMS, description="Texts to check")
+
+
+class AIDetectionBatchRequest(BaseModel):
+    items: List[AIDetectionRequest] = Field(..., min_length=1, max_length=BATCH_MAX_ITEMS, description="Texts to analyze")
+
+
+class BatchItemResult(BaseModel):
+    index: int = Field(..., ge=0, description="Position of the item in the request")
+    success: bool = Field(..., description="Whether this item was processed")
+    result: Optional[Any] = Field(None, description="Service response for the item")
+    error: Optional[dict] = Field(None, description="Error details if the item failed")
+
+
+class BatchResponse(BaseModel):
+    success: bool = Field(default=True, description="Operation success status")
+    results: List[BatchItemResult] = Field(default_factory=list, description="Per-item results in request order")
+
+
+# Async Job Schemas
+class JobSubmitResponse(BaseModel):
+    success: bool = Field(default=True, description="Operation success status")
+    jobId: str = Field(..., description="Identifier to poll for the job result")
+    status: str = Field(..., description="Job status: queued, running, completed, failed")
+
+
+class JobStatusResponse(BaseModel):
+    success: bool = Field(default=True, description="Operation success status")
+    jobId: str = Field(..., description="Job identifier")
+    kind: str = Field(..., description="Job kind: humanize, ai-detect, translate, grammar")
+    status: str = Field(..., description="Job status: queued, running, completed, failed")
+    result: Optional[Any] = Field(None, description="Service response once the job has completed")
+    error: Optional[dict] = Field(None, description="Error details if the job failed")
+    createdAt: float = Field(..., description="Submission time (Unix seconds)")
+    finishedAt: Optional[float] = Field(None, description="Completion time (Unix seconds)")
 
 
 # Language Response Schemas
@@ -161,9 +237,8 @@ class LanguageResponse(BaseModel):
 class TranslationLanguagePair(BaseModel):
     from_lang: str = Field(alias="from")
     to_lang: str = Field(alias="to")
-    
-    class Config:
-        allow_population_by_field_name = True
+
+    model_config = ConfigDict(populate_by_name=True)
 
 
 class TranslationLanguagesResponse(BaseModel):
@@ -178,6 +253,29 @@ class HealthResponse(BaseModel):
     services: dict = Field(default_factory=dict, description="Status of individual services")
 
 
+class ComponentStatus(BaseModel):
+    state: str = Field(..., description="Warm-up state: pending, warming, ready or failed")
+    seconds: Optional[float] = Field(None, description="Warm-up duration (load + first inference)")
+    error: Optional[str] = Field(None, description="Why the warm-up failed")
+
+
+class OllamaReadiness(BaseModel):
+    ready: bool = Field(..., description="Backend reachable and preloaded models warm")
+    required: bool = Field(..., description="Whether Ollama gates worker readiness")
+    reachable: bool = Field(..., description="Whether any Ollama backend can take requests")
+    models: Dict[str, bool] = Field(default_factory=dict, description="Preloaded models and whether each is warm")
+    backends: List[dict] = Field(default_factory=list, description="Warm state per backend and model")
+
+
+class ReadinessResponse(BaseModel):
+    ready: bool = Field(..., description="Whether the worker should receive traffic")
+    warmupFinished: bool = Field(..., description="Whether the startup warm-up has completed")
+    components: Dict[str, ComponentStatus] = Field(
+        default_factory=dict, description="Embedding model and MarianMT pairs by warm-up state"
+    )
+    ollama: OllamaReadiness = Field(..., description="Ollama backends and model residency")
+
+
 # Error Response Schema
 class ErrorResponse(BaseModel):
     error: str = Field(..., description="Error message")
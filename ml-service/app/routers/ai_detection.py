@@ -5,9 +5,11 @@ Provides endpoints for detecting whether text is AI-generated or human-written.
 """
 
 from fastapi import APIRouter, HTTPException
-import re
+from fastapi.concurrency import run_in_threadpool
 from ..services.ai_detection_service import ai_detection_service
-from ..models.schemas import AIDetectionRequest, AIDetectionResponse
+from ..models.schemas import AIDetectionRequest, AIDetectionResponse, AIDetectionBatchRequest, BatchResponse
+from ..utils.batch import to_batch_response
+from ..utils.responses import model_response
 
 
 router = APIRouter(prefix="/ai-detect", tags=["ai-detection"])
@@ -15,61 +17,67 @@ router = APIRouter(prefix="/ai-detect", tags=["ai-detection"])
 SUPPORTED_LANGUAGES = {"en", "es", "fr", "de", "hi", "ar", "zh", "ko"}
 
 
+def prepare_detection_request(request: AIDetectionRequest) -> AIDetectionRequest:
+    """
+    Validate language and word count of an (already normalized) request.
+
+    The schema normalizes the text; the word count and sentence spans
+    computed here stay on the request for the detection service.
+
+    Raises:
+        HTTPException: 400 for unsupported languages or out-of-range lengths
+    """
+    # Validate language explicitly against supported set
+    request.language = request.language or "en"
+    if request.language not in SUPPORTED_LANGUAGES:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "success": False,
+                "error": "LANGUAGE_NOT_SUPPORTED",
+                "message": "Language not supported",
+            },
+        )
+
+    # Word-count based validation for reliability
+    word_count = request.normalized().word_count
+    if word_count < 50:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "success": False,
+                "error": "TEXT_TOO_SHORT",
+                "message": "Text must contain at least 50 words",
+            },
+        )
+    if word_count > 5000:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "success": False,
+                "error": "TEXT_TOO_LONG",
+                "message": "Text must not exceed 5000 words",
+            },
+        )
+
+    return request
+
+
 @router.post("/check", response_model=AIDetectionResponse)
 async def check_ai_detection(request: AIDetectionRequest):
     """
     Check if text is AI-generated or human-written using local LLM.
 
-    Applies language and length validation, basic normalization, then
+    Applies language and length validation to the normalized text, then
     delegates to the detection service.
     """
     try:
-        # Validate language explicitly against supported set
-        language = (request.language or "en").strip().lower()
-        if language not in SUPPORTED_LANGUAGES:
-            raise HTTPException(
-                status_code=400,
-                detail={
-                    "success": False,
-                    "error": "LANGUAGE_NOT_SUPPORTED",
-                    "message": "Language not supported",
-                },
-            )
-
-        # Word-count based validation for reliability
-        words = re.findall(r"\w+", request.text)
-        word_count = len(words)
-        if word_count < 50:
-            raise HTTPException(
-                status_code=400,
-                detail={
-                    "success": False,
-                    "error": "TEXT_TOO_SHORT",
-                    "message": "Text must contain at least 50 words",
-                },
-            )
-        if word_count > 5000:
-            raise HTTPException(
-                status_code=400,
-                detail={
-                    "success": False,
-                    "error": "TEXT_TOO_LONG",
-                    "message": "Text must not exceed 5000 words",
-                },
-            )
-
-        # Additional normalization: collapse whitespace and normalize punctuation
-        normalized_text = " ".join(request.text.split())
-        # remove spaces before punctuation like " word , word " -> " word, word "
-        normalized_text = re.sub(r"\s+([?.!,;:])", r"\1", normalized_text)
-        # collapse repeated punctuation "!!!" -> "!"
-        normalized_text = re.sub(r"([?.!,;:]){2,}", r"\1", normalized_text)
+        normalized_request = prepare_detection_request(request)
 
-        normalized_request = AIDetectionRequest(text=normalized_text, language=language)
-
-        result = ai_detection_service.detect_ai_text(normalized_request)
-        # The result is already an AIDetectionResponse object, return it directly
-        return result
+        # Long texts fan out into several LLM calls; keep them off the event loop
+        result = await run_in_threadpool(ai_detection_service.detect_ai_text, normalized_request)
+        # The result is already an AIDetectionResponse object, serialize it directly
+        return model_response(result)
     except HTTPException:
         # Re-raise HTTP exceptions as-is
         raise
@@ -109,4 +117,29 @@ async def check_ai_detection(request: AIDetectionRequest):
                 "error": "SERVICE_ERROR",
                 "message": f"AI detection failed: {str(e)}",
             },
-        )
\ No newline at end of file
+        )
+
+
+@router.post("/check/batch", response_model=BatchResponse)
+async def check_ai_detection_batch(request: AIDetectionBatchRequest):
+    """
+    Check many texts for AI generation in one call.
+
+    Each item is validated like /ai-detect/check; invalid items are reported
+    in place and the rest are analyzed concurrently.
+    """
+    results = [None] * len(request.items)
+    pending = []
+    for index, item in enumerate(request.items):
+        try:
+            pending.append((index, prepare_detection_request(item)))
+        except HTTPException as e:
+            results[index] = e
+
+    detections = await run_in_threadpool(
+        ai_detection_service.detect_ai_text_batch, [item for _, item in pending]
+    )
+    for (index, _), detection in zip(pending, detections):
+        results[index] = detection
+
+    return model_response(to_batch_response(results))
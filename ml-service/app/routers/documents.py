@@ -0,0 +1,85 @@
+"""
+Document processing router.
+
+Provides an endpoint for running whole documents through translation,
+plagiarism or grammar checking, streaming per-chunk results as NDJSON.
+"""
+
+from enum import Enum
+from typing import Optional
+from fastapi import APIRouter, File, Form, HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from ..services.document_service import document_service
+from ..services.grammar_service import grammar_service
+from ..services.inference_pool import inference_pool
+from ..utils.responses import dumps
+from ..models.schemas import (
+    LanguageEnum,
+    GrammarCheckRequest,
+    PlagiarismCheckRequest,
+    TranslationRequest,
+)
+
+
+router = APIRouter(prefix="/documents", tags=["documents"])
+
+
+class DocumentServiceEnum(str, Enum):
+    translate = "translate"
+    plagiarism = "plagiarism"
+    grammar = "grammar"
+
+
+@router.post("/{service}")
+async def process_document(
+    service: DocumentServiceEnum,
+    file: UploadFile = File(..., description="Plain-text (UTF-8) document"),
+    language: LanguageEnum = Form(LanguageEnum.en),
+    source_lang: Optional[LanguageEnum] = Form(None),
+    target_lang: Optional[LanguageEnum] = Form(None),
+):
+    """
+    Process a large plain-text document chunk by chunk.
+
+    The upload is read incrementally and split on sentence boundaries into
+    chunks within the per-request limits of the chosen service. Results are
+    streamed back as NDJSON in document order, one line per chunk:
+
+    - `{"index", "start", "end", "result"}` on success
+    - `{"index", "start", "end", "error"}` if the chunk failed
+
+    followed by a final `{"done": true, "chunks", "failed"}` line.
+    """
+    if service == DocumentServiceEnum.translate:
+        if source_lang is None or target_lang is None or source_lang == target_lang:
+            raise HTTPException(
+                status_code=400,
+                detail={
+                    "success": False,
+                    "error": "INVALID_LANGUAGE_PAIR",
+                    "message": "source_lang and target_lang are required and must be different",
+                },
+            )
+
+        async def handler(text: str):
+            request = TranslationRequest(text=text, source_lang=source_lang, target_lang=target_lang)
+            return await inference_pool.run("translation", "translate", request)
+
+    elif service == DocumentServiceEnum.plagiarism:
+        async def handler(text: str):
+            request = PlagiarismCheckRequest(text=text, language=language)
+            return await inference_pool.run("plagiarism", "check_plagiarism", request)
+
+    else:
+        async def handler(text: str):
+            request = GrammarCheckRequest(text=text, language=language)
+            return await run_in_threadpool(grammar_service.check_grammar, request)
+
+    async def stream():
+        # Chunk on the source language's sentence rules
+        chunk_language = source_lang if service == DocumentServiceEnum.translate else language
+        async for line in document_service.process(file.read, handler, chunk_language.value):
+            yield dumps(line) + b"\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
@@ -5,8 +5,11 @@ Provides endpoints for checking and correcting grammar in text.
 """
 
 from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from ..services.grammar_service import grammar_service
-from ..models.schemas import GrammarCheckRequest, GrammarCheckResponse
+from ..models.schemas import GrammarCheckRequest, GrammarCheckResponse, GrammarCheckBatchRequest, BatchResponse
+from ..utils.batch import to_batch_response
+from ..utils.responses import model_response
 
 
 router = APIRouter(prefix="/grammar", tags=["grammar"])
@@ -26,8 +29,9 @@ async def check_grammar(request: GrammarCheckRequest):
     Supports multiple languages.
     """
     try:
-        result = grammar_service.check_grammar(request)
-        return result
+        # LLM calls (fanned out per unit in incremental mode) block; keep them off the event loop
+        result = await run_in_threadpool(grammar_service.check_grammar, request)
+        return model_response(result)
     except ValueError as e:
         error_msg = str(e)
         if "LLM_UNAVAILABLE" in error_msg:
@@ -65,4 +69,16 @@ async def check_grammar(request: GrammarCheckRequest):
                 "error": "SERVICE_ERROR",
                 "message": f"Grammar correction failed: {str(e)}"
             }
-        )
\ No newline at end of file
+        )
+
+
+@router.post("/check/batch", response_model=BatchResponse)
+async def check_grammar_batch(request: GrammarCheckBatchRequest):
+    """
+    Check and correct grammar for many texts in one call.
+
+    Items are sent to the LLM concurrently; each result carries either the
+    correction or its own error.
+    """
+    results = await run_in_threadpool(grammar_service.check_grammar_batch, request.items)
+    return model_response(to_batch_response(results))
@@ -5,8 +5,11 @@ Provides endpoints for humanizing AI-generated text in different tones.
 """
 
 from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from ..services.humanize_service import humanize_service
 from ..models.schemas import HumanizeRequest, HumanizeResponse
+from ..utils.responses import dumps, model_response
 
 
 router = APIRouter(prefix="/humanize", tags=["humanize"])
@@ -27,12 +30,46 @@ async def humanize_text(request: HumanizeRequest):
     Supports all languages.
     """
     try:
-        result = humanize_service.humanize_text(request)
-        return result
-    except ValueError as e:
+        # Parallel rewrites plus up to HUMANIZE_CALIBRATION_BUDGET of calibration:
+        # keep them off the event loop
+        result = await run_in_threadpool(humanize_service.humanize_text, request)
+        return model_response(result)
+    except Exception as e:
+        raise _http_error(e)
+
+
+@router.post("/stream")
+async def humanize_text_stream(request: HumanizeRequest):
+    """
+    Humanize text paragraph by paragraph, streaming results as NDJSON.
+
+    Paragraphs are rewritten concurrently and streamed in order as soon as
+    each (and every paragraph before it) is done:
+
+    - `{"index", "start", "end", "text"}` per rewritten paragraph
+    - `{"index", "start", "end", "error"}` if a paragraph failed
+
+    followed by a final `{"done": true, "rewritten_text", "tone", "method",
+    "failed"}` line with the reassembled text.
+    """
+    try:
+        lines = await run_in_threadpool(humanize_service.stream_humanize, request)
+    except Exception as e:
+        raise _http_error(e)
+
+    def stream():
+        for line in lines:
+            yield dumps(line) + b"\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+def _http_error(e: Exception) -> HTTPException:
+    """Map a humanization failure to the HTTP error returned to clients."""
+    if isinstance(e, ValueError):
         error_msg = str(e)
         if "LLM_UNAVAILABLE" in error_msg:
-            raise HTTPException(
+            return HTTPException(
                 status_code=503,
                 detail={
                     "success": False,
@@ -41,7 +78,7 @@ async def humanize_text(request: HumanizeRequest):
                 },
             )
         if "LLM_TIMEOUT" in error_msg:
-            raise HTTPException(
+            return HTTPException(
                 status_code=503,
                 detail={
                     "success": False,
@@ -50,7 +87,7 @@ async def humanize_text(request: HumanizeRequest):
                 },
             )
         if "LLM_ERROR" in error_msg:
-            raise HTTPException(
+            return HTTPException(
                 status_code=503,
                 detail={
                     "success": False,
@@ -58,7 +95,7 @@ async def humanize_text(request: HumanizeRequest):
                     "message": error_msg.replace("LLM_ERROR: ", ""),
                 },
             )
-        raise HTTPException(
+        return HTTPException(
             status_code=400,
             detail={
                 "success": False,
@@ -66,9 +103,9 @@ async def humanize_text(request: HumanizeRequest):
                 "message": error_msg,
             },
         )
-    except ConnectionError:
+    if isinstance(e, ConnectionError):
         # Handle direct ConnectionError (e.g., when Ollama is down)
-        raise HTTPException(
+        return HTTPException(
             status_code=503,
             detail={
                 "success": False,
@@ -76,12 +113,11 @@ async def humanize_text(request: HumanizeRequest):
                 "message": "Local LLM service is unavailable. Please ensure Ollama is running.",
             },
         )
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail={
-                "success": False,
-                "error": "SERVICE_ERROR",
-                "message": f"Humanization failed: {str(e)}",
-            },
-        )
+    return HTTPException(
+        status_code=500,
+        detail={
+            "success": False,
+            "error": "SERVICE_ERROR",
+            "message": f"Humanization failed: {str(e)}",
+        },
+    )
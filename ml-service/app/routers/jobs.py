@@ -0,0 +1,91 @@
+"""
+Async job router.
+
+Provides endpoints for submitting long-running requests as background jobs
+and polling for their results, so no HTTP connection stays open during
+LLM generation.
+"""
+
+import asyncio
+from fastapi import APIRouter, HTTPException, Query
+from ..services.job_service import job_service
+from ..services.humanize_service import humanize_service
+from ..services.ai_detection_service import ai_detection_service
+from ..services.translation_service import translation_service
+from ..services.grammar_service import grammar_service
+from ..models.schemas import (
+    HumanizeRequest,
+    AIDetectionRequest,
+    TranslationRequest,
+    GrammarCheckRequest,
+    JobSubmitResponse,
+    JobStatusResponse,
+)
+from ..utils.responses import model_response
+from .ai_detection import prepare_detection_request
+
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+# Longest a status request may wait for a job to finish (seconds)
+MAX_WAIT_SECONDS = 60
+
+
+def _submitted(job) -> JobSubmitResponse:
+    return JobSubmitResponse(jobId=job.id, status=job.status)
+
+
+@router.post("/humanize", response_model=JobSubmitResponse, status_code=202)
+async def submit_humanize(request: HumanizeRequest):
+    """Submit a humanization job."""
+    return _submitted(job_service.submit("humanize", humanize_service.humanize_text, request))
+
+
+@router.post("/ai-detect", response_model=JobSubmitResponse, status_code=202)
+async def submit_ai_detection(request: AIDetectionRequest):
+    """Submit an AI detection job (same validation as /ai-detect/check)."""
+    normalized_request = prepare_detection_request(request)
+    return _submitted(job_service.submit("ai-detect", ai_detection_service.detect_ai_text, normalized_request))
+
+
+@router.post("/translate", response_model=JobSubmitResponse, status_code=202)
+async def submit_translation(request: TranslationRequest):
+    """Submit a translation job."""
+    return _submitted(job_service.submit("translate", translation_service.translate, request))
+
+
+@router.post("/grammar", response_model=JobSubmitResponse, status_code=202)
+async def submit_grammar(request: GrammarCheckRequest):
+    """Submit a grammar check job."""
+    return _submitted(job_service.submit("grammar", grammar_service.check_grammar, request))
+
+
+@router.get("/{job_id}", response_model=JobStatusResponse)
+async def get_job(
+    job_id: str,
+    wait: float = Query(0, ge=0, le=MAX_WAIT_SECONDS, description="Seconds to wait for completion (long-poll)"),
+):
+    """
+    Get job status and result.
+
+    With `wait` > 0 the request is held until the job finishes or the wait
+    elapses, whichever comes first; the current status is returned either way.
+    """
+    job = job_service.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "success": False,
+                "error": "JOB_NOT_FOUND",
+                "message": "Job not found or expired",
+            },
+        )
+
+    if wait > 0 and not job.done and job.future is not None:
+        try:
+            await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(job.future)), timeout=wait)
+        except asyncio.TimeoutError:
+            pass
+
+    return model_response(JobStatusResponse(**job.to_dict()))
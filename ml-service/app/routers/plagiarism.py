@@ -5,8 +5,10 @@ Provides endpoints for checking text against reference corpus for plagiarism.
 """
 
 from fastapi import APIRouter, HTTPException
-from ..services.plagiarism_service import plagiarism_service
-from ..models.schemas import PlagiarismCheckRequest, PlagiarismCheckResponse
+from ..services.inference_pool import inference_pool
+from ..models.schemas import PlagiarismCheckRequest, PlagiarismCheckResponse, PlagiarismCheckBatchRequest, BatchResponse
+from ..utils.batch import to_batch_response
+from ..utils.responses import model_response
 
 router = APIRouter(prefix="/plagiarism", tags=["plagiarism"])
 
@@ -28,8 +30,9 @@ async def check_plagiarism(request: PlagiarismCheckRequest):
     - totalSentences: Number of sentences analyzed
     """
     try:
-        result = plagiarism_service.check_plagiarism(request)
-        return result
+        # Encoding and similarity search run in the inference pool, off the event loop
+        result = await inference_pool.run("plagiarism", "check_plagiarism", request)
+        return model_response(result)
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -38,4 +41,26 @@ async def check_plagiarism(request: PlagiarismCheckRequest):
                 "error": "PLAGIARISM_SERVICE_ERROR",
                 "message": str(e)
             }
-        )
\ No newline at end of file
+        )
+
+
+@router.post("/check/batch", response_model=BatchResponse)
+async def check_plagiarism_batch(request: PlagiarismCheckBatchRequest):
+    """
+    Check many texts for plagiarism in one call.
+
+    All sentences are embedded in a single encode pass and compared with the
+    corpus in one similarity computation.
+    """
+    try:
+        results = await inference_pool.run("plagiarism", "check_plagiarism_batch", request.items)
+        return model_response(to_batch_response(results))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "success": False,
+                "error": "PLAGIARISM_SERVICE_ERROR",
+                "message": str(e)
+            }
+        )
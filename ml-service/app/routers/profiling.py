@@ -0,0 +1,83 @@
+"""
+Admin profiling router.
+
+Starts and stops sampling profiles and serves them as collapsed stacks for
+flamegraph tools. Every endpoint requires the PROFILING_TOKEN in the
+X-Admin-Token header; with no token configured the endpoints are disabled.
+"""
+
+import hmac
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from ..config import PROFILING_TOKEN
+from ..utils.profiler import profiler
+
+
+def is_authorized(token: Optional[str]) -> bool:
+    """Check an admin token against PROFILING_TOKEN (always False when unset)."""
+    return bool(PROFILING_TOKEN) and token is not None and hmac.compare_digest(token, PROFILING_TOKEN)
+
+
+def require_admin_token(x_admin_token: Optional[str] = Header(None)):
+    if not PROFILING_TOKEN:
+        raise HTTPException(
+            status_code=404,
+            detail={"success": False, "error": "PROFILING_DISABLED", "message": "Profiling is not enabled"},
+        )
+    if not is_authorized(x_admin_token):
+        raise HTTPException(
+            status_code=403,
+            detail={"success": False, "error": "FORBIDDEN", "message": "Invalid admin token"},
+        )
+
+
+router = APIRouter(
+    prefix="/admin/profiling",
+    tags=["admin"],
+    dependencies=[Depends(require_admin_token)],
+)
+
+
+def _get_session(profile_id: str):
+    session = profiler.get(profile_id)
+    if session is None:
+        raise HTTPException(
+            status_code=404,
+            detail={"success": False, "error": "PROFILE_NOT_FOUND", "message": "Unknown or expired profile ID"},
+        )
+    return session
+
+
+@router.post("/start")
+async def start_profile(seconds: float = Query(30, gt=0, description="Window length, capped at PROFILING_MAX_SECONDS")):
+    """Start a process-wide sampling profile for a time window."""
+    session = profiler.start("window", duration=seconds, label=f"{seconds:g}s window")
+    return {"success": True, **session.to_dict()}
+
+
+@router.post("/{profile_id}/stop")
+async def stop_profile(profile_id: str):
+    """Stop a profile before its window ends."""
+    _get_session(profile_id)
+    return {"success": True, **profiler.stop(profile_id).to_dict()}
+
+
+@router.get("")
+async def list_profiles():
+    """List active and recently finished profiles."""
+    return {"success": True, "profiles": [session.to_dict() for session in profiler.list()]}
+
+
+@router.get("/{profile_id}", response_class=PlainTextResponse)
+async def get_profile(
+    profile_id: str,
+    app_only: bool = Query(True, description="Only stacks passing through app code"),
+):
+    """
+    Download a profile as collapsed stacks.
+
+    Feed the output to flamegraph.pl, inferno-flamegraph or speedscope.
+    """
+    session = _get_session(profile_id)
+    return PlainTextResponse(session.collapsed(app_only=app_only))
@@ -5,8 +5,11 @@ Provides endpoints for translating text between supported languages.
 """
 
 from fastapi import APIRouter, HTTPException
-from ..services.translation_service import translation_service
-from ..models.schemas import TranslationRequest, TranslationResponse
+from ..services.translation_service import TranslationService
+from ..services.inference_pool import inference_pool
+from ..models.schemas import TranslationRequest, TranslationResponse, TranslationBatchRequest, BatchResponse
+from ..utils.batch import to_batch_response
+from ..utils.responses import StaticResponse, model_response
 
 router = APIRouter(prefix="/translate", tags=["translation"])
 
@@ -17,8 +20,9 @@ async def translate_text(request: TranslationRequest):
     Translate text from source language to target language.
     """
     try:
-        result = translation_service.translate(request)
-        return result
+        # MarianMT generation runs in the inference pool, off the event loop
+        result = await inference_pool.run("translation", "translate", request)
+        return model_response(result)
     except ValueError as e:
         raise HTTPException(
             status_code=400,
@@ -60,12 +64,39 @@ async def translate_text(request: TranslationRequest):
                 }
             )
 
+@router.post("/batch", response_model=BatchResponse)
+async def translate_batch(request: TranslationBatchRequest):
+    """
+    Translate many texts in one call.
+
+    Texts sharing an OPUS language pair are translated with batched generate
+    calls; other pairs go to the LLM concurrently.
+    """
+    try:
+        results = await inference_pool.run("translation", "translate_batch", request.items)
+        return model_response(to_batch_response(results))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "success": False,
+                "error": "SERVICE_ERROR",
+                "message": str(e)
+            }
+        )
+
+
+# The pairs are static: read from the class, never through the model host proxy
+# (a call that could block the event loop while the host is unreachable)
+LANGUAGES_RESPONSE = StaticResponse({
+    "success": True,
+    "supportedPairs": TranslationService.get_supported_languages()
+})
+
+
 @router.get("/languages")
 async def get_supported_languages():
     """
     Get all supported translation language pairs.
     """
-    return {
-        "success": True,
-        "supportedPairs": translation_service.get_supported_languages()
-    }
\ No newline at end of file
+    return LANGUAGES_RESPONSE()
\ No newline at end of file
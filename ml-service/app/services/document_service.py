@@ -0,0 +1,186 @@
+"""
+Streaming document pipeline.
+
+Large uploads are decoded incrementally, cut on sentence boundaries into
+chunks that fit the per-request limits of the existing services, and
+processed with a bounded number of chunks in flight. Results are yielded in
+document order as soon as they are ready, so memory stays flat no matter
+how large the document is.
+"""
+
+import asyncio
+import codecs
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Tuple
+from ..config import DOCUMENT_CHUNK_CHARS, DOCUMENT_MAX_IN_FLIGHT, DOCUMENT_MAX_BYTES
+from ..utils.errors import error_detail
+from ..utils.segmentation import get_segmenter
+
+
+class DocumentTooLargeError(ValueError):
+    """Raised when an upload exceeds DOCUMENT_MAX_BYTES."""
+
+
+class DocumentService:
+    """Splits streamed documents into chunks and processes them in order."""
+
+    READ_SIZE = 64 * 1024
+    CHUNK_CHARS = DOCUMENT_CHUNK_CHARS
+    MAX_IN_FLIGHT = DOCUMENT_MAX_IN_FLIGHT
+    MAX_BYTES = DOCUMENT_MAX_BYTES
+
+    def _split_long(self, start: int, text: str) -> List[Tuple[int, str]]:
+        """Hard-split a run of text longer than CHUNK_CHARS at whitespace."""
+        pieces = []
+        while len(text) > self.CHUNK_CHARS:
+            cut = text.rfind(" ", 0, self.CHUNK_CHARS)
+            if cut <= 0:
+                cut = self.CHUNK_CHARS
+            pieces.append((start, text[:cut]))
+            start += cut
+            text = text[cut:]
+        pieces.append((start, text))
+        return pieces
+
+    async def iter_chunks(
+        self, read: Callable[[int], Awaitable[bytes]], language: str = "en"
+    ) -> AsyncIterator[Tuple[int, str]]:
+        """
+        Yield (character offset, text) chunks from a byte stream.
+
+        Args:
+            read: Async callable returning up to n bytes (b"" at end of stream)
+            language: Language whose sentence rules place the chunk boundaries
+
+        Raises:
+            DocumentTooLargeError: If the stream exceeds MAX_BYTES
+        """
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        segmenter = get_segmenter(language)
+        buffer = ""
+        buffer_start = 0
+        chunk_start = 0
+        chunk_parts: List[str] = []
+        chunk_len = 0
+        total_bytes = 0
+
+        while True:
+            data = await read(self.READ_SIZE)
+            total_bytes += len(data)
+            if total_bytes > self.MAX_BYTES:
+                raise DocumentTooLargeError(f"Document exceeds {self.MAX_BYTES} bytes")
+
+            final = not data
+            buffer += decoder.decode(data, final=final)
+
+            # Everything up to the last sentence end is complete; keep the tail
+            # A boundary at the very end of the buffer may continue in the next read
+            ends = [end for end in segmenter.boundaries(buffer) if end < len(buffer)]
+            cut = ends[-1] if ends else 0
+            if final:
+                cut = len(buffer)
+            elif len(buffer) - cut > 2 * self.CHUNK_CHARS:
+                # A long run without sentence ends: cut at its last whitespace (or
+                # everywhere, if it has none) so the buffer, and the rescans of
+                # it on every read, stay bounded
+                cut = buffer.rfind(" ", cut) + 1 or len(buffer)
+
+            complete, buffer = buffer[:cut], buffer[cut:]
+            sentence_start = 0
+            boundaries = segmenter.boundaries(complete)
+            if not boundaries or boundaries[-1] != len(complete):
+                boundaries.append(len(complete))
+
+            for end in boundaries:
+                sentence = complete[sentence_start:end]
+                offset = buffer_start + sentence_start
+                sentence_start = end
+                if not sentence:
+                    continue
+
+                if chunk_len and chunk_len + len(sentence) > self.CHUNK_CHARS:
+                    yield chunk_start, "".join(chunk_parts)
+                    chunk_parts, chunk_len = [], 0
+
+                if len(sentence) > self.CHUNK_CHARS:
+                    *full, (offset, sentence) = self._split_long(offset, sentence)
+                    for piece_start, piece in full:
+                        yield piece_start, piece
+
+                if not chunk_len:
+                    chunk_start = offset
+                chunk_parts.append(sentence)
+                chunk_len += len(sentence)
+
+            buffer_start += cut
+            if final:
+                break
+
+        if chunk_len:
+            yield chunk_start, "".join(chunk_parts)
+
+    async def process(
+        self,
+        read: Callable[[int], Awaitable[bytes]],
+        handler: Callable[[str], Awaitable],
+        language: str = "en",
+    ) -> AsyncIterator[Dict]:
+        """
+        Run handler over every chunk of a streamed document.
+
+        At most MAX_IN_FLIGHT chunks are processed concurrently; results are
+        yielded in document order, each with its character span.
+
+        Args:
+            read: Async byte reader for the document
+            handler: Async callable processing one chunk of text
+            language: Language of the document (sentence rules for chunking)
+
+        Yields:
+            Dicts with index/start/end and either result or error, then a
+            final summary line
+        """
+        pending = deque()
+        count = 0
+        failed = 0
+        chunks = self.iter_chunks(read, language)
+
+        async def _emit(entry) -> Dict:
+            nonlocal failed
+            index, start, text, task = entry
+            line = {"index": index, "start": start, "end": start + len(text)}
+            try:
+                line["result"] = await task
+            except Exception as e:
+                failed += 1
+                line["error"] = error_detail(e)
+            return line
+
+        try:
+            try:
+                async for start, text in chunks:
+                    if not text.strip():
+                        continue
+                    task = asyncio.ensure_future(handler(text))
+                    pending.append((count, start, text, task))
+                    count += 1
+                    if len(pending) >= self.MAX_IN_FLIGHT:
+                        yield await _emit(pending.popleft())
+            except DocumentTooLargeError as e:
+                yield {"done": False, "error": error_detail(e, default_code="DOCUMENT_TOO_LARGE")}
+                return
+
+            while pending:
+                yield await _emit(pending.popleft())
+
+            yield {"done": True, "chunks": count, "failed": failed}
+        finally:
+            # Also reached when the client disconnects and the response closes
+            # this generator: chunks not yet emitted would run for nobody
+            for *_, task in pending:
+                task.cancel()
+            await chunks.aclose()
+
+
+# Global service instance
+document_service = DocumentService()
@@ -3,19 +3,133 @@ Grammar correction service using local Ollama LLM.
 
 This service uses a local LLM (mistral) via Ollama
 to correct grammar in various languages.
+
+Incremental checks split the text into units (paragraphs, with long
+paragraphs cut at sentence boundaries), look each unit up in a cache keyed
+by its content hash, and send only new or edited units to the LLM in
+parallel. Re-checking a document after a small edit therefore costs one
+unit's generation instead of the whole text.
 """
 
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+from ..config import GRAMMAR_UNIT_CHARS, GRAMMAR_CACHE_SIZE
 from ..models.schemas import GrammarCheckRequest, GrammarCheckResponse
+from ..utils.metrics import CACHE_REQUESTS
+from ..utils.segmentation import split_units
+from ..utils.tracing import add_event, traced
+from .llm_scheduler import llm_scheduler
 from .ollama_client import ollama_client
 
 
+def locate_corrections(corrections: List[Dict], text: str, base: int = 0) -> List[Dict]:
+    """
+    Add the offset of each correction's incorrect text.
+
+    Corrections are searched for in order, each from where the previous
+    one was found; an offset is None if the text does not occur.
+
+    Args:
+        corrections: Corrections as returned by the LLM
+        text: Text the corrections refer to
+        base: Offset of text within the full request text
+    """
+    located = []
+    cursor = 0
+    for correction in corrections:
+        if not isinstance(correction, dict):
+            continue
+        incorrect = str(correction.get("incorrect", ""))
+        index = text.find(incorrect, cursor) if incorrect else -1
+        if index < 0 and incorrect:
+            index = text.find(incorrect)
+        if index >= 0:
+            cursor = index + len(incorrect)
+        located.append({**correction, "offset": base + index if index >= 0 else None})
+    return located
+
+
 class GrammarService:
     """Service for checking and correcting grammar using local LLM."""
 
-    def __init__(self):
-        """Initialize the grammar service with LLM support."""
+    def __init__(self, cache_size: int = GRAMMAR_CACHE_SIZE):
+        """
+        Initialize the grammar service with LLM support.
+
+        Args:
+            cache_size: Corrected units kept for incremental checks (LRU)
+        """
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Dict]" = OrderedDict()
+        self._cache_lock = threading.Lock()
         print("Grammar service initialized with Ollama LLM support (all languages)")
 
+    @staticmethod
+    def _unit_key(unit: str, language: str) -> str:
+        return hashlib.sha256(f"{language}:{unit}".encode("utf-8")).hexdigest()
+
+    def _cache_get(self, key: str) -> Optional[Dict]:
+        with self._cache_lock:
+            result = self._cache.get(key)
+            if result is not None:
+                self._cache.move_to_end(key)
+        hit = result is not None
+        CACHE_REQUESTS.inc(cache="grammar_unit", result="hit" if hit else "miss")
+        return result
+
+    def _cache_put(self, key: str, result: Dict):
+        with self._cache_lock:
+            self._cache[key] = result
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _check_incremental(self, text: str, language: str) -> Dict:
+        """
+        Correct text unit by unit, reusing cached units.
+
+        Returns:
+            Dict with corrected_text and corrections (offsets into text)
+        """
+        units = split_units(text, GRAMMAR_UNIT_CHARS, language)
+        keys = [self._unit_key(text[start:end], language) for start, end in units]
+        results: List[Optional[Dict]] = [self._cache_get(key) for key in keys]
+        missing = [i for i, result in enumerate(results) if result is None]
+        add_event("grammar.units", **{"grammar.units": len(units), "grammar.units_changed": len(missing)})
+
+        if missing:
+            if not ollama_client.check_health():
+                raise ConnectionError("LLM service unavailable")
+            fresh = llm_scheduler.map(
+                lambda i: ollama_client.correct_grammar(text[units[i][0]:units[i][1]], language),
+                missing,
+                return_exceptions=True,
+            )
+            # Cache every unit that succeeded before surfacing a failure, so a
+            # retry only redoes the failed ones
+            for i, result in zip(missing, fresh):
+                if not isinstance(result, Exception):
+                    self._cache_put(keys[i], result)
+                    results[i] = result
+            errors = [result for result in fresh if isinstance(result, Exception)]
+            if errors:
+                raise errors[0]
+
+        pieces = []
+        corrections = []
+        position = 0
+        for (start, end), result in zip(units, results):
+            pieces.append(text[position:start])
+            pieces.append(result.get("corrected_text") or text[start:end])
+            corrections.extend(locate_corrections(result.get("corrections") or [], text[start:end], start))
+            position = end
+        pieces.append(text[position:])
+
+        return {"corrected_text": "".join(pieces), "corrections": corrections}
+
+    @traced("grammar.check_grammar")
     def check_grammar(self, request: GrammarCheckRequest) -> GrammarCheckResponse:
         """
         Check grammar of the input text using LLM.
@@ -28,18 +142,21 @@ class GrammarService:
 
         The process:
         1. Send text to Ollama LLM with grammar correction prompt
+           (incremental: only paragraphs not seen before)
         2. Return corrected text
         """
+        language = request.language.value if hasattr(request.language, 'value') else request.language
         try:
-            # Check if Ollama is available
-            if not ollama_client.check_health():
-                raise ConnectionError("LLM service unavailable")
+            if request.incremental:
+                result = self._check_incremental(request.text, language)
+            else:
+                # Check if Ollama is available
+                if not ollama_client.check_health():
+                    raise ConnectionError("LLM service unavailable")
 
-            # Use LLM to correct grammar with structured response
-            result = ollama_client.correct_grammar(
-                text=request.text,
-                language=request.language.value if hasattr(request.language, 'value') else request.language,
-            )
+                # Use LLM to correct grammar with structured response
+                result = ollama_client.correct_grammar(text=request.text, language=language)
+                result["corrections"] = locate_corrections(result.get("corrections") or [], request.text)
 
             corrected_text = result.get("corrected_text", request.text)
             corrections = result.get("corrections") or []
@@ -55,6 +172,16 @@ class GrammarService:
         except Exception as e:
             raise RuntimeError(f"Grammar correction failed: {str(e)}")
 
+    @traced("grammar.check_grammar_batch")
+    def check_grammar_batch(self, requests: List[GrammarCheckRequest]) -> List[Any]:
+        """
+        Check many texts concurrently through the LLM scheduler.
+
+        Returns:
+            One GrammarCheckResponse (or the exception that prevented it) per request
+        """
+        return llm_scheduler.map(self.check_grammar, requests, return_exceptions=True)
+
 
 # Global service instance
 grammar_service = GrammarService()
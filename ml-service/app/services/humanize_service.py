@@ -3,26 +3,336 @@ Text humanization service using local Ollama LLM.
 
 This service uses a local LLM (mistral) via Ollama
 to rewrite text in different tones, making it sound more natural and human-like.
+
+Multi-paragraph texts are rewritten paragraph by paragraph: every paragraph
+is submitted to the LLM scheduler at once (sharing the tone's system prompt)
+and the rewrites are reassembled in order between the original separators.
+Each call then only generates one paragraph, so long texts are no longer cut
+off by the output limit and finish in the time of the slowest paragraph.
+
+Calibration ("llm+ai-calibrated") runs within HUMANIZE_CALIBRATION_BUDGET
+seconds of the request start. A rewrite is scored with the local
+stylometric classifier or a cached detection result; only texts neither can
+score go to LLM detection, and then the candidate rewrites are started
+speculatively while the detector runs. Each pass generates
+HUMANIZE_CALIBRATION_CANDIDATES stronger rewrites in parallel at different
+temperatures and keeps the lowest-scoring one if it beats the current text.
+Whatever is unfinished at the deadline is dropped.
 """
 
+import time
+from concurrent.futures import Future, wait
+from typing import Dict, Iterator, List, Optional, Tuple
+from ..config import HUMANIZE_UNIT_CHARS, HUMANIZE_CALIBRATION_BUDGET, HUMANIZE_CALIBRATION_CANDIDATES
 from ..models.schemas import AIDetectionRequest, HumanizeRequest, HumanizeResponse
+from ..utils.errors import error_detail
+from ..utils.metrics import metrics
+from ..utils.normalization import normalize_text
+from ..utils.segmentation import split_units
+from ..utils.tracing import add_event, traced
 from .ai_detection_service import ai_detection_service
+from .llm_scheduler import llm_scheduler
 from .ollama_client import ollama_client
+from .stylometry import stylometric_classifier
+
+
+CALIBRATION_OUTCOMES = metrics.counter(
+    "ml_humanize_calibration_total",
+    "Calibration results (not_needed, improved, no_gain, unscored, budget_exhausted)",
+    ["outcome"],
+)
 
 
 class HumanizeService:
     """Service for humanizing text using local LLM."""
 
     TARGET_AI_PROBABILITY = 45.0
-    MAX_CALIBRATION_PASSES = 0  # Disabled to prevent timeouts, single-pass humanization is faster
+    # Passes are bounded by the calibration budget, not just this count
+    MAX_CALIBRATION_PASSES = 2
 
-    def __init__(self):
-        """Initialize the humanization service with LLM support."""
+    def __init__(
+        self,
+        calibration_budget: float = HUMANIZE_CALIBRATION_BUDGET,
+        calibration_candidates: int = HUMANIZE_CALIBRATION_CANDIDATES,
+    ):
+        """
+        Initialize the humanization service with LLM support.
+
+        Args:
+            calibration_budget: Seconds from request start calibration may use (0 = off)
+            calibration_candidates: Candidate rewrites generated per calibration pass
+        """
+        self.calibration_budget = calibration_budget
+        self.calibration_candidates = max(1, calibration_candidates)
         print("Humanization service initialized with Ollama LLM support (all languages)")
 
     def _to_scalar(self, value):
         return value.value if hasattr(value, "value") else value
 
+    def _units(self, request: HumanizeRequest) -> List[Tuple[int, int]]:
+        if not request.split_paragraphs:
+            return [(0, len(request.text))]
+        language = self._to_scalar(request.language)
+        return split_units(request.text, HUMANIZE_UNIT_CHARS, language) or [(0, len(request.text))]
+
+    def _submit_units(
+        self,
+        text: str,
+        units: List[Tuple[int, int]],
+        language: str,
+        tone: str,
+        strengthen_human_style: bool = False,
+        temperature: Optional[float] = None,
+    ) -> List[Future]:
+        """Submit one rewrite per unit to the LLM scheduler."""
+        return [
+            llm_scheduler.submit(
+                ollama_client.humanize_text,
+                text=text[start:end],
+                language=language,
+                tone=tone,
+                strengthen_human_style=strengthen_human_style,
+                temperature=temperature,
+            )
+            for start, end in units
+        ]
+
+    def _rewrite_units(self, text: str, units: List[Tuple[int, int]], language: str, tone: str) -> Iterator:
+        """
+        Rewrite every unit concurrently and yield (index, result) in order.
+
+        A unit's result is its rewritten text, or the exception that stopped
+        it; each is yielded as soon as it and all units before it are done.
+        """
+        add_event("humanize.units", **{"humanize.units": len(units)})
+        if len(units) == 1:
+            start, end = units[0]
+            try:
+                result = ollama_client.humanize_text(
+                    text=text[start:end], language=language, tone=tone, strengthen_human_style=False
+                )
+            except Exception as e:
+                # Same contract as the futures below: report, don't raise
+                result = e
+            yield 0, result
+            return
+
+        futures = self._submit_units(text, units, language, tone)
+        for index, future in enumerate(futures):
+            error = future.exception()
+            yield index, error if error is not None else future.result()
+
+    @staticmethod
+    def _reassemble(text: str, units: List[Tuple[int, int]], rewrites: List[str]) -> str:
+        """Splice rewritten units back between the original separators."""
+        pieces = []
+        position = 0
+        for (start, end), rewrite in zip(units, rewrites):
+            pieces.append(text[position:start])
+            pieces.append(rewrite)
+            position = end
+        pieces.append(text[position:])
+        return "".join(pieces)
+
+    def _rewrite(self, request: HumanizeRequest, language: str, tone: str) -> str:
+        """Rewrite the whole request text, raising the first unit failure."""
+        units = self._units(request)
+        rewrites = []
+        for _, result in self._rewrite_units(request.text, units, language, tone):
+            if isinstance(result, Exception):
+                raise result
+            rewrites.append(result)
+        return self._reassemble(request.text, units, rewrites)
+
+    def _instant_score(self, text: str, language: str) -> Optional[float]:
+        """
+        AI probability without an LLM call, if one is available: a cached
+        detection first, then the stylometric classifier when it runs on
+        trained weights (the built-in ones are guesses and would pick the
+        winning rewrite on noise).
+        """
+        # Detection results are cached under the text as AIDetectionRequest normalizes it
+        try:
+            key = normalize_text(text)
+        except ValueError:
+            return None
+        cached = ai_detection_service.cached_result(key, language)
+        if cached is not None:
+            return cached.aiProbability
+        if stylometric_classifier.trained and language in stylometric_classifier.LANGUAGES:
+            return stylometric_classifier.ai_probability(text)
+        return None
+
+    def _submit_detection(self, text: str, language: str) -> Optional[Future]:
+        """Start an LLM detection of text (None if the text cannot be detected)."""
+        try:
+            request = AIDetectionRequest(text=text, language=language)
+        except ValueError:
+            return None
+        return llm_scheduler.submit(ai_detection_service.detect_ai_text, request)
+
+    @staticmethod
+    def _detected_score(future: Optional[Future], deadline: float) -> Optional[float]:
+        """Wait for a detection until the deadline; None if it failed or is late."""
+        if future is None:
+            return None
+        wait([future], timeout=max(0.0, deadline - time.monotonic()))
+        if not future.done() or future.exception() is not None:
+            return None
+        return future.result().aiProbability
+
+    def _score(
+        self, texts: List[str], language: str, deadline: float, outstanding: List[Future]
+    ) -> List[Optional[float]]:
+        """
+        Score texts, sending only those without an instant score to LLM detection in parallel.
+
+        Detection futures are added to `outstanding` so the caller can cancel late ones.
+        """
+        scores = [self._instant_score(text, language) for text in texts]
+        pending = {i: self._submit_detection(text, language) for i, text in enumerate(texts) if scores[i] is None}
+        outstanding.extend(future for future in pending.values() if future is not None)
+        for i, future in pending.items():
+            scores[i] = self._detected_score(future, deadline)
+        return scores
+
+    def _calibrate(self, text: str, language: str, tone: str, deadline: float) -> Tuple[str, bool]:
+        """
+        Rewrite text more strongly while it still reads as AI, until the deadline.
+
+        Every candidate rewrite and detection still queued when this returns
+        (deadline, no gain, unscored) is cancelled, so abandoned work does not
+        keep holding LLM scheduler slots after the response is sent. Calls
+        already running cannot be interrupted and finish in the background.
+
+        Returns:
+            The best text found and whether it replaced the input
+        """
+        outstanding: List[Future] = []
+        try:
+            return self._calibrate_passes(text, language, tone, deadline, outstanding)
+        finally:
+            cancelled = sum(1 for future in outstanding if not future.done() and future.cancel())
+            if cancelled:
+                add_event("humanize.calibration_cancelled", **{"humanize.cancelled": cancelled})
+
+    def _calibrate_passes(
+        self, text: str, language: str, tone: str, deadline: float, outstanding: List[Future]
+    ) -> Tuple[str, bool]:
+        current = text
+        current_score = self._instant_score(current, language)
+        # No instant score: ask the LLM detector, and start the candidates
+        # speculatively so the two run side by side
+        detection = self._submit_detection(current, language) if current_score is None else None
+        if detection is not None:
+            outstanding.append(detection)
+        calibrated = False
+        outcome = "not_needed"
+
+        for _ in range(self.MAX_CALIBRATION_PASSES):
+            if current_score is not None and current_score < self.TARGET_AI_PROBABILITY:
+                break
+            if current_score is None and detection is None:
+                outcome = "unscored"
+                break
+            if time.monotonic() >= deadline:
+                outcome = "budget_exhausted"
+                break
+
+            units = split_units(current, HUMANIZE_UNIT_CHARS, language) or [(0, len(current))]
+            candidates = [
+                self._submit_units(current, units, language, tone, True, min(1.0, 0.5 + 0.2 * i))
+                for i in range(self.calibration_candidates)
+            ]
+            outstanding.extend(f for candidate in candidates for f in candidate)
+
+            if detection is not None:
+                current_score = self._detected_score(detection, deadline)
+                detection = None
+                if current_score is None or current_score < self.TARGET_AI_PROBABILITY:
+                    outcome = "unscored" if current_score is None else "not_needed"
+                    break
+
+            wait([f for candidate in candidates for f in candidate], timeout=max(0.0, deadline - time.monotonic()))
+            finished = [
+                self._reassemble(current, units, [f.result() for f in candidate])
+                for candidate in candidates
+                if all(f.done() and not f.cancelled() and f.exception() is None for f in candidate)
+            ]
+            # Stragglers of this pass would only compete with the next one
+            for future in (f for candidate in candidates for f in candidate):
+                future.cancel()
+            if not finished:
+                outcome = "budget_exhausted"
+                break
+
+            scored = [
+                (score, candidate)
+                for score, candidate in zip(self._score(finished, language, deadline, outstanding), finished)
+                if score is not None
+            ]
+            if not scored:
+                outcome = "unscored"
+                break
+            best_score, best = min(scored, key=lambda item: item[0])
+            if current_score is not None and best_score >= current_score:
+                outcome = "no_gain"
+                break
+            current, current_score, calibrated = best, best_score, True
+            outcome = "improved"
+
+        CALIBRATION_OUTCOMES.inc(outcome=outcome)
+        add_event("humanize.calibration", **{"humanize.calibration_outcome": outcome, "humanize.ai_score": current_score})
+        return current, calibrated
+
+    def stream_humanize(self, request: HumanizeRequest) -> Iterator[Dict]:
+        """
+        Start a streamed humanization.
+
+        Availability is checked here, before anything is streamed, so the
+        caller can still answer with an HTTP error.
+
+        Returns:
+            Iterator of dicts: one per paragraph in order
+            ({"index", "start", "end", "text"} or {..., "error"}), then a final
+            {"done": true, "rewritten_text", "tone", "method", "failed"} line
+            in which failed paragraphs keep their original text
+        """
+        try:
+            if not ollama_client.check_health():
+                raise ConnectionError("LLM service unavailable")
+        except ConnectionError as e:
+            raise ValueError(f"LLM_UNAVAILABLE: {str(e)}") from e
+
+        language = self._to_scalar(request.language)
+        tone = self._to_scalar(request.tone)
+        units = self._units(request)
+
+        def stream():
+            rewrites = []
+            failed = 0
+            for index, result in self._rewrite_units(request.text, units, language, tone):
+                start, end = units[index]
+                line = {"index": index, "start": start, "end": end}
+                if isinstance(result, Exception):
+                    failed += 1
+                    line["error"] = error_detail(result, default_code="LLM_ERROR")
+                    rewrites.append(request.text[start:end])
+                else:
+                    line["text"] = result
+                    rewrites.append(result)
+                yield line
+            yield {
+                "done": True,
+                "rewritten_text": self._reassemble(request.text, units, rewrites),
+                "tone": tone,
+                "method": "llm",
+                "failed": failed,
+            }
+
+        return stream()
+
+    @traced("humanize.humanize_text")
     def humanize_text(self, request: HumanizeRequest) -> HumanizeResponse:
         """
         Humanize text by rewriting it in the specified tone using LLM.
@@ -34,10 +344,12 @@ class HumanizeService:
             HumanizeResponse with rewritten text
 
         The humanization process:
-        1. Generate a natural rewrite
-        2. Validate with local AI detector
-        3. Optionally run up to 2 calibration passes if still flagged as AI
+        1. Generate a natural rewrite (paragraphs in parallel)
+        2. Score it with the local stylometric detector (or a cached detection)
+        3. While it still reads as AI and the calibration budget allows, keep
+           the best of several stronger rewrites generated in parallel
         """
+        started = time.monotonic()
         try:
             # Check if Ollama is available
             if not ollama_client.check_health():
@@ -47,44 +359,21 @@ class HumanizeService:
             tone = self._to_scalar(request.tone)
 
             # First pass: Generate humanized text
-            humanized_text = ollama_client.humanize_text(
-                text=request.text,
-                language=language,
-                tone=tone,
-                strengthen_human_style=False,
-            )
+            humanized_text = self._rewrite(request, language, tone)
 
             method = "llm"
 
-            # Optional: Calibrate with AI detector (skip if detector fails)
-            for attempt in range(self.MAX_CALIBRATION_PASSES):
+            # Calibrate with the AI detector within the time budget; detector
+            # failures keep the current rewrite
+            if self.calibration_budget > 0:
                 try:
-                    detection = ai_detection_service.detect_ai_text(
-                        AIDetectionRequest(text=humanized_text, language=language)
+                    humanized_text, calibrated = self._calibrate(
+                        humanized_text, language, tone, started + self.calibration_budget
                     )
-                    
-                    # Validate detection response
-                    if not detection or not hasattr(detection, 'label'):
-                        print(f"AI detection returned invalid response, skipping calibration")
-                        break
-                    
-                    is_flagged_ai = detection.label == "AI" or detection.aiProbability >= self.TARGET_AI_PROBABILITY
-                    if not is_flagged_ai:
-                        break
-
-                    # Recreate with stronger human style
-                    humanized_text = ollama_client.humanize_text(
-                        text=humanized_text,
-                        language=language,
-                        tone=tone,
-                        strengthen_human_style=True,
-                    )
-                    method = "llm+ai-calibrated"
-                    
+                    if calibrated:
+                        method = "llm+ai-calibrated"
                 except Exception as e:
-                    # If detector is unavailable/unreliable, keep the current rewrite
-                    print(f"AI detection skipped (attempt {attempt + 1}): {str(e)}")
-                    break
+                    print(f"AI calibration skipped: {str(e)}")
 
             return HumanizeResponse(
                 rewritten_text=humanized_text,
@@ -0,0 +1,214 @@
+"""
+Inference pool for CPU-bound model work.
+
+Plagiarism encoding, cosine similarity and MarianMT generation hold the GIL
+or torch's thread pool for the whole call. Routers submit that work here and
+await the result, so the event loop keeps serving other requests.
+
+With INFERENCE_WORKERS > 0 jobs run in a pool of spawned processes, each
+loading its own copy of the service it is asked for (real multi-core
+parallelism). With INFERENCE_WORKERS = 0 jobs run in the default thread
+pool of the current process.
+
+Loading and warm-up must reach every process, but an executor cannot
+address one: run_everywhere submits one job per process, and each job
+waits on a barrier shared by all processes before running, so no process
+can take two of them.
+
+Metrics recorded in pool processes come back with each job's result (see
+metrics.collect) and are recorded in the process that submitted it.
+"""
+
+import asyncio
+import contextvars
+import functools
+import importlib
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List
+from ..config import INFERENCE_WORKERS, TORCH_INTRA_OP_THREADS
+from ..utils.metrics import collect, unpack
+from ..utils.tracing import span
+
+
+# Services that may be submitted to the pool: name -> (module, instance attribute)
+POOL_SERVICES = {
+    "plagiarism": (".plagiarism_service", "plagiarism_service"),
+    "translation": (".translation_service", "translation_service"),
+}
+
+
+# Longest a run_everywhere job waits for the other processes to pick up theirs
+BARRIER_TIMEOUT = 300
+
+# Barrier shared by all pool processes (set in each by _init_worker)
+_barrier = None
+
+
+def _configure_torch_threads(threads: int):
+    """Apply the per-process torch thread settings."""
+    if threads <= 0:
+        return
+    import torch
+    torch.set_num_threads(threads)
+    try:
+        # Inter-op threads can only be set before torch runs any parallel work
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass
+
+
+def _init_worker(threads: int, barrier):
+    """Pool process initializer."""
+    global _barrier
+    _barrier = barrier
+    _configure_torch_threads(threads)
+
+
+def _everywhere_job(fn: Callable, args: tuple):
+    """One process's share of run_everywhere: wait for the others, then run fn here."""
+    try:
+        _barrier.wait(timeout=BARRIER_TIMEOUT)
+    except Exception as e:
+        return None, e, []
+    return collect(fn, *args)
+
+
+def _result_or_error(reply):
+    """Unpack a pool process's reply, returning its exception instead of raising it."""
+    try:
+        return unpack(reply)
+    except Exception as e:
+        return e
+
+
+def _resolve_service(name: str):
+    """Import a service module and return its global instance."""
+    if name not in POOL_SERVICES:
+        raise ValueError(f"Unknown inference service: {name}")
+    module_name, attribute = POOL_SERVICES[name]
+    module = importlib.import_module(module_name, package=__package__)
+    return getattr(module, attribute)
+
+
+def _load_service(name: str):
+    """Import a service inside a pool process without returning the instance."""
+    _resolve_service(name)
+
+
+def _run_in_worker(service: str, method: str, args: tuple, kwargs: dict):
+    """Entry point executed inside a pool process."""
+    return getattr(_resolve_service(service), method)(*args, **kwargs)
+
+
+class InferencePool:
+    """Dispatches service method calls to worker processes or threads."""
+
+    def __init__(self, workers: int = INFERENCE_WORKERS, torch_threads: int = TORCH_INTRA_OP_THREADS):
+        """
+        Initialize the inference pool.
+
+        Args:
+            workers: Number of worker processes (0 = run in threads in-process)
+            torch_threads: torch intra-op threads per process (0 = torch default)
+        """
+        self.workers = workers
+        self.torch_threads = torch_threads
+        self._executor = None
+        self._lock = threading.Lock()
+        self._local_configured = False
+        self._everywhere_lock = asyncio.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Create the process pool on first use."""
+        with self._lock:
+            if self._executor is None:
+                # spawn avoids forking a parent that already holds torch threads
+                context = multiprocessing.get_context("spawn")
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=context,
+                    initializer=_init_worker,
+                    initargs=(self.torch_threads, context.Barrier(self.workers)),
+                )
+                print(f"Inference pool started with {self.workers} worker processes")
+            return self._executor
+
+    async def run(self, service: str, method: str, *args, **kwargs):
+        """
+        Run a service method off the event loop and await its result.
+
+        Args:
+            service: Registered service name (see POOL_SERVICES)
+            method: Public method name on the service instance
+            *args, **kwargs: Picklable arguments for the method
+
+        Returns:
+            Whatever the service method returns; exceptions are re-raised.
+        """
+        loop = asyncio.get_running_loop()
+
+        with span("inference_pool.run", **{"service": service, "method": method, "pool.workers": self.workers}):
+            if self.workers <= 0:
+                if not self._local_configured:
+                    _configure_torch_threads(self.torch_threads)
+                    self._local_configured = True
+                # Same-process threads keep the trace context; worker processes do not
+                call = functools.partial(
+                    contextvars.copy_context().run, _run_in_worker, service, method, args, kwargs
+                )
+                return await loop.run_in_executor(None, call)
+
+            return unpack(await loop.run_in_executor(
+                self._get_executor(), collect, _run_in_worker, service, method, args, kwargs
+            ))
+
+    async def _everywhere(self, fn: Callable, *args) -> List:
+        """Run fn once in every pool process (once in-process without a pool)."""
+        loop = asyncio.get_running_loop()
+        if self.workers <= 0:
+            try:
+                return [await loop.run_in_executor(None, fn, *args)]
+            except Exception as e:
+                return [e]
+        executor = self._get_executor()
+        # Concurrent rounds would interleave at the barrier
+        async with self._everywhere_lock:
+            replies = await asyncio.gather(*(
+                loop.run_in_executor(executor, _everywhere_job, fn, args) for _ in range(self.workers)
+            ))
+        return [_result_or_error(reply) for reply in replies]
+
+    async def run_everywhere(self, service: str, method: str, *args) -> List:
+        """
+        Run a service method in every worker process, e.g. to warm each one up.
+
+        Returns:
+            One result per process; a process that failed contributes its exception
+        """
+        with span("inference_pool.run_everywhere", **{"service": service, "method": method, "pool.workers": self.workers}):
+            return await self._everywhere(_run_in_worker, service, method, args, {})
+
+    async def preload(self, *services: str):
+        """
+        Load services in every worker process ahead of the first request.
+
+        Raises:
+            The first load failure
+        """
+        for service in services:
+            for result in await self._everywhere(_load_service, service):
+                if isinstance(result, Exception):
+                    raise result
+
+    def shutdown(self):
+        """Stop worker processes, if any were started."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+# Global inference pool instance
+inference_pool = InferencePool()
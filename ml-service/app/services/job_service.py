@@ -0,0 +1,145 @@
+"""
+Asynchronous job service for long-running requests.
+
+Humanization, AI detection, translation and grammar calls can take minutes
+on CPU-bound Ollama hosts, longer than proxies keep an idle connection open.
+Jobs run those service calls on a worker pool; clients get a job ID right
+away and poll (or long-poll) for the result, which is kept for JOB_RESULT_TTL
+seconds. Submitting an identical request while its job is still pending or
+completed returns the existing job instead of redoing the work.
+"""
+
+import contextvars
+import hashlib
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+from ..config import JOB_WORKERS, JOB_RESULT_TTL
+from ..utils.errors import error_detail
+from ..utils.metrics import CACHE_REQUESTS
+from ..utils.tracing import add_event, span
+
+
+class Job:
+    """State of a single submitted job."""
+
+    def __init__(self, kind: str, key: str):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.key = key
+        self.status = "queued"
+        self.result = None
+        self.error: Optional[Dict] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.future: Optional[Future] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    def to_dict(self) -> Dict:
+        return {
+            "jobId": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "createdAt": self.created_at,
+            "finishedAt": self.finished_at,
+        }
+
+
+class JobService:
+    """Runs service calls in the background and keeps their results for a TTL."""
+
+    def __init__(self, workers: int = JOB_WORKERS, ttl: int = JOB_RESULT_TTL):
+        """
+        Initialize the job service.
+
+        Args:
+            workers: Number of jobs executed concurrently
+            ttl: Seconds a finished job is kept before it expires
+        """
+        self.ttl = ttl
+        self._jobs: Dict[str, Job] = {}
+        self._by_key: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="job")
+
+    @staticmethod
+    def _request_key(kind: str, payload: Dict) -> str:
+        """Content hash identifying identical submissions."""
+        body = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.sha256(f"{kind}:{body}".encode("utf-8")).hexdigest()
+
+    def _purge_expired(self):
+        """Drop finished jobs older than the TTL. Caller holds the lock."""
+        cutoff = time.time() - self.ttl
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.done and job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            job = self._jobs.pop(job_id)
+            if self._by_key.get(job.key) == job_id:
+                del self._by_key[job.key]
+
+    def _run(self, job: Job, fn: Callable, request):
+        job.status = "running"
+        try:
+            with span(f"job.{job.kind}", **{"job.id": job.id}):
+                job.result = fn(request)
+            status = "completed"
+        except Exception as e:
+            print(f"Job {job.id} ({job.kind}) failed: {type(e).__name__}: {str(e)}")
+            job.error = error_detail(e, default_code="JOB_FAILED")
+            status = "failed"
+        # finished_at before status: a job that reads as done always has it
+        job.finished_at = time.time()
+        job.status = status
+
+    def submit(self, kind: str, fn: Callable, request) -> Job:
+        """
+        Submit a service call as a job.
+
+        Args:
+            kind: Job kind (e.g. "humanize"), part of the deduplication key
+            fn: Service method taking the request
+            request: Validated request model
+
+        Returns:
+            The new job, or an existing pending/completed job for the same request
+        """
+        key = self._request_key(kind, request.model_dump())
+
+        with self._lock:
+            self._purge_expired()
+
+            existing_id = self._by_key.get(key)
+            existing = self._jobs.get(existing_id) if existing_id else None
+            hit = existing is not None and existing.status != "failed"
+            CACHE_REQUESTS.inc(cache="jobs", result="hit" if hit else "miss")
+            add_event("cache.lookup", **{"cache.name": "jobs", "cache.hit": hit})
+            if hit:
+                return existing
+
+            job = Job(kind, key)
+            self._jobs[job.id] = job
+            self._by_key[key] = job.id
+
+        job.future = self._executor.submit(contextvars.copy_context().run, self._run, job, fn, request)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return a job by ID, or None if unknown or expired."""
+        with self._lock:
+            self._purge_expired()
+            return self._jobs.get(job_id)
+
+
+# Global job service instance
+job_service = JobService()
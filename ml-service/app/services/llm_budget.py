@@ -0,0 +1,111 @@
+"""
+Per-request context and output sizing for Ollama calls.
+
+Every call used to send num_predict 512 and num_ctx 2048 (or nothing at all),
+so long humanizations and translations were cut off at 512 tokens while
+detection and short grammar checks reserved far more output than they use.
+Here the input is estimated in tokens and each operation's expected reply
+length is derived from it:
+
+- num_predict: OPERATION_BUDGETS[operation] as (ratio, extra, floor), i.e.
+  max(floor, ratio * input_tokens + extra), or a fixed budget
+- num_ctx: always OLLAMA_NUM_CTX; when the prompt and the reply do not fit
+  in it, num_predict is clipped to the room that is left
+
+num_ctx is never sized per call: Ollama restarts the model runner whenever
+a request asks for a different num_ctx than the loaded one, dropping the
+cached prompt prefix, so calls alternating between sizes would keep
+reloading the model. Every request to a model (including the warmer's load
+requests) uses the same value, and only num_predict varies.
+"""
+
+from typing import Dict, Optional
+from ..config import OLLAMA_NUM_CTX
+from ..utils.metrics import metrics
+
+
+# Tokens added by the chat template around the system and user messages
+TEMPLATE_TOKENS = 32
+
+# Output budget per operation: (ratio, extra, floor) relative to input tokens,
+# or an int for a fixed budget
+OPERATION_BUDGETS = {
+    # corrected text plus a corrections list
+    "grammar": (2.0, 128, 256),
+    # corrected text only
+    "grammar_fallback": (1.3, 32, 64),
+    "humanize": (1.6, 64, 128),
+    # target languages can need more tokens than the source (e.g. en -> hi)
+    "translate": (2.0, 64, 128),
+    # fixed-size JSON verdict plus brief reasoning
+    "detect": 256,
+}
+
+# Stop sequences for JSON replies: JSON never contains a raw blank line run,
+# but format=json output can trail whitespace until num_predict
+JSON_STOP = ["\n\n\n"]
+
+LLM_NUM_CTX = metrics.counter(
+    "ml_llm_num_ctx_total", "LLM calls by operation and num_ctx", ["operation", "num_ctx"]
+)
+LLM_OUTPUT_CLIPPED = metrics.counter(
+    "ml_llm_output_clipped_total", "LLM calls whose num_predict was clipped to fit num_ctx", ["operation"]
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count for a text.
+
+    Uses ~4 characters or ~0.75 words per token, whichever is larger, so
+    scripts with long words or few spaces (e.g. Hindi) are not undercounted.
+    """
+    if not text:
+        return 0
+    return max(len(text) // 4, len(text.split()) * 4 // 3) + 1
+
+
+def output_budget(operation: str, input_tokens: int) -> int:
+    """Tokens to allow for an operation's reply."""
+    budget = OPERATION_BUDGETS.get(operation, 512)
+    if isinstance(budget, int):
+        return budget
+    ratio, extra, floor = budget
+    return max(floor, int(input_tokens * ratio) + extra)
+
+
+def size_options(
+    operation: str,
+    text: str,
+    prompt: str,
+    system: Optional[str] = None,
+    json_output: bool = False,
+    num_ctx: int = OLLAMA_NUM_CTX,
+) -> Dict:
+    """
+    Ollama options sized for one call.
+
+    Args:
+        operation: Key of OPERATION_BUDGETS
+        text: User text the reply is derived from
+        prompt: Full user prompt sent to the model
+        system: System prompt sent with it
+        json_output: Add stop sequences for structured (JSON) replies
+        num_ctx: Context size of the model (fixed, see module docstring)
+
+    Returns:
+        Dict with num_ctx, num_predict and (for JSON) stop
+    """
+    prompt_tokens = estimate_tokens(prompt) + estimate_tokens(system or "") + TEMPLATE_TOKENS
+    num_predict = output_budget(operation, estimate_tokens(text))
+
+    if prompt_tokens + num_predict > num_ctx:
+        # Too long for the context: give the reply whatever room is left
+        num_predict = max(64, num_ctx - prompt_tokens)
+        LLM_OUTPUT_CLIPPED.inc(operation=operation)
+    LLM_NUM_CTX.inc(operation=operation, num_ctx=num_ctx)
+
+    options = {"num_ctx": num_ctx, "num_predict": num_predict}
+    if json_output:
+        options["stop"] = JSON_STOP
+    return options
@@ -0,0 +1,82 @@
+"""
+Scheduler for concurrent LLM calls.
+
+Features that fan one request out into several generations (chunked
+detection, batches, paragraph rewrites) submit them through map/submit,
+which run them on a shared thread pool. The number of requests actually
+sent to Ollama is bounded per backend by the request slots of the Ollama
+pool (ollama_pool.acquire); the thread pool is sized to keep every slot of
+every backend busy with some calls queued behind them.
+"""
+
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterable, List
+from ..config import OLLAMA_MAX_CONCURRENCY, OLLAMA_URLS
+
+
+class LLMScheduler:
+    """Bounded fan-out executor for Ollama calls."""
+
+    def __init__(self, max_concurrency: int = OLLAMA_MAX_CONCURRENCY * len(OLLAMA_URLS)):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_concurrency: Ollama request slots across all backends
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self._local = threading.local()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency * 2,
+            thread_name_prefix="llm-scheduler",
+            initializer=self._mark_worker,
+        )
+
+    def _mark_worker(self):
+        self._local.is_worker = True
+
+    def _in_worker(self) -> bool:
+        return getattr(self._local, "is_worker", False)
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """Schedule a single call and return its future."""
+        if self._in_worker():
+            # Nested fan-out from a scheduler thread runs inline to avoid
+            # starving the pool with parents waiting on their children.
+            future = Future()
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+            return future
+        # Carry the caller's context (trace spans) into the pool thread
+        return self._executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+    def map(self, fn: Callable, items: Iterable, return_exceptions: bool = False) -> List:
+        """
+        Run fn over items concurrently and return results in input order.
+
+        Args:
+            fn: Callable taking one item
+            items: Inputs to process
+            return_exceptions: If True, failed items yield their exception
+                instead of the first failure being raised
+
+        Returns:
+            List of results (or exceptions) aligned with items
+        """
+        futures = [self.submit(fn, item) for item in items]
+        results = []
+        for future in futures:
+            if return_exceptions:
+                error = future.exception()
+                results.append(error if error is not None else future.result())
+            else:
+                results.append(future.result())
+        return results
+
+
+# Global scheduler instance shared by all LLM-backed services
+llm_scheduler = LLMScheduler()
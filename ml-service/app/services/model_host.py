@@ -0,0 +1,178 @@
+"""
+Shared model host for multi-worker deployments.
+
+Every uvicorn worker normally imports the services and loads its own
+SentenceTransformer and MarianMT models. When MODEL_HOST_ADDRESS is set,
+one dedicated process (started with ML_ROLE=model-host) owns those models
+and the HTTP workers forward inference calls to it over a local
+multiprocessing manager socket, so worker count no longer multiplies memory.
+
+The manager protocol unpickles every message, so whoever holds the authkey
+can run code in the host. MODEL_HOST_AUTHKEY must therefore be set to a
+secret shared by the host and its workers; placeholder or short keys are
+refused, and only a loopback address tolerates a short key.
+
+The host is never scraped, so the metrics it records ride back on each
+call's reply (see metrics.collect). Samples are drained per call, so one
+recorded during a concurrent call may be reported by another worker, but
+each is reported exactly once.
+"""
+
+import ipaddress
+import threading
+import time
+from multiprocessing.managers import BaseManager
+from typing import Tuple
+from ..config import MODEL_HOST_ADDRESS, MODEL_HOST_AUTHKEY
+from ..utils.metrics import collect, unpack
+
+
+# Services owned by the host process: registry name -> (module, instance attribute)
+HOSTED_SERVICES = {
+    "plagiarism": (".plagiarism_service", "plagiarism_service"),
+    "translation": (".translation_service", "translation_service"),
+}
+
+# Set inside the host process so service modules build real instances there
+_serving = False
+
+# Keys that are public (old default, documentation placeholders)
+_PUBLIC_AUTHKEYS = {b"verbalq-model-host", b"change-me", b"changeme", b"secret"}
+# Shortest key accepted for a non-loopback address
+MIN_AUTHKEY_BYTES = 16
+
+
+class ModelHostManager(BaseManager):
+    """Manager exposing the heavy model services over a local socket."""
+
+
+class _HostedService:
+    """Host-side wrapper returning a service's metric samples with each result."""
+
+    def __init__(self, instance):
+        self._instance = instance
+
+    def call(self, method: str, args: tuple, kwargs: dict):
+        return collect(getattr(self._instance, method), *args, **kwargs)
+
+
+def _parse_address(address: str) -> Tuple[str, int]:
+    """Split a "host:port" string into a manager address tuple."""
+    host, _, port = address.rpartition(":")
+    return (host or "127.0.0.1", int(port))
+
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def validate_config():
+    """
+    Refuse to serve or connect without a usable authkey.
+
+    Raises:
+        RuntimeError: If MODEL_HOST_AUTHKEY is unset or a public placeholder,
+            or too short for a non-loopback MODEL_HOST_ADDRESS
+    """
+    if not MODEL_HOST_AUTHKEY:
+        raise RuntimeError(
+            "MODEL_HOST_AUTHKEY must be set when MODEL_HOST_ADDRESS is used "
+            "(e.g. python -c 'import secrets; print(secrets.token_hex(32))')"
+        )
+    if MODEL_HOST_AUTHKEY in _PUBLIC_AUTHKEYS:
+        raise RuntimeError("MODEL_HOST_AUTHKEY is a public placeholder; set a random secret")
+    host, _ = _parse_address(MODEL_HOST_ADDRESS)
+    if not _is_loopback(host) and len(MODEL_HOST_AUTHKEY) < MIN_AUTHKEY_BYTES:
+        raise RuntimeError(
+            f"MODEL_HOST_AUTHKEY must be at least {MIN_AUTHKEY_BYTES} bytes for non-loopback address {host}"
+        )
+
+
+def is_remote() -> bool:
+    """Return True if this process should use the shared model host."""
+    return bool(MODEL_HOST_ADDRESS) and not _serving
+
+
+class RemoteService:
+    """
+    Lazy proxy to a service living in the model host process.
+
+    Connection is deferred to the first call so HTTP workers can start
+    before the host has finished loading its models.
+    """
+
+    CONNECT_RETRIES = 30
+    RETRY_DELAY = 2.0
+
+    def __init__(self, name: str):
+        self._name = name
+        self._proxy = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        with self._lock:
+            if self._proxy is not None:
+                return self._proxy
+
+            validate_config()
+            ModelHostManager.register(self._name)
+            last_error = None
+            for _ in range(self.CONNECT_RETRIES):
+                try:
+                    manager = ModelHostManager(
+                        address=_parse_address(MODEL_HOST_ADDRESS),
+                        authkey=MODEL_HOST_AUTHKEY,
+                    )
+                    manager.connect()
+                    self._proxy = getattr(manager, self._name)()
+                    return self._proxy
+                except (ConnectionError, OSError) as e:
+                    last_error = e
+                    time.sleep(self.RETRY_DELAY)
+
+            raise ConnectionError(f"Model host unavailable at {MODEL_HOST_ADDRESS}: {last_error}")
+
+    def __getattr__(self, attr):
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+
+        def remote_method(*args, **kwargs):
+            proxy = self._proxy or self._connect()
+            return unpack(proxy.call(attr, args, kwargs))
+
+        return remote_method
+
+
+def serve():
+    """
+    Run the model host: load every hosted service once and serve it forever.
+
+    Each client connection is handled on its own thread, so concurrent
+    workers share the same in-memory models.
+    """
+    global _serving
+    if not MODEL_HOST_ADDRESS:
+        raise RuntimeError("MODEL_HOST_ADDRESS must be set to run the model host")
+    validate_config()
+
+    _serving = True
+
+    import importlib
+
+    for name, (module_name, attribute) in HOSTED_SERVICES.items():
+        module = importlib.import_module(module_name, package=__package__)
+        hosted = _HostedService(getattr(module, attribute))
+        ModelHostManager.register(name, callable=lambda hosted=hosted: hosted)
+
+    manager = ModelHostManager(
+        address=_parse_address(MODEL_HOST_ADDRESS),
+        authkey=MODEL_HOST_AUTHKEY,
+    )
+    server = manager.get_server()
+    print(f"✅ Model host serving {', '.join(HOSTED_SERVICES)} on {MODEL_HOST_ADDRESS}")
+    server.serve_forever()
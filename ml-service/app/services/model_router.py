@@ -0,0 +1,106 @@
+"""
+Model routing tiers for Ollama calls.
+
+Not every request needs the default model: a ten-word grammar fix can be
+served by a small quantized model at a fraction of the per-token cost.
+With OLLAMA_FAST_MODEL set, operations listed in OLLAMA_FAST_OPERATIONS
+use it for inputs up to OLLAMA_FAST_MAX_WORDS words. When the LLM queue is
+backed up (OLLAMA_FAST_QUEUE_DEPTH callers waiting for a slot) the limit
+rises to OLLAMA_FAST_PRESSURE_MAX_WORDS, shedding load to the cheap tier
+to keep tail latency down. Everything else uses OLLAMA_MODEL.
+"""
+
+import threading
+from ..config import (
+    OLLAMA_MODEL,
+    OLLAMA_FAST_MODEL,
+    OLLAMA_FAST_OPERATIONS,
+    OLLAMA_FAST_MAX_WORDS,
+    OLLAMA_FAST_QUEUE_DEPTH,
+    OLLAMA_FAST_PRESSURE_MAX_WORDS,
+)
+from ..utils.metrics import metrics
+from ..utils.tracing import add_event
+from .ollama_pool import ollama_pool
+
+
+MODEL_ROUTES = metrics.counter(
+    "ml_llm_model_routes_total", "LLM calls by operation, chosen model and routing reason", ["operation", "model", "reason"]
+)
+
+
+class ModelRouter:
+    """Chooses the Ollama model for each LLM call."""
+
+    def __init__(
+        self,
+        default_model: str = OLLAMA_MODEL,
+        fast_model: str = OLLAMA_FAST_MODEL,
+        fast_operations=OLLAMA_FAST_OPERATIONS,
+        fast_max_words: int = OLLAMA_FAST_MAX_WORDS,
+        queue_depth: int = OLLAMA_FAST_QUEUE_DEPTH,
+        pressure_max_words: int = OLLAMA_FAST_PRESSURE_MAX_WORDS,
+    ):
+        """
+        Initialize the router.
+
+        Args:
+            default_model: Model used when no tier rule applies
+            fast_model: Small model for short inputs (empty disables tiering)
+            fast_operations: Operations allowed to use the fast model
+            fast_max_words: Longest input (words) sent to the fast model
+            queue_depth: Waiting callers that count as queue pressure
+            pressure_max_words: Longest fast-model input while under pressure
+        """
+        self.default_model = default_model
+        self.fast_model = fast_model
+        self.fast_operations = set(fast_operations)
+        self.fast_max_words = fast_max_words
+        self.queue_depth = queue_depth
+        self.pressure_max_words = max(pressure_max_words, fast_max_words)
+        self._disabled = set()
+        self._lock = threading.Lock()
+
+    def _route(self, operation: str, words: int):
+        if not self.fast_model or self.fast_model in self._disabled or operation not in self.fast_operations:
+            return self.default_model, "default"
+        if words <= self.fast_max_words:
+            return self.fast_model, "short"
+        if self.queue_depth > 0 and ollama_pool.waiting >= self.queue_depth and words <= self.pressure_max_words:
+            return self.fast_model, "pressure"
+        return self.default_model, "long"
+
+    def choose(self, operation: str, text: str) -> str:
+        """
+        Pick the model for one call.
+
+        Args:
+            operation: "grammar", "translate", "humanize" or "detect"
+            text: User input the prompt is built around
+
+        Returns:
+            Ollama model name
+        """
+        model, reason = self._route(operation, len(text.split()))
+        MODEL_ROUTES.inc(operation=operation, model=model, reason=reason)
+        add_event("llm.route", **{"llm.operation": operation, "llm.model": model, "llm.route_reason": reason})
+        return model
+
+    def disable(self, model: str) -> bool:
+        """
+        Stop routing to a tier model (e.g. it is not pulled on the server).
+
+        Returns:
+            True if the model was a tier model that is now disabled
+        """
+        if model == self.default_model or model != self.fast_model:
+            return False
+        with self._lock:
+            if model not in self._disabled:
+                self._disabled.add(model)
+                print(f"⚠️ Model {model} unavailable; routing all calls to {self.default_model}")
+        return True
+
+
+# Global router instance
+model_router = ModelRouter()
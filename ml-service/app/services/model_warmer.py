@@ -0,0 +1,219 @@
+"""
+Ollama model residency: preload at startup and keep-warm heartbeats.
+
+Ollama unloads a model once its `keep_alive` expires (or when another model
+needs the memory), and the next request pays the full model load on top of
+generation. The warmer avoids that cold start:
+- at startup it loads OLLAMA_PRELOAD_MODELS on every backend allowed to
+  serve them, with a load-only generate request (no prompt), and retries
+  failed loads on every heartbeat tick (readiness waits for these models)
+- while a model has seen real traffic on a backend in the last
+  OLLAMA_KEEP_WARM_WINDOW seconds, a heartbeat re-sends the load-only
+  request whenever the pair has been idle for OLLAMA_KEEP_WARM_INTERVAL
+  seconds, refreshing keep_alive and reloading the model if it was evicted
+
+Loads are reported separately from generation: any load slower than
+COLD_LOAD_SECONDS is observed in ml_ollama_model_load_seconds by trigger
+(request, preload or heartbeat), so cold starts hitting users stand out.
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+import requests
+from ..config import (
+    OLLAMA_KEEP_ALIVE,
+    OLLAMA_PRELOAD,
+    OLLAMA_PRELOAD_MODELS,
+    OLLAMA_KEEP_WARM_INTERVAL,
+    OLLAMA_KEEP_WARM_WINDOW,
+    OLLAMA_NUM_CTX,
+)
+from ..utils.metrics import metrics
+from .ollama_pool import OllamaPool, ollama_pool
+
+
+# Ollama reports a few milliseconds of load_duration even for resident
+# models; anything above this is a real (cold) load
+COLD_LOAD_SECONDS = 0.5
+
+OLLAMA_MODEL_LOAD_SECONDS = metrics.histogram(
+    "ml_ollama_model_load_seconds",
+    "Ollama cold model loads by trigger (request, preload, heartbeat)",
+    ["model", "trigger"],
+    buckets=(0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300),
+)
+OLLAMA_MODEL_WARM = metrics.gauge(
+    "ml_ollama_model_warm", "1 if the model answered its last request or warm-up on the backend", ["backend", "model"]
+)
+
+
+class ModelWarmer:
+    """Tracks model use per backend and keeps recently used models loaded."""
+
+    def __init__(
+        self,
+        pool: OllamaPool = ollama_pool,
+        models: List[str] = OLLAMA_PRELOAD_MODELS,
+        preload: bool = OLLAMA_PRELOAD,
+        interval: float = OLLAMA_KEEP_WARM_INTERVAL,
+        window: float = OLLAMA_KEEP_WARM_WINDOW,
+        keep_alive=OLLAMA_KEEP_ALIVE,
+    ):
+        """
+        Initialize the warmer.
+
+        Args:
+            pool: Backends to keep warm
+            models: Models loaded at startup
+            preload: Whether start() preloads `models`
+            interval: Idle seconds before a heartbeat (0 disables heartbeats)
+            window: Seconds after the last real request a model is kept warm
+            keep_alive: Ollama keep_alive sent with warm-up requests
+        """
+        self.pool = pool
+        self.models = list(models)
+        self.preload_enabled = preload
+        self.interval = interval
+        self.window = window
+        self.keep_alive = keep_alive
+        self.timeout = 300  # a large model can take minutes to load from disk
+        # (backend url, model) -> monotonic time of the last real request
+        self._last_used: Dict[Tuple[str, str], float] = {}
+        # (backend url, model) -> last request or warm-up
+        self._last_activity: Dict[Tuple[str, str], float] = {}
+        self._warm: Dict[Tuple[str, str], bool] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def _mark(self, key: Tuple[str, str], warm: bool, used: bool = False):
+        now = time.monotonic()
+        with self._lock:
+            self._warm[key] = warm
+            if warm:
+                self._last_activity[key] = now
+            if used:
+                self._last_used[key] = now
+        OLLAMA_MODEL_WARM.set(1 if warm else 0, backend=key[0], model=key[1])
+
+    def record_request(self, backend_url: str, model: str, load_seconds: float):
+        """
+        Note a successful generate call.
+
+        Args:
+            backend_url: Backend that served it
+            model: Model it used
+            load_seconds: Ollama's load_duration for the call
+        """
+        self._mark((backend_url, model), True, used=True)
+        if load_seconds >= COLD_LOAD_SECONDS:
+            OLLAMA_MODEL_LOAD_SECONDS.observe(load_seconds, model=model, trigger="request")
+            print(f"⚠️ Cold start: {model} on {backend_url} took {load_seconds:.1f}s to load")
+
+    def warm(self, backend_url: str, model: str, trigger: str) -> bool:
+        """
+        Load a model on one backend with a load-only generate request.
+
+        Returns:
+            True if the model is loaded
+        """
+        start = time.perf_counter()
+        try:
+            response = requests.post(
+                f"{backend_url}/api/generate",
+                # Loaded with the num_ctx real requests use, or the first one reloads it
+                json={
+                    "model": model, "stream": False, "keep_alive": self.keep_alive,
+                    "options": {"num_ctx": OLLAMA_NUM_CTX},
+                },
+                timeout=self.timeout,
+            )
+            ok = response.status_code == 200
+        except requests.RequestException:
+            ok = False
+        elapsed = time.perf_counter() - start
+
+        self._mark((backend_url, model), ok)
+        if not ok:
+            print(f"⚠️ Could not load {model} on {backend_url} ({trigger})")
+        elif elapsed >= COLD_LOAD_SECONDS:
+            OLLAMA_MODEL_LOAD_SECONDS.observe(elapsed, model=model, trigger=trigger)
+        return ok
+
+    def preload(self, retry: bool = False):
+        """
+        Load the configured models on every backend that may serve them.
+
+        Args:
+            retry: Only load models on backends where they are not warm yet
+        """
+        for model in self.models:
+            for backend in self.pool.candidates(model):
+                if not backend.available:
+                    continue
+                if retry:
+                    with self._lock:
+                        if self._warm.get((backend.url, model)):
+                            continue
+                start = time.perf_counter()
+                if self.warm(backend.url, model, "preload"):
+                    # Keep preloaded models warm through the first window too
+                    self._mark((backend.url, model), True, used=True)
+                    print(f"✅ Preloaded {model} on {backend.url} in {time.perf_counter() - start:.1f}s")
+
+    def heartbeat(self):
+        """Warm every recently used model that has been idle for an interval."""
+        now = time.monotonic()
+        with self._lock:
+            due = [
+                key for key, used in self._last_used.items()
+                if now - used <= self.window and now - self._last_activity.get(key, 0.0) >= self.interval
+            ]
+        available = {b.url for b in self.pool.backends if b.available}
+        for backend_url, model in due:
+            if backend_url in available:
+                self.warm(backend_url, model, "heartbeat")
+
+    def start(self):
+        """Preload (if enabled) and start heartbeats in a background thread."""
+        if self._thread is not None or (not self.preload_enabled and self.interval <= 0):
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="ollama-warmer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        if self.preload_enabled:
+            self.preload()
+        if self.interval <= 0:
+            return
+        while True:
+            time.sleep(max(1.0, self.interval / 2))
+            if self.preload_enabled:
+                # Backends that were down (or evicted a model) at startup
+                self.preload(retry=True)
+            self.heartbeat()
+
+    def is_warm(self, model: str) -> bool:
+        """Whether the model is loaded on at least one backend that may serve it."""
+        with self._lock:
+            return any(self._warm.get((b.url, model)) for b in self.pool.candidates(model))
+
+    def status(self) -> List[Dict]:
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "backend": backend_url,
+                    "model": model,
+                    "warm": warm,
+                    "idleSeconds": round(now - self._last_activity[(backend_url, model)], 1)
+                    if (backend_url, model) in self._last_activity else None,
+                }
+                for (backend_url, model), warm in sorted(self._warm.items())
+            ]
+
+
+# Global warmer shared by the Ollama client and the startup hook
+model_warmer = ModelWarmer()
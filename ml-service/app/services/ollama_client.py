@@ -3,46 +3,289 @@ Ollama LLM client for grammar correction and humanization.
 
 This service uses a local Ollama server to perform grammar correction
 and text humanization using LLMs (mistral).
+
+Fixed instructions are sent in Ollama's `system` field and the per-request
+part (text, language, tone) in `prompt`. The model's chat template puts the
+system message first, so every call of an operation starts with the same
+tokens; Ollama reuses the KV cache of a matching prefix in a loaded runner
+and only evaluates the new suffix. `keep_alive` keeps the model, and with it
+that cache, loaded between calls.
 """
 
 import requests
 from typing import Dict, Optional
 import json
-import re
-from ..config import OLLAMA_URL, OLLAMA_MODEL
+import time
+from ..config import OLLAMA_MODEL, OLLAMA_STRUCTURED_OUTPUT, OLLAMA_KEEP_ALIVE, OLLAMA_NUM_CTX
+from ..utils.json_parser import parse_json_object
+from ..utils.metrics import metrics
+from ..utils.tracing import inject_headers, set_attributes, span
+from .ollama_pool import OllamaPool, ollama_pool
+from .model_router import model_router
+from .model_warmer import model_warmer
+from .llm_budget import size_options
+
+
+OLLAMA_REQUEST_SECONDS = metrics.histogram(
+    "ml_ollama_request_seconds", "Wall-clock time of Ollama generate calls", ["model"]
+)
+OLLAMA_STAGE_SECONDS = metrics.histogram(
+    "ml_ollama_stage_seconds",
+    "Ollama-reported time per stage (load, prompt_eval, eval)",
+    ["model", "stage"],
+)
+OLLAMA_TOKENS = metrics.counter(
+    "ml_ollama_tokens_total", "Tokens processed by Ollama (prompt or generated)", ["model", "kind"]
+)
+OLLAMA_PROMPT_EVAL_TOKENS = metrics.histogram(
+    "ml_ollama_prompt_eval_tokens",
+    "Prompt tokens Ollama evaluated per request (cached prefix tokens excluded)",
+    ["model"],
+    buckets=(16, 32, 64, 128, 256, 512, 1024, 2048, 4096),
+)
+
+
+# JSON schema for structured grammar corrections
+GRAMMAR_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "corrected_text": {"type": "string"},
+        "corrections": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "incorrect": {"type": "string"},
+                    "correction": {"type": "string"},
+                    "explanation": {"type": "string"},
+                },
+                "required": ["incorrect", "correction", "explanation"],
+            },
+        },
+    },
+    "required": ["corrected_text", "corrections"],
+}
+
+
+# Stable system prompts: keep these byte-identical between calls so the
+# prefix cache can be reused (no per-request values in here)
+GRAMMAR_SYSTEM_PROMPT = """You are a professional grammar correction system.
+
+Analyze the text and identify all grammar mistakes.
+
+Return ONLY JSON in this format:
+
+{
+  "corrected_text": "...",
+  "corrections": [
+    {
+      "incorrect": "...",
+      "correction": "...",
+      "explanation": "..."
+    }
+  ]
+}
+
+Rules:
+- Only include real grammar mistakes
+- Do not rewrite the sentence unnecessarily
+- Keep meaning unchanged
+- Return valid JSON only"""
+
+GRAMMAR_FALLBACK_SYSTEM_PROMPT = """You are a professional grammar corrector.
+
+Rules:
+- Correct ONLY grammar mistakes
+- Do NOT change meaning
+- Do NOT paraphrase
+- Do NOT add extra words
+- Keep sentence structure same
+- Return ONLY the corrected text without explanations"""
+
+HUMANIZE_TONES = {
+    "casual": "conversational and friendly, like talking to a friend",
+    "professional": "formal and business-appropriate",
+    "academic": "scholarly and formal with academic language",
+    "creative": "engaging and imaginative with creative flair"
+}
+
+HUMANIZE_STRONG_STYLE = """
+Additional requirements:
+- Use MORE varied sentence structures
+- Add natural imperfections (occasional colloquialisms, contractions)
+- Include personal touches and emotional nuance
+- Avoid overly formal or robotic phrasing
+- Make it sound distinctly HUMAN, not AI-generated"""
+
+TRANSLATE_SYSTEM_PROMPT = """You are a professional translator.
+
+Translate ONLY.
+Do not paraphrase.
+Do not add or remove meaning.
+Preserve exact intent.
+Return ONLY translated text."""
+
+
+def humanize_system_prompt(tone: str, strengthen_human_style: bool = False) -> str:
+    """System prompt for one tone/strength combination (eight stable variants)."""
+    tone_desc = HUMANIZE_TONES.get(tone, HUMANIZE_TONES["casual"])
+    style_instruction = HUMANIZE_STRONG_STYLE if strengthen_human_style else ""
+    return f"""Rewrite the user's text to sound natural and human-like in a {tone_desc} tone.{style_instruction}
+
+Rules:
+- Preserve the original meaning
+- Use natural language
+- Make it sound authentic
+- Write in the language given with the text
+- Return ONLY the rewritten text"""
+
+
+class ModelNotFoundError(RuntimeError):
+    """Raised when Ollama does not have the requested model."""
 
 
 class OllamaClient:
     """Client for interacting with local Ollama LLM server."""
 
-    def __init__(self, base_url: str = OLLAMA_URL, model: str = OLLAMA_MODEL):
+    def __init__(self, base_url: Optional[str] = None, model: str = OLLAMA_MODEL):
         """
         Initialize Ollama client.
         
         Args:
-            base_url: Ollama server URL
+            base_url: Single Ollama server URL (defaults to the OLLAMA_URLS pool)
             model: Default model to use (mistral)
         """
-        self.base_url = base_url.rstrip('/')
+        self.pool = OllamaPool([base_url], pins={}) if base_url else ollama_pool
+        self.base_url = self.pool.primary_url
         self.model = model
-        self.generate_url = f"{self.base_url}/api/generate"
         self.timeout = 180  # 180 seconds (3 minutes) for LLM generation - mistral can be slow
         
     def check_health(self) -> bool:
-        """Check if Ollama server is available."""
-        try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
-            return response.status_code == 200
-        except Exception:
-            return False
+        """Check if any Ollama backend is available."""
+        with span("ollama.health") as current:
+            healthy = self.pool.check_health()
+            set_attributes(current, **{"ollama.healthy": healthy})
+            return healthy
     
-    def generate(self, prompt: str, model: Optional[str] = None) -> str:
+    def _post_generate(self, payload: Dict, timeout: Optional[float] = None) -> Dict:
+        """
+        Send a non-streaming generate request and return Ollama's JSON body.
+
+        The request goes to the least-loaded healthy backend of the pool; if
+        that backend cannot be reached it is retried once on another one. A
+        routed tier model that the server does not have is disabled and the
+        call is retried with the default model.
+
+        Raises:
+            ConnectionError: If no backend is reachable or the runner crashed
+            RuntimeError: On timeout or a non-200 status
+        """
+        model = payload.get("model", self.model)
+        tried = []
+        while True:
+            # One request slot on the chosen backend, released before a retry
+            with self.pool.acquire(model, exclude=tuple(tried)) as backend:
+                tried.append(backend)
+                try:
+                    return self._post_to_backend(backend, model, payload, timeout)
+                except ModelNotFoundError:
+                    if model == self.model or not model_router.disable(model):
+                        raise
+                    model = self.model
+                    payload = {**payload, "model": model}
+                    tried = []
+                except ConnectionError:
+                    if len(tried) >= 2 or len(tried) >= len(self.pool.backends):
+                        raise
+                    print(f"⚠️ Ollama backend {backend.url} failed, retrying on another backend")
+
+    def _post_to_backend(self, backend, model: str, payload: Dict, timeout: Optional[float]) -> Dict:
+        """Send one generate request to a specific backend, updating its health."""
+        with span("ollama.generate", **{"llm.model": model, "server.address": backend.url}) as current:
+            start = time.perf_counter()
+            try:
+                with OLLAMA_REQUEST_SECONDS.time(model=model):
+                    response = requests.post(
+                        f"{backend.url}/api/generate",
+                        json=payload,
+                        headers=inject_headers(),
+                        timeout=timeout or self.timeout,
+                    )
+            except requests.exceptions.Timeout:
+                raise RuntimeError("LLM generation timeout - request took too long")
+            except requests.exceptions.ConnectionError:
+                self.pool.record_failure(backend)
+                raise ConnectionError(f"Cannot connect to Ollama server at {backend.url}")
+
+            if response.status_code != 200:
+                if response.status_code >= 500:
+                    self.pool.record_failure(backend)
+                # Ollama can crash (often GPU/CUDA-related). Treat these as "unavailable"
+                # so the API returns 503 and the frontend can show a clear toast.
+                err_text = (response.text or "").lower()
+                if "cuda error" in err_text or "runner process has terminated" in err_text:
+                    raise ConnectionError("LLM service unavailable")
+                if response.status_code == 404 and "not found" in err_text:
+                    raise ModelNotFoundError(f"Ollama model {model} not found: {response.text}")
+                raise RuntimeError(f"Ollama returned status {response.status_code}: {response.text}")
+
+            self.pool.record_success(backend, time.perf_counter() - start)
+            data = response.json()
+            self._record_timings(model, data)
+            model_warmer.record_request(backend.url, model, (data.get("load_duration") or 0) / 1e9)
+            set_attributes(
+                current,
+                **{
+                    "llm.prompt_tokens": data.get("prompt_eval_count"),
+                    "llm.completion_tokens": data.get("eval_count"),
+                    "ollama.load_ms": (data.get("load_duration") or 0) / 1e6,
+                    "ollama.prompt_eval_ms": (data.get("prompt_eval_duration") or 0) / 1e6,
+                    "ollama.eval_ms": (data.get("eval_duration") or 0) / 1e6,
+                },
+            )
+            return data
+
+    @staticmethod
+    def _record_timings(model: str, data: Dict):
+        """Record Ollama's own per-stage durations (nanoseconds) and token counts."""
+        for stage in ("load", "prompt_eval", "eval"):
+            duration = data.get(f"{stage}_duration")
+            if duration:
+                OLLAMA_STAGE_SECONDS.observe(duration / 1e9, model=model, stage=stage)
+        if data.get("prompt_eval_count"):
+            OLLAMA_TOKENS.inc(data["prompt_eval_count"], model=model, kind="prompt")
+            OLLAMA_PROMPT_EVAL_TOKENS.observe(data["prompt_eval_count"], model=model)
+        if data.get("eval_count"):
+            OLLAMA_TOKENS.inc(data["eval_count"], model=model, kind="generated")
+
+    def _payload(self, prompt: str, system: Optional[str], model: Optional[str], options: Dict) -> Dict:
+        payload = {
+            "model": model or self.model,
+            "prompt": prompt,
+            "stream": False,
+            "keep_alive": OLLAMA_KEEP_ALIVE,
+            # Same num_ctx on every request, or Ollama reloads the model
+            "options": {"num_ctx": OLLAMA_NUM_CTX, **options},
+        }
+        if system:
+            payload["system"] = system
+        return payload
+
+    def generate(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        system: Optional[str] = None,
+        options: Optional[Dict] = None,
+    ) -> str:
         """
         Generate text completion using Ollama.
         
         Args:
             prompt: Input prompt for the LLM
             model: Model to use (defaults to configured model)
+            system: Fixed instructions sent as the system message (cacheable prefix)
+            options: Ollama options overriding the defaults (e.g. from size_options)
             
         Returns:
             Generated text response
@@ -52,28 +295,14 @@ class OllamaClient:
             RuntimeError: If generation fails
         """
         try:
-            payload = {
-                "model": model or self.model,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": 0.3,  # Low temperature for more deterministic output
-                    "top_p": 0.9,
-                    "num_predict": 512,  # Limit output length for faster generation
-                    "num_ctx": 2048,     # Context window size (smaller = faster)
-                }
-            }
-            
-            response = requests.post(
-                self.generate_url,
-                json=payload,
-                timeout=self.timeout
-            )
-            
-            if response.status_code != 200:
-                raise RuntimeError(f"Ollama returned status {response.status_code}: {response.text}")
+            payload = self._payload(prompt, system, model, {
+                "temperature": 0.3,  # Low temperature for more deterministic output
+                "top_p": 0.9,
+                "num_predict": 512,  # Limit output length for faster generation
+                **(options or {}),
+            })
             
-            data = response.json()
+            data = self._post_generate(payload)
             generated_text = data.get("response", "").strip()
             
             if not generated_text:
@@ -81,12 +310,53 @@ class OllamaClient:
             
             return generated_text
             
-        except requests.exceptions.Timeout:
-            raise RuntimeError("LLM generation timeout - request took too long")
-        except requests.exceptions.ConnectionError:
-            raise ConnectionError(f"Cannot connect to Ollama server at {self.base_url}")
+        except (ConnectionError, RuntimeError):
+            raise
         except Exception as e:
             raise RuntimeError(f"LLM generation failed: {str(e)}")
+
+    def generate_json(
+        self,
+        prompt: str,
+        schema: Optional[Dict] = None,
+        options: Optional[Dict] = None,
+        model: Optional[str] = None,
+        timeout: Optional[float] = None,
+        system: Optional[str] = None,
+    ) -> Dict:
+        """
+        Generate a JSON object using Ollama's constrained decoding.
+
+        The request carries `format` ("json", or the JSON schema itself when
+        OLLAMA_STRUCTURED_OUTPUT is "schema") so the model can only emit valid
+        JSON; the tolerant parser handles anything the server lets through,
+        such as output truncated by num_predict.
+
+        Args:
+            prompt: Input prompt for the LLM
+            schema: JSON schema describing the expected object
+            options: Ollama sampling options
+            model: Model to use (defaults to configured model)
+            timeout: Request timeout in seconds (defaults to client timeout)
+            system: Fixed instructions sent as the system message (cacheable prefix)
+
+        Returns:
+            Parsed JSON object
+
+        Raises:
+            ConnectionError: If Ollama server is unavailable
+            RuntimeError: If generation fails
+            ValueError: If no JSON object could be recovered from the output
+        """
+        payload = self._payload(prompt, system, model, options or {"temperature": 0.1, "top_p": 0.9})
+        if OLLAMA_STRUCTURED_OUTPUT == "schema" and schema:
+            payload["format"] = schema
+        elif OLLAMA_STRUCTURED_OUTPUT != "off":
+            payload["format"] = "json"
+
+        data = self._post_generate(payload, timeout=timeout)
+        with span("json.parse"):
+            return parse_json_object(data.get("response", ""))
     
     def correct_grammar(self, text: str, language: str) -> Dict:
         """
@@ -101,63 +371,26 @@ class OllamaClient:
               - corrected_text: str
               - corrections: List[{"incorrect", "correction", "explanation"}]
         """
-        # Structured prompt as requested so the model returns detailed grammar fixes
-        prompt = f"""You are a professional grammar correction system.
-
-Analyze the text and identify all grammar mistakes.
-
-Return ONLY JSON in this format:
-
-{{
-  "corrected_text": "...",
-  "corrections": [
-    {{
-      "incorrect": "...",
-      "correction": "...",
-      "explanation": "..."
-    }}
-  ]
-}}
-
-Rules:
-- Only include real grammar mistakes
-- Do not rewrite the sentence unnecessarily
-- Keep meaning unchanged
-- Return valid JSON only
-
-Text:
+        # Instructions and format spec live in the system prompt; only the
+        # text varies between calls
+        prompt = f"""Text:
 \"\"\"{text}\"\"\""""
 
-        # Call Ollama directly so we can safely parse possible JSON-with-extra-text
+        # Constrained JSON decoding; the plain-text fallback below only runs if
+        # the output still cannot be parsed
         try:
-            payload = {
-                "model": self.model,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
+            parsed = self.generate_json(
+                prompt,
+                system=GRAMMAR_SYSTEM_PROMPT,
+                model=model_router.choose("grammar", text),
+                schema=GRAMMAR_SCHEMA,
+                options={
                     "temperature": 0.1,
                     "top_p": 0.9,
+                    **size_options("grammar", text, prompt, GRAMMAR_SYSTEM_PROMPT, json_output=True),
                 },
-            }
-
-            response = requests.post(
-                self.generate_url,
-                json=payload,
-                timeout=self.timeout,
             )
 
-            if response.status_code != 200:
-                raise RuntimeError(f"Ollama returned status {response.status_code}: {response.text}")
-
-            data = response.json()
-            response_text = data.get("response", "").strip()
-
-            # Try to extract JSON object from the response (in case model wraps it in prose)
-            json_match = re.search(r"\{.*\}", response_text, re.DOTALL)
-            json_str = json_match.group() if json_match else response_text
-
-            parsed = json.loads(json_str)
-
             corrected_text = str(parsed.get("corrected_text", "")).strip()
             corrections = parsed.get("corrections", []) or []
 
@@ -173,22 +406,16 @@ Text:
         except (json.JSONDecodeError, ValueError, RuntimeError):
             # Parsing failed or model returned something unexpected:
             # fall back to best-effort plain correction using generic generate()
-            fallback_prompt = f"""You are a professional grammar corrector.
-
-Rules:
-- Correct ONLY grammar mistakes
-- Do NOT change meaning
-- Do NOT paraphrase
-- Do NOT add extra words
-- Keep sentence structure same
-- Return ONLY the corrected text without explanations
-
-Language: {language}
+            fallback_prompt = f"""Language: {language}
 Text: {text}
 
 Corrected text:"""
 
-            corrected = self.generate(fallback_prompt).strip()
+            corrected = self.generate(
+                fallback_prompt,
+                system=GRAMMAR_FALLBACK_SYSTEM_PROMPT,
+                options=size_options("grammar_fallback", text, fallback_prompt, GRAMMAR_FALLBACK_SYSTEM_PROMPT),
+            ).strip()
 
             if corrected.startswith('"') and corrected.endswith('"'):
                 corrected = corrected[1:-1]
@@ -200,7 +427,14 @@ Corrected text:"""
                 "corrections": [],
             }
     
-    def humanize_text(self, text: str, language: str, tone: str = "casual", strengthen_human_style: bool = False) -> str:
+    def humanize_text(
+        self,
+        text: str,
+        language: str,
+        tone: str = "casual",
+        strengthen_human_style: bool = False,
+        temperature: Optional[float] = None,
+    ) -> str:
         """
         Humanize text using LLM.
         
@@ -209,44 +443,27 @@ Corrected text:"""
             language: Language code
             tone: Desired tone (casual, professional, academic, creative)
             strengthen_human_style: If True, use more aggressive humanization
+            temperature: Sampling temperature (defaults to the generate() default)
             
         Returns:
             Humanized text
         """
-        tone_instructions = {
-            "casual": "conversational and friendly, like talking to a friend",
-            "professional": "formal and business-appropriate",
-            "academic": "scholarly and formal with academic language",
-            "creative": "engaging and imaginative with creative flair"
-        }
-        
-        tone_desc = tone_instructions.get(tone, tone_instructions["casual"])
-        
-        # Adjust prompt based on strengthening flag
-        if strengthen_human_style:
-            style_instruction = """
-Additional requirements:
-- Use MORE varied sentence structures
-- Add natural imperfections (occasional colloquialisms, contractions)
-- Include personal touches and emotional nuance
-- Avoid overly formal or robotic phrasing
-- Make it sound distinctly HUMAN, not AI-generated"""
-        else:
-            style_instruction = ""
-        
-        prompt = f"""Rewrite this text to sound natural and human-like in a {tone_desc} tone.{style_instruction}
-
-Rules:
-- Preserve the original meaning
-- Use natural language
-- Make it sound authentic
-- Language: {language}
+        prompt = f"""Language: {language}
 
 Original text: {text}
 
 Rewritten text:"""
         
-        humanized = self.generate(prompt)
+        system = humanize_system_prompt(tone, strengthen_human_style)
+        options = size_options("humanize", text, prompt, system)
+        if temperature is not None:
+            options["temperature"] = temperature
+        humanized = self.generate(
+            prompt,
+            model=model_router.choose("humanize", text),
+            system=system,
+            options=options,
+        )
         
         # Clean up response
         humanized = humanized.strip()
@@ -273,20 +490,16 @@ Rewritten text:"""
             ConnectionError: If Ollama server is unavailable
             RuntimeError: If translation fails
         """
-        prompt = f"""You are a professional translator.
+        prompt = f"""From {source_lang} to {target_lang}:
 
-Translate ONLY.
-Do not paraphrase.
-Do not add or remove meaning.
-Preserve exact intent.
-
-From {source_lang} to {target_lang}:
-
-{text}
-
-Return ONLY translated text."""
+{text}"""
         
-        translated = self.generate(prompt)
+        translated = self.generate(
+            prompt,
+            model=model_router.choose("translate", text),
+            system=TRANSLATE_SYSTEM_PROMPT,
+            options=size_options("translate", text, prompt, TRANSLATE_SYSTEM_PROMPT),
+        )
         
         # Clean up response
         translated = translated.strip()
@@ -300,4 +513,6 @@ Return ONLY translated text."""
 
 # Global Ollama client instance
 ollama_client = OllamaClient()
-print("Using Ollama model:", OLLAMA_MODEL)
\ No newline at end of file
+print("Using Ollama model:", OLLAMA_MODEL)
+if model_router.fast_model:
+    print(f"Fast tier model: {model_router.fast_model} for {', '.join(sorted(model_router.fast_operations))}")
\ No newline at end of file
@@ -0,0 +1,296 @@
+"""
+Pool of Ollama backends with health-aware routing.
+
+OLLAMA_URLS lists every Ollama server. Each generate call goes to the
+available backend with the fewest outstanding requests from this process
+(ties broken by a moving average of recent latency), optionally restricted
+to the nodes a model is pinned to with OLLAMA_MODEL_PINS.
+
+Every backend has OLLAMA_MAX_CONCURRENCY request slots of its own (match
+it to the server's OLLAMA_NUM_PARALLEL). A call takes a slot on the backend
+it is routed to and waits while every candidate is full, so an ejected
+backend's slots are not handed to the remaining ones.
+
+Health is tracked two ways:
+- passively: connection failures and 5xx replies count against a backend,
+  and OLLAMA_EJECT_FAILURES consecutive failures eject it for
+  OLLAMA_EJECT_SECONDS
+- actively: with more than one backend, a background thread polls
+  /api/tags every OLLAMA_HEALTH_INTERVAL seconds, ejecting nodes that stop
+  answering and re-admitting ejected nodes as soon as they answer again
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+import requests
+from ..config import (
+    OLLAMA_URLS,
+    OLLAMA_MAX_CONCURRENCY,
+    OLLAMA_MODEL_PINS,
+    OLLAMA_HEALTH_INTERVAL,
+    OLLAMA_EJECT_FAILURES,
+    OLLAMA_EJECT_SECONDS,
+)
+from ..utils.metrics import metrics
+from ..utils.tracing import span
+
+
+BACKEND_OUTSTANDING = metrics.gauge(
+    "ml_ollama_backend_outstanding", "In-flight generate requests per Ollama backend", ["backend"]
+)
+BACKEND_UP = metrics.gauge(
+    "ml_ollama_backend_up", "1 if the Ollama backend is routable, 0 if ejected", ["backend"]
+)
+BACKEND_EJECTIONS = metrics.counter(
+    "ml_ollama_backend_ejections_total", "Times an Ollama backend was ejected", ["backend"]
+)
+LLM_QUEUE_WAIT = metrics.histogram(
+    "ml_llm_queue_wait_seconds", "Time spent waiting for an Ollama request slot"
+)
+LLM_IN_FLIGHT = metrics.gauge(
+    "ml_llm_requests_in_flight", "Ollama requests currently being processed"
+)
+
+
+class NoBackendAvailable(ConnectionError):
+    """Raised when no Ollama backend can serve a model."""
+
+
+class OllamaBackend:
+    """Routing state of one Ollama server."""
+
+    # Weight of the newest sample in the latency moving average
+    LATENCY_ALPHA = 0.2
+
+    def __init__(self, url: str):
+        self.url = url.rstrip("/")
+        self.outstanding = 0
+        self.latency = 0.0
+        self.failures = 0
+        self.ejected_until = 0.0
+        BACKEND_UP.set(1, backend=self.url)
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self.ejected_until
+
+    def to_dict(self) -> Dict:
+        return {
+            "url": self.url,
+            "available": self.available,
+            "outstanding": self.outstanding,
+            "latencyMs": round(self.latency * 1000, 1),
+            "failures": self.failures,
+        }
+
+
+def parse_model_pins(spec: str) -> Dict[str, List[str]]:
+    """
+    Parse "model=url,url;model=url" into {model: [urls]}.
+
+    Model names may contain ":" (e.g. "llama3.2:1b"), so "=" and ";" are
+    the separators.
+    """
+    pins = {}
+    for entry in spec.split(";"):
+        if "=" not in entry:
+            continue
+        model, urls = entry.split("=", 1)
+        pins[model.strip()] = [url.strip().rstrip("/") for url in urls.split(",") if url.strip()]
+    return pins
+
+
+class OllamaPool:
+    """Chooses a backend per request and keeps health state for each."""
+
+    def __init__(
+        self,
+        urls: List[str] = OLLAMA_URLS,
+        pins: Optional[Dict[str, List[str]]] = None,
+        health_interval: float = OLLAMA_HEALTH_INTERVAL,
+        eject_failures: int = OLLAMA_EJECT_FAILURES,
+        eject_seconds: float = OLLAMA_EJECT_SECONDS,
+        max_concurrency: int = OLLAMA_MAX_CONCURRENCY,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            urls: Ollama server URLs
+            pins: Model name -> URLs allowed to serve it (others use any backend)
+            health_interval: Seconds between active health checks (0 disables them)
+            eject_failures: Consecutive failures that eject a backend
+            eject_seconds: How long an ejected backend is skipped
+            max_concurrency: Request slots per backend
+        """
+        self.backends = [OllamaBackend(url) for url in urls]
+        self.pins = pins if pins is not None else parse_model_pins(OLLAMA_MODEL_PINS)
+        self.health_interval = health_interval
+        self.eject_failures = max(1, eject_failures)
+        self.eject_seconds = eject_seconds
+        self.max_concurrency = max(1, max_concurrency)
+        self._lock = threading.Lock()
+        # Signalled whenever a slot is released
+        self._slot_released = threading.Condition(self._lock)
+        # Callers currently blocked waiting for a slot (queue pressure)
+        self.waiting = 0
+        self._checker: Optional[threading.Thread] = None
+
+        unknown = {url for urls in self.pins.values() for url in urls} - {b.url for b in self.backends}
+        if unknown:
+            print(f"⚠️ OLLAMA_MODEL_PINS references URLs not in OLLAMA_URLS: {', '.join(sorted(unknown))}")
+
+    @property
+    def primary_url(self) -> str:
+        return self.backends[0].url
+
+    def candidates(self, model: Optional[str]) -> List[OllamaBackend]:
+        """Backends allowed to serve a model (its pins, or every backend)."""
+        pinned = self.pins.get(model) if model else None
+        if pinned:
+            return [b for b in self.backends if b.url in pinned]
+        return self.backends
+
+    def _routable(self, model: Optional[str], exclude: tuple) -> List[OllamaBackend]:
+        """Candidates a request may go to right now."""
+        candidates = [b for b in self.candidates(model) if b not in exclude]
+        if not candidates:
+            raise NoBackendAvailable(f"No Ollama backend available for model {model}")
+        available = [b for b in candidates if b.available]
+        # All candidates ejected: fail open to the one that comes back first
+        return available or [min(candidates, key=lambda b: b.ejected_until)]
+
+    def choose(self, model: Optional[str] = None, exclude: tuple = ()) -> OllamaBackend:
+        """
+        Pick the backend for a request, ignoring free slots.
+
+        Args:
+            model: Model the request uses (honours pins)
+            exclude: Backends already tried for this request
+
+        Raises:
+            NoBackendAvailable: If every candidate is excluded
+        """
+        self._ensure_checker()
+        with self._lock:
+            return min(self._routable(model, exclude), key=lambda b: (b.outstanding, b.latency))
+
+    @contextmanager
+    def acquire(self, model: Optional[str] = None, exclude: tuple = ()):
+        """
+        Take a request slot on the best backend with one free, waiting while
+        every routable backend is full; yields the backend.
+
+        Raises:
+            NoBackendAvailable: If every candidate is excluded
+        """
+        self._ensure_checker()
+        with self._lock:
+            self.waiting += 1
+        try:
+            with LLM_QUEUE_WAIT.time(), span("ollama_pool.wait"), self._slot_released:
+                while True:
+                    free = [b for b in self._routable(model, exclude) if b.outstanding < self.max_concurrency]
+                    if free:
+                        backend = min(free, key=lambda b: (b.outstanding, b.latency))
+                        backend.outstanding += 1
+                        break
+                    # Timed: ejections and re-admissions change the routable set too
+                    self._slot_released.wait(timeout=1.0)
+        finally:
+            with self._lock:
+                self.waiting -= 1
+
+        BACKEND_OUTSTANDING.inc(backend=backend.url)
+        try:
+            with LLM_IN_FLIGHT.track_inprogress():
+                yield backend
+        finally:
+            with self._slot_released:
+                backend.outstanding -= 1
+                self._slot_released.notify_all()
+            BACKEND_OUTSTANDING.dec(backend=backend.url)
+
+    def record_success(self, backend: OllamaBackend, latency: float):
+        with self._lock:
+            backend.failures = 0
+            if backend.latency:
+                backend.latency += OllamaBackend.LATENCY_ALPHA * (latency - backend.latency)
+            else:
+                backend.latency = latency
+            self._admit(backend)
+
+    def record_failure(self, backend: OllamaBackend):
+        with self._lock:
+            backend.failures += 1
+            if backend.failures >= self.eject_failures and backend.available:
+                self._eject(backend)
+
+    def _eject(self, backend: OllamaBackend):
+        """Caller holds the lock."""
+        backend.ejected_until = time.monotonic() + self.eject_seconds
+        BACKEND_UP.set(0, backend=backend.url)
+        BACKEND_EJECTIONS.inc(backend=backend.url)
+        print(f"⚠️ Ejected Ollama backend {backend.url} for {self.eject_seconds:g}s")
+
+    def _admit(self, backend: OllamaBackend):
+        """Caller holds the lock."""
+        if backend.ejected_until:
+            backend.ejected_until = 0.0
+            BACKEND_UP.set(1, backend=backend.url)
+            print(f"✅ Re-admitted Ollama backend {backend.url}")
+
+    def ping(self, backend: OllamaBackend, timeout: float = 5) -> bool:
+        """Probe /api/tags on one backend."""
+        try:
+            return requests.get(f"{backend.url}/api/tags", timeout=timeout).status_code == 200
+        except requests.RequestException:
+            return False
+
+    def check_health(self) -> bool:
+        """
+        Whether any backend can take requests.
+
+        With a background checker running this answers from tracked state;
+        a single backend is probed directly, as before pooling existed.
+        """
+        self._ensure_checker()
+        if self._checker is not None:
+            return any(b.available for b in self.backends)
+        healthy = False
+        for backend in self.backends:
+            if self.ping(backend):
+                with self._lock:
+                    self._admit(backend)
+                healthy = True
+        return healthy
+
+    def _ensure_checker(self):
+        if self._checker is not None or len(self.backends) < 2 or self.health_interval <= 0:
+            return
+        with self._lock:
+            if self._checker is None:
+                self._checker = threading.Thread(target=self._check_loop, name="ollama-health", daemon=True)
+                self._checker.start()
+
+    def _check_loop(self):
+        while True:
+            for backend in self.backends:
+                healthy = self.ping(backend)
+                with self._lock:
+                    if healthy:
+                        backend.failures = 0
+                        self._admit(backend)
+                    elif backend.available:
+                        backend.failures = self.eject_failures
+                        self._eject(backend)
+            time.sleep(self.health_interval)
+
+    def status(self) -> List[Dict]:
+        return [backend.to_dict() for backend in self.backends]
+
+
+# Global pool shared by all Ollama calls in this process
+ollama_pool = OllamaPool()
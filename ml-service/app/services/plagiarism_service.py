@@ -6,13 +6,25 @@ and paraphrased content, providing accurate plagiarism detection.
 """
 
 import os
-import nltk
+import time
 from sentence_transformers import SentenceTransformer
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
 from typing import List, Tuple, Dict, Any
 import re
 from ..models.schemas import PlagiarismCheckRequest, PlagiarismCheckResponse, MatchedSentence
+from ..utils.metrics import metrics, MODEL_LOAD_SECONDS
+from ..utils.segmentation import split_sentences
+from ..utils.tracing import span, traced
+from . import model_host
+
+
+EMBEDDING_ENCODE_SECONDS = metrics.histogram(
+    "ml_embedding_encode_seconds", "SentenceTransformer encode time per call"
+)
+SIMILARITY_SEARCH_SECONDS = metrics.histogram(
+    "ml_similarity_search_seconds", "Cosine similarity search time against the corpus"
+)
 
 
 class PlagiarismService:
@@ -25,12 +37,6 @@ class PlagiarismService:
         self.corpus_embeddings = None
         self.corpus_sources: List[str] = []
 
-        # Download required NLTK data
-        try:
-            nltk.data.find('tokenizers/punkt')
-        except LookupError:
-            nltk.download('punkt', quiet=True)
-
         # Initialize embedding model (load once globally for performance)
         self._initialize_model()
         
@@ -41,7 +47,9 @@ class PlagiarismService:
         """Initialize the sentence transformer model."""
         try:
             # Use all-MiniLM-L6-v2 - fast, small, accurate, industry standard
+            load_start = time.perf_counter()
             self.model = SentenceTransformer('all-MiniLM-L6-v2')
+            MODEL_LOAD_SECONDS.set(time.perf_counter() - load_start, model="all-MiniLM-L6-v2")
             print("✅ Semantic embedding model loaded successfully")
         except Exception as e:
             print(f"❌ Failed to load embedding model: {e}")
@@ -91,7 +99,7 @@ class PlagiarismService:
 
         # Process documents into sentences
         for doc in sample_documents:
-            sentences = nltk.sent_tokenize(doc['content'])
+            sentences = split_sentences(doc['content'], "en")
             self.corpus_sentences.extend(sentences)
             self.corpus_sources.extend([doc['source']] * len(sentences))
 
@@ -105,6 +113,65 @@ class PlagiarismService:
             )
             print(f"✅ Generated embeddings for {len(self.corpus_sentences)} sentences")
 
+    @staticmethod
+    def _language(request: PlagiarismCheckRequest) -> str:
+        return request.language.value if hasattr(request.language, "value") else request.language
+
+    def _build_response(self, input_sentences: List[str], similarities: np.ndarray) -> PlagiarismCheckResponse:
+        """
+        Score input sentences against the corpus similarity matrix.
+
+        Args:
+            input_sentences: Sentences of one input text
+            similarities: Matrix of shape (len(input_sentences), corpus size)
+        """
+        total_sentences = len(input_sentences)
+        
+        # Find matches above semantic threshold
+        matched_sentences = []
+        matched_count = 0
+        
+        # Semantic similarity thresholds
+        HIGH_THRESHOLD = 0.85    # High plagiarism (direct copy)
+        MEDIUM_THRESHOLD = 0.70  # Possible paraphrasing
+        
+        for i, input_sentence in enumerate(input_sentences):
+            # Find best match for this input sentence
+            sentence_similarities = similarities[i]
+            best_match_idx = sentence_similarities.argmax()
+            best_similarity = sentence_similarities[best_match_idx]
+            
+            # Check if similarity exceeds threshold
+            if best_similarity >= MEDIUM_THRESHOLD:
+                matched_count += 1
+                # Values are known to be valid: skip per-item validation
+                # (cosine similarity can exceed 1.0 by rounding error)
+                matched_sentences.append(MatchedSentence.model_construct(
+                    text=self.corpus_sentences[best_match_idx],
+                    similarity=min(1.0, float(best_similarity))
+                ))
+
+        # Calculate plagiarism score
+        plagiarism_score = (matched_count / total_sentences) * 100 if total_sentences > 0 else 0
+        
+        # Determine risk level
+        if plagiarism_score <= 20:
+            risk_level = "Low"
+        elif plagiarism_score <= 50:
+            risk_level = "Medium"
+        elif plagiarism_score <= 80:
+            risk_level = "High"
+        else:
+            risk_level = "Severe"
+
+        return PlagiarismCheckResponse(
+            plagiarismScore=round(plagiarism_score, 1),
+            riskLevel=risk_level,
+            matchedSentences=matched_sentences,
+            totalSentences=total_sentences
+        )
+
+    @traced("plagiarism.check_plagiarism")
     def check_plagiarism(self, request: PlagiarismCheckRequest) -> PlagiarismCheckResponse:
         """
         Check input text for plagiarism using semantic similarity.
@@ -129,7 +196,7 @@ class PlagiarismService:
                 raise RuntimeError("Embedding model not initialized")
 
             # Split input text into sentences
-            input_sentences = nltk.sent_tokenize(request.text.strip())
+            input_sentences = split_sentences(request.text, self._language(request))
 
             if not input_sentences:
                 return PlagiarismCheckResponse(
@@ -139,59 +206,19 @@ class PlagiarismService:
                     totalSentences=0
                 )
 
-            total_sentences = len(input_sentences)
-            
             # Generate embeddings for input sentences (batch processing)
-            input_embeddings = self.model.encode(
-                input_sentences, 
-                convert_to_tensor=False,
-                show_progress_bar=False
-            )
+            with EMBEDDING_ENCODE_SECONDS.time(), span("embedding.encode", **{"batch.size": len(input_sentences)}):
+                input_embeddings = self.model.encode(
+                    input_sentences, 
+                    convert_to_tensor=False,
+                    show_progress_bar=False
+                )
 
             # Calculate similarities with corpus
-            similarities = cosine_similarity(input_embeddings, self.corpus_embeddings)
-            
-            # Find matches above semantic threshold
-            matched_sentences = []
-            matched_count = 0
-            
-            # Semantic similarity thresholds
-            HIGH_THRESHOLD = 0.85    # High plagiarism (direct copy)
-            MEDIUM_THRESHOLD = 0.70  # Possible paraphrasing
-            
-            for i, input_sentence in enumerate(input_sentences):
-                # Find best match for this input sentence
-                sentence_similarities = similarities[i]
-                best_match_idx = sentence_similarities.argmax()
-                best_similarity = sentence_similarities[best_match_idx]
-                
-                # Check if similarity exceeds threshold
-                if best_similarity >= MEDIUM_THRESHOLD:
-                    matched_count += 1
-                    matched_sentences.append(MatchedSentence(
-                        text=self.corpus_sentences[best_match_idx],
-                        similarity=float(best_similarity)
-                    ))
-
-            # Calculate plagiarism score
-            plagiarism_score = (matched_count / total_sentences) * 100 if total_sentences > 0 else 0
-            
-            # Determine risk level
-            if plagiarism_score <= 20:
-                risk_level = "Low"
-            elif plagiarism_score <= 50:
-                risk_level = "Medium"
-            elif plagiarism_score <= 80:
-                risk_level = "High"
-            else:
-                risk_level = "Severe"
+            with SIMILARITY_SEARCH_SECONDS.time(), span("similarity.search", **{"corpus.size": len(self.corpus_sentences)}):
+                similarities = cosine_similarity(input_embeddings, self.corpus_embeddings)
 
-            return PlagiarismCheckResponse(
-                plagiarismScore=round(plagiarism_score, 1),
-                riskLevel=risk_level,
-                matchedSentences=matched_sentences,
-                totalSentences=total_sentences
-            )
+            return self._build_response(input_sentences, similarities)
 
         except Exception as e:
             print(f"Plagiarism detection error: {e}")
@@ -203,6 +230,60 @@ class PlagiarismService:
                 totalSentences=0
             )
 
+    @traced("plagiarism.check_plagiarism_batch")
+    def check_plagiarism_batch(self, requests: List[PlagiarismCheckRequest]) -> List[Any]:
+        """
+        Check many texts with a single encode and similarity pass.
+
+        Sentences of all texts are embedded together, compared with the corpus
+        in one matrix product, and the rows are split back per text.
+
+        Args:
+            requests: Texts to check
+
+        Returns:
+            One PlagiarismCheckResponse (or the exception that prevented it) per request
+        """
+        if not self.model:
+            error = RuntimeError("Embedding model not initialized")
+            return [error for _ in requests]
+
+        per_request = [split_sentences(request.text, self._language(request)) for request in requests]
+        all_sentences = [sentence for sentences in per_request for sentence in sentences]
+
+        try:
+            if all_sentences:
+                with EMBEDDING_ENCODE_SECONDS.time(), span("embedding.encode", **{"batch.size": len(all_sentences)}):
+                    embeddings = self.model.encode(
+                        all_sentences,
+                        convert_to_tensor=False,
+                        show_progress_bar=False
+                    )
+                with SIMILARITY_SEARCH_SECONDS.time(), span("similarity.search", **{"corpus.size": len(self.corpus_sentences)}):
+                    similarities = cosine_similarity(embeddings, self.corpus_embeddings)
+        except Exception as e:
+            print(f"Plagiarism batch error: {e}")
+            return [e for _ in requests]
+
+        results = []
+        offset = 0
+        for sentences in per_request:
+            if not sentences:
+                results.append(PlagiarismCheckResponse(
+                    plagiarismScore=0,
+                    riskLevel="Low",
+                    matchedSentences=[],
+                    totalSentences=0
+                ))
+                continue
+            rows = similarities[offset:offset + len(sentences)]
+            offset += len(sentences)
+            results.append(self._build_response(sentences, rows))
+        return results
+
 
-# Global service instance
-plagiarism_service = PlagiarismService()
\ No newline at end of file
+# Global service instance (proxied to the shared model host when configured)
+if model_host.is_remote():
+    plagiarism_service = model_host.RemoteService("plagiarism")
+else:
+    plagiarism_service = PlagiarismService()
\ No newline at end of file
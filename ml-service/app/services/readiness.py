@@ -0,0 +1,194 @@
+"""
+Worker readiness and startup warm-up.
+
+/health only says the process is up. A worker that has just started still
+has to load the embedding model and MarianMT pairs, and its first inference
+on each pays one-off allocation and kernel setup; routing traffic to it
+before then makes the first users wait. The warm-up runs in the background
+after startup and sends one synthetic request through each path:
+
+- embedding: a short plagiarism batch check (SentenceTransformer encode +
+  corpus similarity)
+- translation:<src>-<tgt>: one MarianMT translation per pair listed in
+  WARMUP_TRANSLATION_PAIRS ("all" = every OPUS pair)
+
+With INFERENCE_WORKERS > 0 every pool process holds its own models, so each
+synthetic request runs once per process (inference_pool.run_everywhere) and
+a component is ready only when all of them succeeded.
+
+Ollama models are loaded by the model warmer's preload; readiness reports
+their per-model warm state alongside the backends' availability.
+
+Components move pending -> warming -> ready (or failed). The worker is
+ready once every component is ready and, with READINESS_REQUIRE_OLLAMA, an
+Ollama backend is reachable with the preloaded models warm. A failed
+component keeps the worker unready; its error is shown in /health/ready.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from ..config import READINESS_REQUIRE_OLLAMA, WARMUP_ENABLED, WARMUP_TRANSLATION_PAIRS
+from ..models.schemas import PlagiarismCheckRequest
+from ..utils.metrics import metrics
+from .inference_pool import inference_pool
+from .model_warmer import ModelWarmer, model_warmer
+from .ollama_client import ollama_client
+
+
+WARMUP_TEXT = (
+    "Machine learning models improve with more data. "
+    "The committee reviewed the proposal before approving the budget."
+)
+WARMUP_TRANSLATION_TEXT = "The service is starting."
+
+COMPONENT_READY = metrics.gauge(
+    "ml_component_ready", "1 once the component has completed its warm-up", ["component"]
+)
+WARMUP_SECONDS = metrics.gauge(
+    "ml_warmup_seconds", "Startup warm-up duration per component (load + first inference)", ["component"]
+)
+
+
+class Readiness:
+    """Runs the startup warm-up and reports whether the worker can take traffic."""
+
+    def __init__(
+        self,
+        enabled: bool = WARMUP_ENABLED,
+        translation_pairs: List[str] = WARMUP_TRANSLATION_PAIRS,
+        require_ollama: bool = READINESS_REQUIRE_OLLAMA,
+        warmer: ModelWarmer = model_warmer,
+    ):
+        """
+        Initialize readiness tracking.
+
+        Args:
+            enabled: Run synthetic requests (otherwise only load the embedding model)
+            translation_pairs: "src-tgt" pairs to warm up, or ["all"]
+            require_ollama: Whether Ollama state gates readiness
+            warmer: Model warmer whose preloaded models are reported
+        """
+        self.enabled = enabled
+        self.translation_pairs = translation_pairs
+        self.require_ollama = require_ollama
+        self.warmer = warmer
+        self._components: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.finished = False
+
+    def _set(self, component: str, state: str, seconds: Optional[float] = None, error: Optional[str] = None):
+        with self._lock:
+            self._components[component] = {"state": state, "seconds": seconds, "error": error}
+        COMPONENT_READY.set(1 if state == "ready" else 0, component=component)
+        if seconds is not None:
+            WARMUP_SECONDS.set(seconds, component=component)
+
+    async def _warm(self, component: str, call) -> bool:
+        """Run one warm-up call (one result per process) and record its outcome."""
+        self._set(component, "warming")
+        start = time.perf_counter()
+        try:
+            results = await call()
+            failures = [result for result in results if isinstance(result, Exception)]
+            if len(failures) == len(results) == 1:
+                raise failures[0]
+            if failures:
+                raise RuntimeError(f"failed in {len(failures)} of {len(results)} processes: {failures[0]}")
+        except Exception as e:
+            self._set(component, "failed", round(time.perf_counter() - start, 2), str(e))
+            print(f"❌ Warm-up of {component} failed: {e}")
+            return False
+        elapsed = time.perf_counter() - start
+        self._set(component, "ready", round(elapsed, 2))
+        print(f"✅ Warmed up {component} in {elapsed:.1f}s")
+        return True
+
+    async def _translation_pairs(self) -> List[Tuple[str, str]]:
+        if self.translation_pairs != ["all"]:
+            return [tuple(pair.split("-", 1)) for pair in self.translation_pairs]
+        # Resolved where the models live (this process, a pool worker or the model host)
+        pairs = await inference_pool.run("translation", "get_supported_languages")
+        return [(pair["from"], pair["to"]) for pair in pairs]
+
+    async def warm_up(self):
+        """Load each model and run a synthetic request through it, one at a time."""
+        try:
+            await self._warm_up()
+        finally:
+            self.finished = True
+
+    async def _warm_up(self):
+        if not self.enabled:
+            async def load_embedding():
+                await inference_pool.preload("plagiarism")
+                return []
+
+            await self._warm("embedding", load_embedding)
+            return
+
+        async def check_plagiarism():
+            # The batch call reports failures instead of returning an empty result
+            results = await inference_pool.run_everywhere(
+                "plagiarism", "check_plagiarism_batch", [PlagiarismCheckRequest(text=WARMUP_TEXT)]
+            )
+            return [result if isinstance(result, Exception) else result[0] for result in results]
+
+        await self._warm("embedding", check_plagiarism)
+
+        if not self.translation_pairs:
+            return
+        try:
+            pairs = await self._translation_pairs()
+        except Exception as e:
+            self._set("translation", "failed", error=str(e))
+            print(f"❌ Could not list translation pairs for warm-up: {e}")
+            return
+        for src, tgt in pairs:
+            self._set(f"translation:{src}-{tgt}", "pending")
+        # One pair at a time: loading every model at once would peak memory
+        for src, tgt in pairs:
+            await self._warm(
+                f"translation:{src}-{tgt}",
+                lambda src=src, tgt=tgt: inference_pool.run_everywhere(
+                    "translation", "translate_with_opus", WARMUP_TRANSLATION_TEXT, src, tgt
+                ),
+            )
+
+    def start(self):
+        """Start the warm-up in the background (call from a startup hook)."""
+        if self._task is None:
+            self._set("embedding", "pending")
+            self._task = asyncio.get_running_loop().create_task(self.warm_up())
+
+    def ollama_status(self) -> Dict:
+        """Backend reachability and per-model warm state (blocking: may probe Ollama)."""
+        reachable = ollama_client.check_health()
+        models = {model: self.warmer.is_warm(model) for model in self.warmer.models}
+        # Without preload, models are only loaded by real traffic
+        warm = all(models.values()) if self.warmer.preload_enabled else True
+        return {
+            "ready": reachable and warm,
+            "required": self.require_ollama,
+            "reachable": reachable,
+            "models": models,
+            "backends": self.warmer.status(),
+        }
+
+    def status(self) -> Dict:
+        """Readiness of the worker with the state of every component."""
+        with self._lock:
+            components = {name: dict(state) for name, state in self._components.items()}
+        ollama = self.ollama_status()
+        ready = (
+            self.finished
+            and all(state["state"] == "ready" for state in components.values())
+            and (ollama["ready"] or not self.require_ollama)
+        )
+        return {"ready": ready, "warmupFinished": self.finished, "components": components, "ollama": ollama}
+
+
+# Global readiness tracker used by the startup hook and /health/ready
+readiness = Readiness()
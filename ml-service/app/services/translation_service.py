@@ -7,10 +7,21 @@ This service uses:
 """
 
 from transformers import MarianMTModel, MarianTokenizer
-from typing import Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
+import time
 import torch
 from ..models.schemas import TranslationRequest, TranslationResponse
+from ..config import TRANSLATION_BATCH_SIZE
+from ..utils.metrics import metrics, CACHE_REQUESTS, MODEL_LOAD_SECONDS
+from ..utils.tracing import add_event, span, traced
 from .ollama_client import ollama_client
+from .llm_scheduler import llm_scheduler
+from . import model_host
+
+
+MARIAN_GENERATE_SECONDS = metrics.histogram(
+    "ml_marian_generate_seconds", "MarianMT generate time per batch", ["pair"]
+)
 
 
 class TranslationService:
@@ -28,6 +39,9 @@ class TranslationService:
         ("es", "en"): "Helsinki-NLP/opus-mt-es-en"
     }
 
+    # Maximum texts per padded MarianMT generate call
+    BATCH_SIZE = TRANSLATION_BATCH_SIZE
+
     def __init__(self):
         """Initialize translation models cache."""
         self.models: Dict[Tuple[str, str], Dict] = {}
@@ -38,6 +52,9 @@ class TranslationService:
         Load or retrieve a cached translation model.
         Lazy-loading implementation.
         """
+        hit = lang_pair in self.models
+        CACHE_REQUESTS.inc(cache="translation_model", result="hit" if hit else "miss")
+        add_event("cache.lookup", **{"cache.name": "translation_model", "cache.hit": hit})
         if lang_pair not in self.models:
             if lang_pair not in self.TRANSLATION_MODELS:
                 raise ValueError(f"Translation between {lang_pair[0]} and {lang_pair[1]} is not supported in OPUS registry.")
@@ -45,14 +62,18 @@ class TranslationService:
             try:
                 model_name = self.TRANSLATION_MODELS[lang_pair]
                 print(f"Loading translation model: {model_name}...")
-                tokenizer = MarianTokenizer.from_pretrained(model_name)
-                model = MarianMTModel.from_pretrained(model_name)
-                model.to(self.device)
-                model.eval()
+                load_start = time.perf_counter()
+                with span("marian.load", **{"model.name": model_name}):
+                    tokenizer = MarianTokenizer.from_pretrained(model_name)
+                    model = MarianMTModel.from_pretrained(model_name)
+                    model.to(self.device)
+                    model.eval()
+                MODEL_LOAD_SECONDS.set(time.perf_counter() - load_start, model=model_name)
 
                 self.models[lang_pair] = {
                     'tokenizer': tokenizer,
-                    'model': model
+                    'model': model,
+                    'pair': f"{lang_pair[0]}-{lang_pair[1]}"
                 }
             except Exception as e:
                 print(f"Error loading model {lang_pair}: {str(e)}")
@@ -60,6 +81,7 @@ class TranslationService:
 
         return self.models[lang_pair]
 
+    @traced("translation.translate_with_opus")
     def translate_with_opus(self, text: str, source_lang: str, target_lang: str) -> str:
         """
         Translate using OPUS MarianMT model.
@@ -84,26 +106,47 @@ class TranslationService:
         
         # Load the appropriate model (lazy-load)
         model_data = self._load_model(lang_pair)
+        return self._generate_opus(model_data, [text])[0]
+
+    def _generate_opus(self, model_data: Dict, texts: List[str]) -> List[str]:
+        """
+        Translate texts with one padded generate call per batch.
+
+        Args:
+            model_data: Loaded tokenizer/model pair
+            texts: Texts for the same language pair
+
+        Returns:
+            Translated texts in input order
+        """
         tokenizer = model_data['tokenizer']
         model = model_data['model']
+        translations = []
 
-        # Tokenize input text
-        inputs = tokenizer(text, return_tensors="pt", padding=True, truncation=True, max_length=512)
-        inputs = {k: v.to(self.device) for k, v in inputs.items()}
+        for start in range(0, len(texts), self.BATCH_SIZE):
+            batch = texts[start:start + self.BATCH_SIZE]
 
-        # Generate translation
-        with torch.no_grad():
-            outputs = model.generate(
-                **inputs,
-                max_length=512,
-                num_beams=4,
-                early_stopping=True
-            )
+            # Tokenize input text (padded to the longest item in the batch)
+            inputs = tokenizer(batch, return_tensors="pt", padding=True, truncation=True, max_length=512)
+            inputs = {k: v.to(self.device) for k, v in inputs.items()}
 
-        # Decode the translated text
-        translated_text = tokenizer.decode(outputs[0], skip_special_tokens=True)
-        return translated_text.strip()
+            # Generate translation
+            with torch.no_grad(), MARIAN_GENERATE_SECONDS.time(pair=model_data['pair']), \
+                    span("marian.generate", **{"translation.pair": model_data['pair'], "batch.size": len(batch)}):
+                outputs = model.generate(
+                    **inputs,
+                    max_length=512,
+                    num_beams=4,
+                    early_stopping=True
+                )
 
+            # Decode the translated text
+            decoded = tokenizer.batch_decode(outputs, skip_special_tokens=True)
+            translations.extend(text.strip() for text in decoded)
+
+        return translations
+
+    @traced("translation.translate_with_llm")
     def translate_with_llm(self, text: str, source_lang: str, target_lang: str) -> str:
         """
         Translate using Ollama LLM fallback.
@@ -125,6 +168,7 @@ class TranslationService:
         
         return ollama_client.translate_text(text, source_lang, target_lang)
 
+    @traced("translation.translate")
     def translate(self, request: TranslationRequest) -> TranslationResponse:
         """
         Hybrid translation with OPUS + Ollama fallback.
@@ -169,10 +213,68 @@ class TranslationService:
             method=method
         )
 
-    def get_supported_languages(self):
+    @traced("translation.translate_batch")
+    def translate_batch(self, requests: List[TranslationRequest]) -> List[Any]:
+        """
+        Translate many texts, batching OPUS generation per language pair.
+
+        OPUS pairs are translated with padded batched generate calls; other
+        pairs fan out to the LLM through the scheduler.
+
+        Args:
+            requests: Translation requests (pairs may differ)
+
+        Returns:
+            One TranslationResponse (or the exception that prevented it) per request
+        """
+        results: List[Any] = [None] * len(requests)
+        groups: Dict[Tuple[str, str], List[int]] = {}
+        for index, request in enumerate(requests):
+            src = request.source_lang.value if hasattr(request.source_lang, 'value') else request.source_lang
+            tgt = request.target_lang.value if hasattr(request.target_lang, 'value') else request.target_lang
+            groups.setdefault((src, tgt), []).append(index)
+
+        for (src, tgt), indices in groups.items():
+            texts = [requests[i].text for i in indices]
+            try:
+                if (src, tgt) in self.TRANSLATION_MODELS:
+                    translations = self._generate_opus(self._load_model((src, tgt)), texts)
+                    method = "opus"
+                else:
+                    if not ollama_client.check_health():
+                        raise ConnectionError("LLM_UNAVAILABLE: Translation service unavailable")
+                    translations = llm_scheduler.map(
+                        lambda text: ollama_client.translate_text(text, src, tgt),
+                        texts,
+                        return_exceptions=True,
+                    )
+                    method = "llm"
+            except ConnectionError as e:
+                translations = [e] * len(texts)
+            except Exception as e:
+                translations = [RuntimeError(f"Translation failed: {str(e)}")] * len(texts)
+
+            for i, translated in zip(indices, translations):
+                if isinstance(translated, Exception):
+                    results[i] = translated
+                else:
+                    results[i] = TranslationResponse(
+                        translated_text=translated,
+                        source_lang=src,
+                        target_lang=tgt,
+                        method=method
+                    )
+
+        return results
+
+    @classmethod
+    def get_supported_languages(cls):
         """Return a list of supported translation language pairs."""
-        return [{"from": pair[0], "to": pair[1]} for pair in self.TRANSLATION_MODELS.keys()]
+        return [{"from": pair[0], "to": pair[1]} for pair in cls.TRANSLATION_MODELS.keys()]
 
 
-# Global service instance
-translation_service = TranslationService()
\ No newline at end of file
+# Global service instance (proxied to the shared model host when configured)
+if model_host.is_remote():
+    translation_service = model_host.RemoteService("translation")
+else:
+    translation_service = TranslationService()
\ No newline at end of file
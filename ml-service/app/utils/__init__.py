@@ -0,0 +1 @@
+# Utils Package
\ No newline at end of file
@@ -0,0 +1,27 @@
+"""
+Helpers for batch endpoints, which report per-item success or failure in a
+single response instead of failing the whole request.
+"""
+
+from typing import Any, List
+from ..models.schemas import BatchItemResult, BatchResponse
+from .errors import error_detail
+
+
+def to_batch_response(results: List[Any]) -> BatchResponse:
+    """
+    Wrap service results (responses or exceptions) into a BatchResponse.
+
+    Args:
+        results: One service response or exception per requested item
+
+    Returns:
+        BatchResponse with results in request order
+    """
+    items = []
+    for index, result in enumerate(results):
+        if isinstance(result, Exception):
+            items.append(BatchItemResult(index=index, success=False, error=error_detail(result)))
+        else:
+            items.append(BatchItemResult(index=index, success=True, result=result))
+    return BatchResponse(results=items)
@@ -0,0 +1,39 @@
+"""
+Error helpers shared by endpoints that report failures inside a payload
+(batch items, async jobs) instead of as an HTTP status.
+"""
+
+import re
+from typing import Dict
+
+
+# Services prefix error messages with a code, e.g. "LLM_UNAVAILABLE: ..."
+ERROR_CODE_PATTERN = re.compile(r"^([A-Z][A-Z_]+):")
+
+
+def error_detail(error: Exception, default_code: str = "SERVICE_ERROR") -> Dict:
+    """
+    Turn a service exception into the error shape routers return.
+
+    Args:
+        error: Exception raised by a service
+        default_code: Code used when the message carries none
+
+    Returns:
+        Dict with success, error (code) and message
+    """
+    detail = getattr(error, "detail", None)
+    if isinstance(detail, dict):
+        # HTTPException raised by request validation helpers
+        return detail
+
+    message = str(error)
+    match = ERROR_CODE_PATTERN.match(message)
+    if match:
+        code = match.group(1)
+        message = message[match.end():].strip() or code
+    elif isinstance(error, ConnectionError):
+        code = "LLM_UNAVAILABLE"
+    else:
+        code = default_code
+    return {"success": False, "error": code, "message": message}
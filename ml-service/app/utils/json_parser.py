@@ -0,0 +1,117 @@
+"""
+Tolerant JSON extraction for LLM output.
+
+Even with constrained decoding, models occasionally wrap the object in prose,
+use single quotes, leave trailing commas, or stop mid-object when they hit
+num_predict. parse_json_object recovers the first usable object in a single
+left-to-right scan instead of asking the model again.
+"""
+
+import json
+import re
+from typing import Dict
+
+
+_decoder = json.JSONDecoder()
+_TRAILING_COMMA = re.compile(r",(\s*[}\]])")
+
+
+def _sanitize(fragment: str) -> str:
+    """Fix the most common hand-written JSON mistakes."""
+    fixed = fragment.strip()
+    # Replace single quotes with double quotes (common mistake)
+    if "'" in fixed and '"' not in fixed:
+        fixed = fixed.replace("'", '"')
+    # Remove trailing commas before } or ]
+    return _TRAILING_COMMA.sub(r"\1", fixed)
+
+
+def _close_truncated(fragment: str) -> str:
+    """
+    Close any string, array or object left open by a truncated generation.
+
+    Tracks string/escape state and the bracket stack in one pass, then appends
+    the missing terminators (dropping a dangling key or comma first).
+    """
+    stack = []
+    in_string = False
+    escaped = False
+
+    for ch in fragment:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+        elif ch in "}]" and stack:
+            stack.pop()
+
+    completed = fragment + ('"' if in_string else "")
+    if not stack:
+        return completed
+
+    # A value cut off right after a comma or colon cannot be completed meaningfully
+    completed = re.sub(r'(,?\s*"[^"]*"\s*:\s*|,\s*"[^"]*"\s*|,\s*)$', "", completed.rstrip())
+    return completed + "".join(reversed(stack))
+
+
+def parse_json_object(text: str) -> Dict:
+    """
+    Parse the first JSON object found in an LLM response.
+
+    Args:
+        text: Raw model output
+
+    Returns:
+        The decoded object
+
+    Raises:
+        ValueError: If no object can be recovered
+    """
+    if not text or not text.strip():
+        raise ValueError("Empty LLM response")
+
+    stripped = text.strip()
+    try:
+        parsed = json.loads(stripped)
+        if isinstance(parsed, dict):
+            return parsed
+    except ValueError:
+        pass
+
+    start = stripped.find("{")
+    if start == -1:
+        raise ValueError("Invalid JSON response from LLM: no object found")
+
+    # Decode the first complete object, ignoring prose before or after it
+    position = start
+    while position != -1:
+        try:
+            parsed, _ = _decoder.raw_decode(stripped, position)
+            if isinstance(parsed, dict):
+                return parsed
+        except ValueError:
+            pass
+        position = stripped.find("{", position + 1)
+
+    # Repair: sanitize and close whatever was left open by truncation
+    fragment = stripped[start:]
+    end = fragment.rfind("}")
+    last_err = None
+    for candidate in (fragment[: end + 1] if end != -1 else None, fragment):
+        if not candidate:
+            continue
+        try:
+            parsed = json.loads(_close_truncated(_sanitize(candidate)))
+            if isinstance(parsed, dict):
+                return parsed
+        except ValueError as e:
+            last_err = e
+
+    raise ValueError(f"Invalid JSON response from LLM: {last_err}")
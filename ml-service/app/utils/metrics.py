@@ -0,0 +1,300 @@
+"""
+In-process metrics with Prometheus text exposition.
+
+A small, dependency-free registry of counters, gauges and histograms that
+modules create at import time and update on their hot paths. GET /metrics
+renders everything in the Prometheus text format.
+
+Metrics are per process: with several uvicorn workers each reports its own
+values. Inference pool processes and the model host are never scraped, so
+their samples travel back with every call (collect in the process doing the
+work, unpack in the HTTP worker that asked for it) and are recorded where
+/metrics can see them.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    """Base class holding label handling and the per-series lock."""
+
+    TYPE = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.TYPE}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing value."""
+
+    TYPE = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _drain(self) -> Dict:
+        with self._lock:
+            values, self._values = self._values, {}
+        return values
+
+    def _merge(self, values: Dict):
+        with self._lock:
+            for key, value in values.items():
+                self._values[key] = self._values.get(key, 0.0) + value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return self._header() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {value}" for key, value in items
+        ]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+
+    TYPE = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        # Series set() since the last drain; inc/dec (in-progress counts) stay local
+        self._set_keys = set()
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+            self._set_keys.add(key)
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track_inprogress(self, **labels):
+        """Increment for the duration of the block."""
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+    def _drain(self) -> Dict:
+        with self._lock:
+            values = {key: self._values[key] for key in self._set_keys}
+            self._set_keys = set()
+        return values
+
+    def _merge(self, values: Dict):
+        with self._lock:
+            self._values.update(values)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return self._header() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {value}" for key, value in items
+        ]
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    TYPE = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # bucket counts..., +Inf count, sum
+                series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    def _drain(self) -> Dict:
+        with self._lock:
+            series, self._series = self._series, {}
+        return series
+
+    def _merge(self, series: Dict):
+        with self._lock:
+            for key, values in series.items():
+                current = self._series.get(key)
+                if current is None:
+                    self._series[key] = list(values)
+                else:
+                    for i, value in enumerate(values):
+                        current[i] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall-clock duration of the block in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(series)) for key, series in self._series.items()]
+        lines = self._header()
+        for key, series in items:
+            for bound, count in zip(self.buckets, series):
+                bucket_labels = _format_labels(self.labelnames, key, 'le="%s"' % bound)
+                lines.append(f"{self.name}_bucket{bucket_labels} {count}")
+            inf_labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_bucket{inf_labels} {series[-2]}")
+            lines.append(f"{self.name}_count{labels} {series[-2]}")
+            lines.append(f"{self.name}_sum{labels} {series[-1]}")
+        return lines
+
+
+class MetricsRegistry:
+    """Holds every metric of the process; creation is idempotent by name."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, documentation: str, labelnames: Sequence[str], **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} already registered as {metric.TYPE}")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def drain(self) -> List[Tuple]:
+        """
+        Take the samples recorded since the last drain, resetting them.
+
+        Counters and histograms hand over their increments, gauges the
+        values set() since then. Only for processes that are never scraped.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        snapshot = []
+        for metric in metrics:
+            values = metric._drain()
+            if values:
+                snapshot.append((
+                    metric.TYPE, metric.name, metric.documentation, metric.labelnames,
+                    getattr(metric, "buckets", None), values,
+                ))
+        return snapshot
+
+    def merge(self, snapshot: List[Tuple]):
+        """Record samples drained in another process."""
+        for kind, name, documentation, labelnames, buckets, values in snapshot:
+            if kind == Histogram.TYPE:
+                metric = self.histogram(name, documentation, labelnames, buckets=buckets)
+            elif kind == Gauge.TYPE:
+                metric = self.gauge(name, documentation, labelnames)
+            else:
+                metric = self.counter(name, documentation, labelnames)
+            metric._merge(values)
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Global registry for the process
+metrics = MetricsRegistry()
+
+
+def collect(fn: Callable, *args, **kwargs) -> Tuple[Any, Optional[Exception], List[Tuple]]:
+    """
+    Run fn in a process that is never scraped.
+
+    Returns:
+        (result, exception or None, samples drained after the call), for unpack
+    """
+    try:
+        result, error = fn(*args, **kwargs), None
+    except Exception as e:
+        result, error = None, e
+    return result, error, metrics.drain()
+
+
+def unpack(reply: Tuple[Any, Optional[Exception], List[Tuple]]) -> Any:
+    """Record the samples of a collect() reply, then return its result or raise its exception."""
+    result, error, samples = reply
+    metrics.merge(samples)
+    if error is not None:
+        raise error
+    return result
+
+# Cache lookups across the service (translation model cache, job reuse, ...)
+CACHE_REQUESTS = metrics.counter(
+    "ml_cache_requests_total", "Cache lookups by cache and result (hit/miss)", ["cache", "result"]
+)
+# Time to load a model into memory
+MODEL_LOAD_SECONDS = metrics.gauge(
+    "ml_model_load_seconds", "Seconds taken to load each model", ["model"]
+)
@@ -0,0 +1,66 @@
+"""
+Text normalization and analysis shared by request validation.
+
+Request text used to be copied and rescanned at every stage: the schema
+validator split and re-joined it, the AI detection router collapsed
+whitespace again, ran two more regex passes over the punctuation and a
+third to count words, and the service then segmented it into sentences.
+Here each step runs once, with precompiled patterns:
+
+- normalize_text: whitespace collapsed by str.split (C speed), then two
+  precompiled substitutions that only ever see single spaces
+- analyze_text: word count and sentence spans of a normalized text,
+  returned as a NormalizedText that requests keep (see
+  AIDetectionRequest.normalized) so routers and services reuse it
+"""
+
+import re
+from typing import List, NamedTuple, Tuple
+from .segmentation import sentence_spans
+
+
+# Text is whitespace-collapsed first, so a single space can precede punctuation
+_SPACE_BEFORE_PUNCTUATION = re.compile(r" (?=[?.!,;:])")
+_PUNCTUATION_RUN = re.compile(r"([?.!,;:]){2,}")
+WORD_PATTERN = re.compile(r"\w+")
+
+
+class NormalizedText(NamedTuple):
+    """A normalized text with the counts derived from it."""
+
+    text: str
+    word_count: int
+    sentences: List[Tuple[int, int]]
+
+
+def strip_text(text: str) -> str:
+    """
+    Strip surrounding whitespace, rejecting blank text.
+
+    Raises:
+        ValueError: If nothing but whitespace is left
+    """
+    stripped = text.strip()
+    if not stripped:
+        raise ValueError('Text cannot be empty or only whitespace')
+    return stripped
+
+
+def normalize_text(text: str) -> str:
+    """
+    Collapse whitespace, drop spaces before punctuation and collapse
+    punctuation runs ("word , word!!!" -> "word, word!").
+
+    Raises:
+        ValueError: If the text is empty or only whitespace
+    """
+    normalized = " ".join(text.split())
+    if not normalized:
+        raise ValueError('Text cannot be empty or only whitespace')
+    normalized = _SPACE_BEFORE_PUNCTUATION.sub("", normalized)
+    return _PUNCTUATION_RUN.sub(r"\1", normalized)
+
+
+def analyze_text(text: str, language: str = "en") -> NormalizedText:
+    """Word count (\\w+ runs) and sentence spans of an already normalized text."""
+    return NormalizedText(text, len(WORD_PATTERN.findall(text)), sentence_spans(text, language))
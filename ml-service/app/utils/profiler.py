@@ -0,0 +1,191 @@
+"""
+On-demand sampling profiler.
+
+A background thread snapshots every thread's Python stack with
+sys._current_frames() at a fixed interval and counts identical stacks.
+Output is in the collapsed-stack format ("frame;frame;frame count") read by
+flamegraph.pl, speedscope and inferno.
+
+Nothing runs while no profile is active: the sampler thread only exists
+while at least one session is recording, so the cost when profiling is off
+is a header lookup per request.
+"""
+
+import functools
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional
+from ..config import PROFILING_INTERVAL_MS, PROFILING_MAX_SECONDS
+
+
+# Finished sessions kept for download
+MAX_FINISHED_SESSIONS = 20
+
+
+# Directory of this service's package and the one holding it; matching on the
+# package directory itself (not any "/app/" in a path) keeps deployments
+# under e.g. /app/ from counting every installed library as app code
+_PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_PACKAGE_PARENT = os.path.dirname(_PACKAGE_DIR)
+
+
+@functools.lru_cache(maxsize=4096)
+def _location(filename: str) -> str:
+    """Package-relative path ("app/services/x.py") for app files, the file name otherwise."""
+    path = os.path.abspath(filename)
+    if path.startswith(_PACKAGE_DIR + os.sep):
+        return os.path.relpath(path, _PACKAGE_PARENT).replace(os.sep, "/")
+    return os.path.basename(filename)
+
+
+def _frame_label(frame) -> str:
+    """Readable frame name; app code keeps its package path, others the file name."""
+    code = frame.f_code
+    return f"{code.co_name} ({_location(code.co_filename)})"
+
+
+class ProfileSession:
+    """Samples collected between start and stop."""
+
+    def __init__(self, kind: str, duration: Optional[float] = None, label: str = ""):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.label = label
+        self.started_at = time.time()
+        self.deadline = time.monotonic() + duration if duration else None
+        self.finished_at: Optional[float] = None
+        self.samples = 0
+        self.stacks: Counter = Counter()
+
+    @property
+    def active(self) -> bool:
+        return self.finished_at is None
+
+    def collapsed(self, app_only: bool = False) -> str:
+        """
+        Render samples as collapsed stacks, most frequent first.
+
+        Args:
+            app_only: Keep only stacks passing through this service's code,
+                dropping idle server and pool threads
+        """
+        return "".join(
+            f"{stack} {count}\n"
+            for stack, count in self.stacks.most_common()
+            if not app_only or f"({os.path.basename(_PACKAGE_DIR)}/" in stack
+        )
+
+    def to_dict(self) -> Dict:
+        return {
+            "profileId": self.id,
+            "kind": self.kind,
+            "label": self.label,
+            "active": self.active,
+            "samples": self.samples,
+            "startedAt": self.started_at,
+            "finishedAt": self.finished_at,
+        }
+
+
+class SamplingProfiler:
+    """Runs a sampler thread while any profile session is active."""
+
+    def __init__(self, interval_ms: int = PROFILING_INTERVAL_MS, max_seconds: int = PROFILING_MAX_SECONDS):
+        """
+        Initialize the profiler.
+
+        Args:
+            interval_ms: Milliseconds between stack snapshots
+            max_seconds: Longest a window profile may run
+        """
+        self.interval = max(1, interval_ms) / 1000.0
+        self.max_seconds = max_seconds
+        self._active: Dict[str, ProfileSession] = {}
+        self._finished: "OrderedDict[str, ProfileSession]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, kind: str, duration: Optional[float] = None, label: str = "") -> ProfileSession:
+        """
+        Start recording a new session.
+
+        Args:
+            kind: "window" (timed) or "request" (stopped by the caller)
+            duration: Seconds until the session stops by itself, capped at max_seconds
+            label: Free-form description, e.g. the request path
+
+        Returns:
+            The new session
+        """
+        if duration is not None:
+            duration = min(duration, self.max_seconds)
+        session = ProfileSession(kind, duration, label)
+        with self._lock:
+            self._active[session.id] = session
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._sample_loop, name="profiler", daemon=True)
+                self._thread.start()
+        return session
+
+    def stop(self, session_id: str) -> Optional[ProfileSession]:
+        """Stop a session and keep it for download. Returns None if unknown."""
+        with self._lock:
+            session = self._active.pop(session_id, None)
+            if session is not None:
+                self._finish(session)
+            return session or self._finished.get(session_id)
+
+    def get(self, session_id: str) -> Optional[ProfileSession]:
+        """Return an active or finished session by ID."""
+        with self._lock:
+            return self._active.get(session_id) or self._finished.get(session_id)
+
+    def list(self) -> List[ProfileSession]:
+        with self._lock:
+            return list(self._active.values()) + list(reversed(self._finished.values()))
+
+    def _finish(self, session: ProfileSession):
+        """Move a session to the finished list. Caller holds the lock."""
+        session.finished_at = time.time()
+        self._finished[session.id] = session
+        while len(self._finished) > MAX_FINISHED_SESSIONS:
+            self._finished.popitem(last=False)
+
+    def _sample_loop(self):
+        own_id = threading.get_ident()
+        while True:
+            time.sleep(self.interval)
+            now = time.monotonic()
+            with self._lock:
+                for session in [s for s in self._active.values() if s.deadline and now >= s.deadline]:
+                    del self._active[session.id]
+                    self._finish(session)
+                if not self._active:
+                    self._thread = None
+                    return
+                sessions = list(self._active.values())
+
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            stacks = []
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                frames = []
+                while frame is not None:
+                    frames.append(_frame_label(frame))
+                    frame = frame.f_back
+                frames.append(names.get(thread_id, str(thread_id)))
+                stacks.append(";".join(reversed(frames)))
+
+            with self._lock:
+                for session in sessions:
+                    session.samples += 1
+                    session.stacks.update(stacks)
+
+
+# Global profiler instance
+profiler = SamplingProfiler()
@@ -0,0 +1,74 @@
+"""
+Fast JSON serialization for responses.
+
+FastAPI's default path for a handler with a response_model dumps the
+returned model to a dict, validates that dict against the response model
+again, serializes it with jsonable_encoder and finally json.dumps it. For
+plagiarism and batch responses holding hundreds of nested models this is
+several passes of per-object Python work. Here:
+
+- model_response: the model is serialized straight to JSON by pydantic-core
+  (model_dump_json), skipping re-validation and jsonable_encoder; the
+  response_model stays on the route for the OpenAPI schema
+- FastJSONResponse: the app's default response class, rendering dicts with
+  orjson when it is installed (falls back to the standard json module)
+- StaticResponse: bodies of constant endpoints serialized once at startup
+- dumps: the same encoder for NDJSON stream lines, models included
+
+Optional dependency:
+    pip install orjson
+"""
+
+import json
+from typing import Any
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """Encode the values the JSON encoders do not know natively."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", by_alias=True)
+    if hasattr(value, "item"):  # numpy scalars
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize content (dicts, lists, models) to UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson when available."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def model_response(model: Any, status_code: int = 200) -> Response:
+    """Serialize a response model directly, bypassing FastAPI's re-validation."""
+    if not isinstance(model, BaseModel):
+        return FastJSONResponse(model, status_code=status_code)
+    return Response(
+        content=model.model_dump_json(by_alias=True), status_code=status_code, media_type="application/json"
+    )
+
+
+class StaticResponse:
+    """A constant JSON body, serialized once and served as a fresh Response per call."""
+
+    def __init__(self, content: Any):
+        self.body = (
+            content.model_dump_json(by_alias=True).encode("utf-8") if isinstance(content, BaseModel) else dumps(content)
+        )
+
+    def __call__(self) -> Response:
+        return Response(content=self.body, media_type="application/json")
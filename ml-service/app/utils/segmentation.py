@@ -0,0 +1,210 @@
+"""
+Sentence and paragraph segmentation shared by every text pipeline.
+
+Sentences are found with one precompiled regular expression per language
+family, so the scan itself runs in the regex engine; Python only looks at
+candidate boundaries ending in "." to rule out abbreviations, initials and
+sentences that continue in lower case. Rules cover every LanguageEnum
+language:
+
+- en/es/fr/de (default): . ! ? … followed by whitespace, with per-language
+  abbreviation lists (Dr., e.g., Sra., Mme., z.B., ...)
+- hi: the danda । and double danda ॥ as well as Latin punctuation
+- ar: ؟ and ۔ as well as Latin punctuation
+- zh: full-width 。！？ which need no following whitespace
+- ko: Latin punctuation, plus 。 which needs no following whitespace
+
+A blank line always ends a sentence. Segmenters are built once per rule set
+and cached. Results are (start, end) character spans into the original
+text, without surrounding whitespace, so callers slice the text they
+already hold instead of receiving copies.
+
+Units (for chunked LLM calls) are paragraphs, with paragraphs longer than a
+limit cut into runs of whole sentences, and sentences longer than the limit
+cut at whitespace (or anywhere, in text without any); text between units is
+kept verbatim when processed units are reassembled.
+"""
+
+import functools
+import re
+from typing import FrozenSet, List, Tuple
+
+
+PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+
+# Last whitespace character before the end of the searched range
+_LAST_SPACE = re.compile(r"\s(?=\S*$)")
+
+# Closing quotes and brackets that belong to the sentence they end
+_CLOSERS = "\"'”’»)\\]」』）"
+
+_ABBREVIATIONS = {
+    "en": {
+        "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "vs", "etc", "e.g", "i.e", "inc", "ltd",
+        "co", "corp", "no", "fig", "approx", "dept", "est", "jan", "feb", "mar", "apr", "jun", "jul",
+        "aug", "sep", "sept", "oct", "nov", "dec", "u.s", "u.k", "a.m", "p.m",
+    },
+    "es": {"sr", "sra", "srta", "dr", "dra", "ud", "uds", "etc", "p.ej", "pág", "núm", "av", "ee.uu"},
+    "fr": {"m", "mme", "mlle", "dr", "pr", "etc", "p.ex", "cf", "av", "env", "n°"},
+    "de": {"hr", "fr", "dr", "prof", "usw", "bzw", "z.b", "d.h", "u.a", "ca", "nr", "vgl", "ggf", "evtl", "s"},
+}
+
+# rule set -> (boundary pattern, abbreviations)
+_RULES = {
+    "latin": (rf"(?:[.!?…]+[{_CLOSERS}]*(?:\s+|$))", "en"),
+    "hi": (rf"(?:[.!?।॥]+[{_CLOSERS}]*(?:\s+|$))", None),
+    "ar": (rf"(?:[.!?؟۔]+[{_CLOSERS}]*(?:\s+|$))", None),
+    "zh": (rf"(?:[。！？!?]+[{_CLOSERS}]*\s*|[.](?:\s+|$))", None),
+    "ko": (rf"(?:[.!?]+[{_CLOSERS}]*(?:\s+|$)|。[{_CLOSERS}]*\s*)", "en"),
+}
+_LANGUAGE_RULES = {"en": "latin", "es": "latin", "fr": "latin", "de": "latin", "hi": "hi", "ar": "ar", "zh": "zh", "ko": "ko"}
+
+# Word (with inner dots, e.g. "e.g" or "z.B") right before a candidate period
+_WORD_BEFORE = re.compile(r"([\w.°]+)\.[^\w]*$")
+
+
+class SentenceSegmenter:
+    """Splits text into sentence spans with one language's rules."""
+
+    def __init__(self, boundary: str, abbreviations: FrozenSet[str] = frozenset()):
+        """
+        Initialize the segmenter.
+
+        Args:
+            boundary: Regex matching a sentence end and the whitespace after it
+            abbreviations: Lower-case words that do not end a sentence before "."
+        """
+        self.pattern = re.compile(rf"{boundary}|\n\s*\n")
+        self.abbreviations = abbreviations
+
+    def _is_boundary(self, text: str, match: "re.Match") -> bool:
+        """Rule out periods after abbreviations/initials and before lower case."""
+        end = match.end()
+        if end < len(text) and text[end].islower():
+            return False
+        terminator = match.group().rstrip()
+        if not terminator.rstrip(_CLOSERS).endswith("."):
+            return True
+        before = _WORD_BEFORE.search(text, max(0, match.start() - 16), match.start() + 1)
+        if before is None:
+            return True
+        word = before.group(1).lower()
+        # Single letters are initials ("J. R. Tolkien")
+        return not (word in self.abbreviations or (len(word) == 1 and word.isalpha()))
+
+    def boundaries(self, text: str, start: int = 0, end: int = None) -> List[int]:
+        """
+        Offsets where sentences end, including the whitespace that follows.
+
+        Args:
+            text: Text to scan
+            start: Offset to start scanning at
+            end: Offset to stop scanning at (default: end of text)
+        """
+        end = len(text) if end is None else end
+        return [
+            match.end()
+            for match in self.pattern.finditer(text, start, end)
+            if match.group()[0] == "\n" or self._is_boundary(text, match)
+        ]
+
+    def spans(self, text: str, start: int = 0, end: int = None) -> List[Tuple[int, int]]:
+        """(start, end) spans of the sentences in text[start:end], whitespace excluded."""
+        end = len(text) if end is None else end
+        spans = []
+        sentence_start = start
+        for boundary in self.boundaries(text, start, end) + [end]:
+            span = _strip_span(text, sentence_start, boundary)
+            if span:
+                spans.append(span)
+            sentence_start = boundary
+        return spans
+
+    def split(self, text: str) -> List[str]:
+        """Sentences of text as strings, whitespace excluded."""
+        return [text[start:end] for start, end in self.spans(text)]
+
+
+def _strip_span(text: str, start: int, end: int):
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return (start, end) if end > start else None
+
+
+@functools.lru_cache(maxsize=None)
+def _segmenter(rules: str, abbreviations_language: str) -> SentenceSegmenter:
+    boundary, default_abbreviations = _RULES[rules]
+    abbreviations = _ABBREVIATIONS.get(abbreviations_language or default_abbreviations or "", set())
+    return SentenceSegmenter(boundary, frozenset(abbreviations))
+
+
+def get_segmenter(language: str = "en") -> SentenceSegmenter:
+    """
+    Cached segmenter for a language code; unknown codes use the Latin rules.
+
+    The cache is keyed by rule set, so arbitrary codes cannot grow it.
+    """
+    language = (language or "en").lower()
+    rules = _LANGUAGE_RULES.get(language, "latin")
+    return _segmenter(rules, language if language in _ABBREVIATIONS else "")
+
+
+def sentence_spans(text: str, language: str = "en") -> List[Tuple[int, int]]:
+    """(start, end) spans of the sentences in text."""
+    return get_segmenter(language).spans(text)
+
+
+def split_sentences(text: str, language: str = "en") -> List[str]:
+    """Sentences of text as strings (drop-in for nltk.sent_tokenize)."""
+    return get_segmenter(language).split(text)
+
+
+def _cut_span(text: str, start: int, end: int, max_chars: int) -> List[Tuple[int, int]]:
+    """Cut text[start:end] into pieces of at most max_chars, at the last whitespace that fits."""
+    pieces = []
+    while end - start > max_chars:
+        space = _LAST_SPACE.search(text, start + 1, start + max_chars + 1)
+        cut = space.start() if space else start + max_chars
+        pieces.append((start, cut))
+        start = cut
+    pieces.append((start, end))
+    return pieces
+
+
+def split_units(text: str, max_chars: int, language: str = "en") -> List[Tuple[int, int]]:
+    """
+    Split text into (start, end) spans of at most max_chars: paragraphs,
+    paragraphs longer than that cut into runs of whole sentences, and
+    sentences longer than that cut at whitespace.
+
+    Spans exclude surrounding whitespace; the text between them is kept
+    verbatim when processed units are reassembled.
+    """
+    segmenter = get_segmenter(language)
+    paragraphs = []
+    start = 0
+    for match in PARAGRAPH_BREAK.finditer(text):
+        paragraphs.append((start, match.start()))
+        start = match.end()
+    paragraphs.append((start, len(text)))
+
+    spans = []
+    for start, end in paragraphs:
+        if end - start <= max_chars:
+            spans.append((start, end))
+            continue
+        unit_start = last = start
+        for boundary in segmenter.boundaries(text, start, end) + [end]:
+            # Close the unit before the sentence that would take it over the limit
+            if boundary - unit_start > max_chars and last > unit_start:
+                spans.append((unit_start, last))
+                unit_start = last
+            if boundary - unit_start > max_chars:
+                spans.extend(_cut_span(text, unit_start, boundary, max_chars))
+                unit_start = boundary
+            last = boundary
+        spans.append((unit_start, end))
+
+    return [span for span in (_strip_span(text, start, end) for start, end in spans) if span]
@@ -0,0 +1,145 @@
+"""
+Distributed tracing with optional OpenTelemetry.
+
+When TRACING_ENABLED is set and the OpenTelemetry SDK is installed, every
+HTTP request gets a server span that continues the caller's W3C
+traceparent, and services open child spans around their methods, cache
+lookups, model calls and Ollama requests. Spans are exported over OTLP to
+the collector in OTEL_EXPORTER_OTLP_ENDPOINT (default http://localhost:4318).
+
+Without OpenTelemetry (or with tracing disabled) every helper here is a
+no-op, so instrumented code pays only a flag check.
+
+Optional dependencies:
+    pip install opentelemetry-sdk opentelemetry-exporter-otlp-proto-http
+"""
+
+import functools
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+from ..config import TRACING_ENABLED, TRACING_SERVICE_NAME
+
+try:
+    from opentelemetry import context as otel_context, propagate, trace
+    from opentelemetry.trace import SpanKind
+except ImportError:  # pragma: no cover - optional dependency
+    trace = None
+
+
+_tracer = None
+
+
+def _setup():
+    """Install the SDK tracer provider with an OTLP exporter."""
+    global _tracer
+    if not TRACING_ENABLED:
+        return
+    if trace is None:
+        print("⚠️ TRACING_ENABLED is set but opentelemetry is not installed; tracing disabled")
+        return
+
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+    except ImportError as e:
+        print(f"⚠️ OpenTelemetry SDK/exporter missing ({e}); tracing disabled")
+        return
+
+    provider = TracerProvider(resource=Resource.create({"service.name": TRACING_SERVICE_NAME}))
+    provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    trace.set_tracer_provider(provider)
+    _tracer = trace.get_tracer("verbalq.ml-service")
+    print(f"Tracing enabled (service.name={TRACING_SERVICE_NAME})")
+
+
+def is_enabled() -> bool:
+    return _tracer is not None
+
+
+def _clean(attributes: Dict) -> Dict:
+    """Drop None values and stringify anything OpenTelemetry cannot store."""
+    return {
+        key: value if isinstance(value, (str, bool, int, float)) else str(value)
+        for key, value in attributes.items()
+        if value is not None
+    }
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """
+    Open a child span of the current context for the duration of the block.
+
+    Yields the span (or None when tracing is off); exceptions are recorded
+    on the span and re-raised.
+    """
+    if _tracer is None:
+        yield None
+        return
+    with _tracer.start_as_current_span(name, attributes=_clean(attributes)) as current:
+        yield current
+
+
+def set_attributes(current, **attributes):
+    """Set attributes on a span yielded by span(); ignores None."""
+    if current is not None:
+        current.set_attributes(_clean(attributes))
+
+
+def add_event(name: str, **attributes):
+    """Record a point-in-time event (e.g. a cache lookup) on the current span."""
+    if _tracer is not None:
+        trace.get_current_span().add_event(name, attributes=_clean(attributes))
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """Decorator wrapping a (sync) function in a span named after it."""
+    def decorator(fn: Callable) -> Callable:
+        span_name = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return fn(*args, **kwargs)
+            with span(span_name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def server_span(method: str, path: str, headers):
+    """
+    Span for an incoming HTTP request, continuing the caller's traceparent.
+
+    Args:
+        method: HTTP method
+        path: Raw request path (renamed to the route template by the caller)
+        headers: Request headers carrying W3C trace context
+    """
+    if _tracer is None:
+        yield None
+        return
+    token = otel_context.attach(propagate.extract(dict(headers)))
+    try:
+        with _tracer.start_as_current_span(
+            f"{method} {path}",
+            kind=SpanKind.SERVER,
+            attributes={"http.method": method, "http.target": path},
+        ) as current:
+            yield current
+    finally:
+        otel_context.detach(token)
+
+
+def inject_headers(headers: Optional[Dict] = None) -> Dict:
+    """Return headers with the current trace context (traceparent) added."""
+    headers = dict(headers or {})
+    if _tracer is not None:
+        propagate.inject(headers)
+    return headers
+
+
+_setup()
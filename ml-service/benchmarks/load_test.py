@@ -0,0 +1,284 @@
+"""
+End-to-end load test for the ML service against the mock Ollama server.
+
+Starts benchmarks/mock_ollama.py and the FastAPI app (uvicorn), then drives
+each scenario at several concurrency levels and records throughput,
+p50/p95/p99 latency, errors and the server's resident memory. Results are
+written as JSON and can be compared against a stored baseline; the exit
+code is 1 when any scenario regressed beyond the tolerance.
+
+Usage (from ml-service/):
+    python benchmarks/load_test.py --output results.json
+    python benchmarks/load_test.py --save-baseline benchmarks/baseline.json
+    python benchmarks/load_test.py --baseline benchmarks/baseline.json --tolerance 0.15
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import requests
+
+
+ML_SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MOCK_SCRIPT = os.path.join(ML_SERVICE_DIR, "benchmarks", "mock_ollama.py")
+
+PARAGRAPH = (
+    "Large language models have changed how people draft documents. "
+    "Writers now use them to outline ideas, check grammar and translate text. "
+    "However, the output often needs careful review, because models can state "
+    "incorrect facts with great confidence. Teachers worry that students rely on "
+    "these tools too much, while others argue they free time for deeper thinking. "
+)
+
+# name -> (method, path, JSON body)
+SCENARIOS = {
+    "health": ("GET", "/health", None),
+    "grammar": ("POST", "/grammar/check", {"text": "She go to school every days and dont like it.", "language": "en"}),
+    "grammar-batch": ("POST", "/grammar/check/batch", {"items": [{"text": f"He have {i} apple.", "language": "en"} for i in range(8)]}),
+    "humanize": ("POST", "/humanize", {"text": PARAGRAPH, "tone": "casual", "language": "en"}),
+    "ai-detect": ("POST", "/ai-detect/check", {"text": PARAGRAPH * 2, "language": "en"}),
+    "ai-detect-long": ("POST", "/ai-detect/check", {"text": PARAGRAPH * 30, "language": "en"}),
+    "ai-detect-batch": ("POST", "/ai-detect/check/batch", {"items": [{"text": PARAGRAPH * 2, "language": "en"}] * 4}),
+    "translate-llm": ("POST", "/translate", {"text": PARAGRAPH, "source_lang": "en", "target_lang": "ko"}),
+    "translate-opus": ("POST", "/translate", {"text": PARAGRAPH, "source_lang": "en", "target_lang": "es"}),
+    "plagiarism": ("POST", "/plagiarism/check", {"text": PARAGRAPH, "language": "en"}),
+    "plagiarism-batch": ("POST", "/plagiarism/check/batch", {"items": [{"text": PARAGRAPH, "language": "en"}] * 8}),
+}
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of values (None when empty)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100.0 * len(ordered) + 0.5)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def read_rss_mb(pid: Optional[int]) -> Dict[str, Optional[float]]:
+    """Current and peak resident memory of a process (Linux /proc only)."""
+    result = {"rss_mb": None, "peak_rss_mb": None}
+    if pid is None:
+        return result
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    result["rss_mb"] = int(line.split()[1]) / 1024.0
+                elif line.startswith("VmHWM:"):
+                    result["peak_rss_mb"] = int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    return result
+
+
+def wait_for(url: str, timeout: float, process: Optional[subprocess.Popen] = None):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"Process exited with code {process.returncode} before {url} was ready")
+        try:
+            if requests.get(url, timeout=2).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"Timed out waiting for {url}")
+
+
+def start_servers(args) -> List[subprocess.Popen]:
+    """Start the mock Ollama server and the app; returns [mock, app]."""
+    mock = subprocess.Popen(
+        [
+            sys.executable, MOCK_SCRIPT,
+            "--port", str(args.mock_port),
+            "--base-latency-ms", str(args.base_latency_ms),
+            "--prompt-tps", str(args.prompt_tps),
+            "--eval-tps", str(args.eval_tps),
+            "--parallel", str(args.mock_parallel),
+        ],
+        cwd=ML_SERVICE_DIR,
+    )
+    wait_for(f"http://127.0.0.1:{args.mock_port}/api/tags", 30, mock)
+
+    env = dict(os.environ, OLLAMA_URL=f"http://127.0.0.1:{args.mock_port}")
+    app = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(args.app_port),
+            "--log-level", "warning",
+        ],
+        cwd=ML_SERVICE_DIR,
+        env=env,
+    )
+    try:
+        wait_for(f"http://127.0.0.1:{args.app_port}/health", args.startup_timeout, app)
+    except Exception:
+        mock.terminate()
+        app.terminate()
+        raise
+    return [mock, app]
+
+
+def run_level(base_url: str, scenario: str, concurrency: int, total: int, timeout: float) -> Dict:
+    """Issue `total` requests with `concurrency` workers and summarize them."""
+    method, path, body = SCENARIOS[scenario]
+    url = base_url + path
+
+    def worker(count: int):
+        session = requests.Session()
+        samples = []
+        for _ in range(count):
+            start = time.perf_counter()
+            try:
+                response = session.request(method, url, json=body, timeout=timeout)
+                ok = response.status_code < 400
+            except requests.RequestException:
+                ok = False
+            samples.append((time.perf_counter() - start, ok))
+        return samples
+
+    shares = [total // concurrency + (1 if i < total % concurrency else 0) for i in range(concurrency)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        samples = [s for batch in executor.map(worker, shares) for s in batch]
+    elapsed = time.perf_counter() - start
+
+    latencies = [duration * 1000 for duration, ok in samples if ok]
+    return {
+        "scenario": scenario,
+        "concurrency": concurrency,
+        "requests": len(samples),
+        "errors": sum(1 for _, ok in samples if not ok),
+        "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+    }
+
+
+def compare(results: List[Dict], baseline: Dict, tolerance: float) -> List[str]:
+    """Return a description of every scenario that regressed against the baseline."""
+    previous = {(r["scenario"], r["concurrency"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for result in results:
+        base = previous.get((result["scenario"], result["concurrency"]))
+        if base is None:
+            continue
+        name = f"{result['scenario']}@{result['concurrency']}"
+        if base.get("p95_ms") and result["p95_ms"] and result["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {base['p95_ms']:.1f} -> {result['p95_ms']:.1f} ms")
+        if base.get("throughput_rps") and result["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {base['throughput_rps']:.2f} -> {result['throughput_rps']:.2f} req/s")
+        if result["errors"] > base.get("errors", 0):
+            regressions.append(f"{name}: errors {base.get('errors', 0)} -> {result['errors']}")
+    return regressions
+
+
+def _fmt(value, spec=".1f"):
+    return "-" if value is None else format(value, spec)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the ML service against a mock Ollama server")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated scenario names")
+    parser.add_argument("--concurrency", default="1,4,16", help="Comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=48, help="Requests per scenario and level")
+    parser.add_argument("--timeout", type=float, default=300, help="Per-request timeout in seconds")
+    parser.add_argument("--url", help="Benchmark an already running service instead of starting one")
+    parser.add_argument("--app-port", type=int, default=8701)
+    parser.add_argument("--mock-port", type=int, default=11500)
+    parser.add_argument("--base-latency-ms", type=float, default=20)
+    parser.add_argument("--prompt-tps", type=float, default=2000)
+    parser.add_argument("--eval-tps", type=float, default=100)
+    parser.add_argument("--mock-parallel", type=int, default=2, help="Simulated OLLAMA_NUM_PARALLEL")
+    parser.add_argument("--startup-timeout", type=float, default=300)
+    parser.add_argument("--output", help="Write results JSON here")
+    parser.add_argument("--baseline", help="Compare against this results file")
+    parser.add_argument("--save-baseline", help="Write results as a new baseline file")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed relative regression")
+    args = parser.parse_args()
+
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = [name for name in scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(unknown)}")
+    levels = [int(level) for level in args.concurrency.split(",")]
+
+    processes = []
+    app_pid = None
+    if args.url:
+        base_url = args.url.rstrip("/")
+    else:
+        processes = start_servers(args)
+        app_pid = processes[1].pid
+        base_url = f"http://127.0.0.1:{args.app_port}"
+
+    results = []
+    try:
+        for scenario in scenarios:
+            # Warm-up request so lazy model loads are not timed
+            run_level(base_url, scenario, 1, 1, args.timeout)
+            for level in levels:
+                result = run_level(base_url, scenario, level, args.requests, args.timeout)
+                result.update(read_rss_mb(app_pid))
+                results.append(result)
+                print(
+                    f"{scenario:18} c={level:<3} {_fmt(result['throughput_rps'], '.2f'):>8} req/s  "
+                    f"p50 {_fmt(result['p50_ms']):>8}  p95 {_fmt(result['p95_ms']):>8}  "
+                    f"p99 {_fmt(result['p99_ms']):>8} ms  errors {result['errors']}  "
+                    f"rss {_fmt(result['rss_mb'])} MB",
+                    flush=True,
+                )
+    finally:
+        for process in reversed(processes):
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "requests_per_level": args.requests,
+            "mock": {
+                "base_latency_ms": args.base_latency_ms,
+                "prompt_tps": args.prompt_tps,
+                "eval_tps": args.eval_tps,
+                "parallel": args.mock_parallel,
+            },
+        },
+        "results": results,
+    }
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                json.dump(report, f, indent=2)
+            print(f"Wrote {path}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("meta", {}).get("mock") != report["meta"]["mock"]:
+            print("Warning: baseline was recorded with different mock settings")
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("Regressions against baseline:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
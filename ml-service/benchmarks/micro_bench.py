@@ -0,0 +1,231 @@
+"""
+Micro-benchmarks for the model-side hot paths.
+
+- plagiarism: PlagiarismService.check_plagiarism against synthetic corpora
+  of increasing size (input encode + similarity search + scoring), plus the
+  similarity search alone
+- opus: TranslationService.translate_with_opus across input lengths, and
+  _generate_opus across batch sizes
+- segmentation: the shared segmenter (app.utils.segmentation) against
+  nltk.sent_tokenize across text sizes, plus the segmenter on hi/zh text
+
+Synthetic corpora are random unit vectors of the embedding model's
+dimension, so large sizes measure search cost without encoding millions of
+sentences first. A 10^6 sentence corpus needs roughly 1.5 GB for the
+embeddings plus the same again for the similarity matrix of one input.
+
+Results are printed as JSON (or written with --output) for tracking
+scaling curves across commits.
+
+Usage (from ml-service/):
+    python benchmarks/micro_bench.py --only plagiarism --corpus-sizes 100,1000,10000
+    python benchmarks/micro_bench.py --only opus,segmentation --output micro.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+
+
+ML_SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ML_SERVICE_DIR)
+
+SENTENCE = "The committee reviewed the proposal carefully before approving the final budget."
+BENCHMARKS = ("plagiarism", "opus", "segmentation")
+
+
+def measure(fn: Callable, repeats: int, warmup: int = 1) -> Dict:
+    """Time fn over several runs after warm-up; durations in milliseconds."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "repeats": repeats,
+        "mean_ms": statistics.mean(samples),
+        "median_ms": statistics.median(samples),
+        "min_ms": min(samples),
+        "max_ms": max(samples),
+        "stdev_ms": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    }
+
+
+def make_text(sentences: int) -> str:
+    return " ".join(SENTENCE for _ in range(sentences))
+
+
+def bench_plagiarism(corpus_sizes: List[int], input_sentences: int, repeats: int) -> List[Dict]:
+    from sklearn.metrics.pairwise import cosine_similarity
+    from app.models.schemas import PlagiarismCheckRequest
+    from app.services import plagiarism_service as module
+
+    service = module.plagiarism_service
+    if not isinstance(service, module.PlagiarismService):
+        # Proxied to a model host: measure a local instance instead
+        service = module.PlagiarismService()
+
+    request = PlagiarismCheckRequest(text=make_text(input_sentences))
+    input_embeddings = service.model.encode([SENTENCE] * input_sentences, convert_to_tensor=False, show_progress_bar=False)
+    dimension = input_embeddings.shape[1]
+    rng = np.random.default_rng(0)
+    results = []
+
+    for size in corpus_sizes:
+        corpus = rng.standard_normal((size, dimension), dtype=np.float32)
+        corpus /= np.linalg.norm(corpus, axis=1, keepdims=True)
+        service.corpus_embeddings = corpus
+        service.corpus_sentences = [f"Reference sentence {i}." for i in range(size)]
+        service.corpus_sources = [f"Source {i % 100}" for i in range(size)]
+
+        params = {"corpus_size": size, "input_sentences": input_sentences, "dimension": dimension}
+        results.append({
+            "benchmark": "plagiarism.check_plagiarism",
+            "params": params,
+            **measure(lambda: service.check_plagiarism(request), repeats),
+        })
+        results.append({
+            "benchmark": "plagiarism.similarity_search",
+            "params": params,
+            **measure(lambda: cosine_similarity(input_embeddings, corpus), repeats),
+        })
+        print(f"plagiarism corpus={size} done", file=sys.stderr)
+
+    return results
+
+
+def bench_opus(lengths: List[int], batch_sizes: List[int], pair: str, repeats: int) -> List[Dict]:
+    from app.services.translation_service import TranslationService
+
+    source, target = pair.split("-")
+    service = TranslationService()
+    model_data = service._load_model((source, target))
+    results = []
+
+    for length in lengths:
+        text = make_text(length)
+        results.append({
+            "benchmark": "opus.translate_with_opus",
+            "params": {"pair": pair, "sentences": length, "chars": len(text)},
+            **measure(lambda: service.translate_with_opus(text, source, target), repeats),
+        })
+        print(f"opus length={length} done", file=sys.stderr)
+
+    for batch_size in batch_sizes:
+        service.BATCH_SIZE = batch_size
+        texts = [SENTENCE] * batch_size
+        stats = measure(lambda: service._generate_opus(model_data, texts), repeats)
+        stats["per_item_ms"] = stats["mean_ms"] / batch_size
+        results.append({
+            "benchmark": "opus.generate_batch",
+            "params": {"pair": pair, "batch_size": batch_size},
+            **stats,
+        })
+        print(f"opus batch={batch_size} done", file=sys.stderr)
+
+    return results
+
+
+SEGMENTATION_SENTENCES = {
+    "hi": "समिति ने अंतिम बजट को मंज़ूरी देने से पहले प्रस्ताव की सावधानी से समीक्षा की।",
+    "zh": "委员会在批准最终预算之前仔细审查了该提案。",
+}
+
+
+def bench_segmentation(sizes: List[int], repeats: int) -> List[Dict]:
+    from app.utils.segmentation import split_sentences
+
+    try:
+        import nltk
+
+        # NLTK >= 3.8.2 loads punkt_tab instead of the pickled punkt models
+        for resource in ("punkt", "punkt_tab"):
+            try:
+                nltk.data.find(f"tokenizers/{resource}")
+            except LookupError:
+                nltk.download(resource, quiet=True)
+        nltk.sent_tokenize("Probe.")
+    except (ImportError, LookupError):
+        nltk = None
+        print("nltk or its punkt data unavailable, skipping the sent_tokenize baseline", file=sys.stderr)
+
+    def record(name: str, language: str, text: str, fn: Callable):
+        stats = measure(fn, repeats)
+        stats["chars_per_ms"] = len(text) / stats["mean_ms"] if stats["mean_ms"] else None
+        results.append({
+            "benchmark": name,
+            "params": {"language": language, "sentences": size, "chars": len(text), "found": len(fn())},
+            **stats,
+        })
+
+    results = []
+    for size in sizes:
+        text = make_text(size)
+        if nltk is not None:
+            record("segmentation.nltk_sent_tokenize", "en", text, lambda: nltk.sent_tokenize(text))
+        record("segmentation.split_sentences", "en", text, lambda: split_sentences(text, "en"))
+        for language, sentence in SEGMENTATION_SENTENCES.items():
+            other = " ".join([sentence] * size)
+            record("segmentation.split_sentences", language, other, lambda: split_sentences(other, language))
+    return results
+
+
+def _ints(value: str) -> List[int]:
+    return [int(float(v)) for v in value.split(",") if v.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for model-side hot paths")
+    parser.add_argument("--only", default=",".join(BENCHMARKS), help="Comma-separated: plagiarism,opus,segmentation")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--corpus-sizes", default="100,1000,10000,100000,1000000")
+    parser.add_argument("--input-sentences", type=int, default=10, help="Sentences per plagiarism input")
+    parser.add_argument("--opus-pair", default="en-es")
+    parser.add_argument("--opus-lengths", default="1,5,20,50", help="Input lengths in sentences")
+    parser.add_argument("--opus-batch-sizes", default="1,4,8,16,32")
+    parser.add_argument("--segment-sizes", default="10,100,1000,10000", help="Text sizes in sentences")
+    parser.add_argument("--output", help="Write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    selected = [name.strip() for name in args.only.split(",") if name.strip()]
+    unknown = [name for name in selected if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"Unknown benchmarks: {', '.join(unknown)}")
+
+    results = []
+    if "plagiarism" in selected:
+        results += bench_plagiarism(_ints(args.corpus_sizes), args.input_sentences, args.repeats)
+    if "opus" in selected:
+        results += bench_opus(_ints(args.opus_lengths), _ints(args.opus_batch_sizes), args.opus_pair, args.repeats)
+    if "segmentation" in selected:
+        results += bench_segmentation(_ints(args.segment_sizes), args.repeats)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+        print(f"Wrote {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
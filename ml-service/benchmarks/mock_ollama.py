@@ -0,0 +1,195 @@
+"""
+Deterministic stand-in for the Ollama HTTP API used by the benchmarks.
+
+Serves /api/generate and /api/tags with replies derived only from the
+request, and sleeps for a simulated duration computed from configurable
+prompt/generation token rates, so load tests are repeatable without a GPU
+or a real model.
+
+Usage:
+    python benchmarks/mock_ollama.py --port 11500 --eval-tps 100 --parallel 2
+"""
+
+import argparse
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+
+
+class MockConfig:
+    """Latency model of the simulated server."""
+
+    def __init__(self, args):
+        self.base_latency = args.base_latency_ms / 1000.0
+        self.prompt_tps = args.prompt_tps
+        self.eval_tps = args.eval_tps
+        self.reply_tokens = args.reply_tokens
+        self.load_seconds = args.load_ms / 1000.0
+        self.models = args.models.split(",")
+        # Mirrors OLLAMA_NUM_PARALLEL: requests beyond it queue on the server
+        self.slots = threading.BoundedSemaphore(max(1, args.parallel))
+        self.loaded = set()
+        # Last system prompt per model: a repeat is a prefix-cache hit
+        self.cached_system = {}
+        self.lock = threading.Lock()
+
+
+def _tokens(text: str) -> int:
+    """Rough token count (~0.75 words per token)."""
+    return max(1, int(len(text.split()) / 0.75))
+
+
+def _seed(prompt: str) -> int:
+    return int(hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8], 16)
+
+
+def _from_schema(schema: Dict, prompt: str, seed: int):
+    """Build a deterministic value that satisfies a (simple) JSON schema."""
+    kind = schema.get("type")
+    if "enum" in schema:
+        return schema["enum"][seed % len(schema["enum"])]
+    if kind == "object":
+        return {
+            key: _from_schema(sub, prompt, seed + i)
+            for i, (key, sub) in enumerate(schema.get("properties", {}).items())
+        }
+    if kind == "array":
+        return []
+    if kind in ("number", "integer"):
+        low, high = schema.get("minimum", 0), schema.get("maximum", 100)
+        return low + seed % (int(high - low) + 1)
+    if kind == "boolean":
+        return bool(seed % 2)
+    return " ".join(prompt.split()[-20:])
+
+
+def _detection(seed: int) -> Dict:
+    ai = seed % 101
+    return {
+        "ai_probability": ai,
+        "human_probability": 100 - ai,
+        "label": "AI" if ai >= 50 else "Human",
+        "confidence": "Medium",
+        "reasoning": "mock",
+    }
+
+
+def _reply(payload: Dict, reply_tokens: int) -> str:
+    prompt = payload.get("prompt", "")
+    instructions = payload.get("system", "") + prompt
+    seed = _seed(prompt)
+    fmt = payload.get("format")
+    properties = fmt.get("properties", {}) if isinstance(fmt, dict) else {}
+    # AI detection replies must be self-consistent whichever way they are requested
+    if "ai_probability" in properties or (not properties and "ai_probability" in instructions):
+        return json.dumps(_detection(seed))
+    if properties:
+        return json.dumps(_from_schema(fmt, prompt, seed))
+    if fmt == "json" or "corrected_text" in instructions:
+        return json.dumps({"corrected_text": " ".join(prompt.split()[-20:]), "corrections": []})
+    words = prompt.split()
+    limit = int(payload.get("options", {}).get("num_predict", reply_tokens) or reply_tokens)
+    return " ".join(words[-min(limit, reply_tokens):])
+
+
+class MockOllamaHandler(BaseHTTPRequestHandler):
+    config: MockConfig = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, body: Dict):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/api/tags":
+            self._send_json(200, {"models": [{"name": name, "model": name} for name in self.config.models]})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path != "/api/generate":
+            self._send_json(404, {"error": "not found"})
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        config = self.config
+        model = payload.get("model", config.models[0])
+
+        with config.slots:
+            load = 0.0
+            system = payload.get("system", "")
+            with config.lock:
+                if model not in config.loaded:
+                    config.loaded.add(model)
+                    config.cached_system.pop(model, None)
+                    load = config.load_seconds
+                # Like Ollama, only the part after a cached prefix is evaluated
+                prefix_cached = bool(system) and config.cached_system.get(model) == system
+                config.cached_system[model] = system
+
+            if "prompt" not in payload:
+                # Load-only request (preload / keep-warm), as Ollama answers it
+                time.sleep(load)
+                self._send_json(200, {"model": model, "response": "", "done": True, "done_reason": "load"})
+                return
+
+            response = _reply(payload, config.reply_tokens)
+            prompt_tokens = _tokens(payload.get("prompt", ""))
+            if system and not prefix_cached:
+                prompt_tokens += _tokens(system)
+            eval_tokens = _tokens(response)
+            prompt_eval = prompt_tokens / config.prompt_tps
+            eval_time = eval_tokens / config.eval_tps
+            time.sleep(config.base_latency + load + prompt_eval + eval_time)
+
+        self._send_json(200, {
+            "model": model,
+            "response": response,
+            "done": True,
+            "load_duration": int(load * 1e9),
+            "prompt_eval_count": prompt_tokens,
+            "prompt_eval_duration": int(prompt_eval * 1e9),
+            "eval_count": eval_tokens,
+            "eval_duration": int(eval_time * 1e9),
+            "total_duration": int((config.base_latency + load + prompt_eval + eval_time) * 1e9),
+        })
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Deterministic mock Ollama server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11500)
+    parser.add_argument("--base-latency-ms", type=float, default=20, help="Fixed overhead per request")
+    parser.add_argument("--prompt-tps", type=float, default=2000, help="Prompt evaluation tokens per second")
+    parser.add_argument("--eval-tps", type=float, default=100, help="Generated tokens per second")
+    parser.add_argument("--reply-tokens", type=int, default=64, help="Words in free-text replies")
+    parser.add_argument("--load-ms", type=float, default=0, help="One-time load delay per model")
+    parser.add_argument("--parallel", type=int, default=2, help="Requests processed concurrently")
+    parser.add_argument("--models", default="mistral", help="Comma-separated models listed by /api/tags")
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
+    MockOllamaHandler.config = MockConfig(args)
+    server = ThreadingHTTPServer((args.host, args.port), MockOllamaHandler)
+    server.daemon_threads = True
+    print(f"Mock Ollama listening on http://{args.host}:{args.port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -6,12 +6,27 @@ if __name__ == "__main__":
     # Disable Hugging Face symlinks warning
     os.environ["HF_HUB_DISABLE_SYMLINKS_WARNING"] = "1"
     
+    # ML_ROLE=model-host starts the shared model process instead of the HTTP API.
+    # HTTP workers reach it through MODEL_HOST_ADDRESS.
+    if os.environ.get("ML_ROLE") == "model-host":
+        from app.services.model_host import serve
+        serve()
+        raise SystemExit(0)
+
     # Render provides a 'PORT' environment variable. 
     # We use that, or default to 8001 if running locally.
     port = int(os.environ.get("PORT", 8001))
+    workers = int(os.environ.get("WORKERS", 1))
+
     
     # Log startup information for debugging
     print(f"🚀 Starting ML Service on host=0.0.0.0 port={port}")
+    print(f"👷 Workers: {workers}")
+    if os.environ.get("MODEL_HOST_ADDRESS"):
+        # Fail before forking workers rather than on their first inference call
+        from app.services.model_host import validate_config
+        validate_config()
+        print(f"🧠 Models served by shared host at {os.environ['MODEL_HOST_ADDRESS']}")
     print(f"📊 Environment: {'Render (PORT=' + str(port) + ')' if os.environ.get('PORT') else 'Local (default port 8001)'}")
     
     uvicorn.run(
@@ -19,6 +34,7 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=port,  # Use the dynamic port
         reload=False, # Set reload to False for production/Render
+        workers=workers,
         log_level="info",
         access_log=True,
     )
\ No newline at end of file
@@ -0,0 +1,134 @@
+"""
+Train the stylometric AI-text classifier and export it for STYLOMETRY_MODEL_PATH.
+
+The service ships only hand-picked placeholder weights, which is why the
+stylometric fast path and stylometric calibration scoring stay off until a
+trained model is loaded. This script fits one on labelled text:
+
+- features: StylometricClassifier.extract_features, the same code the
+  service scores with (texts too short to score are skipped)
+- model: StandardScaler + LogisticRegression (scikit-learn)
+- report: held-out accuracy and ROC AUC, and for each fast-path threshold
+  the share of texts that would skip the LLM and how often those verdicts
+  are right, to choose AI_DETECTION_FAST_PATH_THRESHOLD
+- export: refit on all data, written as the JSON the classifier loads
+  (features, mean, scale, coef, intercept)
+
+Input is JSONL with one {"text": ..., "label": ...} object per line, label
+1/"ai" for AI-generated and 0/"human" for human-written text. Use English
+text from the sources the service will see; the features are
+English-specific.
+
+Usage (from ml-service/):
+    python scripts/train_stylometry.py --data labelled.jsonl --output stylometry_model.json
+    STYLOMETRY_MODEL_PATH=stylometry_model.json AI_DETECTION_FAST_PATH=true python run.py
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import List, Tuple
+
+import numpy as np
+
+
+ML_SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ML_SERVICE_DIR)
+
+from app.services.stylometry import StylometricClassifier  # noqa: E402
+
+LABELS = {"1": 1, "ai": 1, "true": 1, "0": 0, "human": 0, "false": 0}
+THRESHOLDS = (80, 85, 90, 95)
+
+
+def load_dataset(path: str, classifier: StylometricClassifier) -> Tuple[np.ndarray, np.ndarray, int]:
+    """Feature matrix, labels and the number of texts skipped as too short."""
+    rows: List[List[float]] = []
+    labels: List[int] = []
+    skipped = 0
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            label = LABELS.get(str(record.get("label")).lower())
+            if label is None:
+                raise ValueError(f"Line {line_number}: unknown label {record.get('label')!r}")
+            features = classifier.extract_features(record["text"])
+            if features is None:
+                skipped += 1
+                continue
+            rows.append([features[name] for name in classifier.feature_names])
+            labels.append(label)
+    return np.asarray(rows, dtype=np.float64), np.asarray(labels), skipped
+
+
+def threshold_report(probabilities: np.ndarray, labels: np.ndarray) -> List[dict]:
+    """Coverage and accuracy of fast-path verdicts per threshold (probabilities in 0-100)."""
+    report = []
+    for threshold in THRESHOLDS:
+        decided = (probabilities >= threshold) | (probabilities <= 100 - threshold)
+        correct = (probabilities[decided] >= 50) == labels[decided].astype(bool)
+        report.append({
+            "threshold": threshold,
+            "coverage": round(float(decided.mean()), 3),
+            "accuracy": round(float(correct.mean()), 3) if decided.any() else None,
+        })
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the stylometric AI-text classifier")
+    parser.add_argument("--data", required=True, help="JSONL with text and label per line")
+    parser.add_argument("--output", required=True, help="Model JSON to write")
+    parser.add_argument("--test-size", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    try:
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.metrics import accuracy_score, roc_auc_score
+        from sklearn.model_selection import train_test_split
+        from sklearn.preprocessing import StandardScaler
+    except ImportError:
+        sys.exit("scikit-learn is required: pip install scikit-learn")
+
+    classifier = StylometricClassifier(model_path="")
+    features, labels, skipped = load_dataset(args.data, classifier)
+    print(f"{len(labels)} texts ({int(labels.sum())} AI), {skipped} skipped as too short", file=sys.stderr)
+    if len(set(labels.tolist())) < 2:
+        sys.exit("Need both AI and human examples")
+
+    train_x, test_x, train_y, test_y = train_test_split(
+        features, labels, test_size=args.test_size, random_state=args.seed, stratify=labels
+    )
+    scaler = StandardScaler().fit(train_x)
+    model = LogisticRegression(max_iter=1000).fit(scaler.transform(train_x), train_y)
+    probabilities = model.predict_proba(scaler.transform(test_x))[:, 1] * 100
+    evaluation = {
+        "test_texts": len(test_y),
+        "accuracy": round(float(accuracy_score(test_y, probabilities >= 50)), 3),
+        "roc_auc": round(float(roc_auc_score(test_y, probabilities)), 3),
+        "fast_path": threshold_report(probabilities, test_y),
+    }
+
+    # The exported weights use every example
+    scaler = StandardScaler().fit(features)
+    model = LogisticRegression(max_iter=1000).fit(scaler.transform(features), labels)
+    exported = {
+        "features": classifier.feature_names,
+        "mean": scaler.mean_.tolist(),
+        "scale": scaler.scale_.tolist(),
+        "coef": model.coef_[0].tolist(),
+        "intercept": float(model.intercept_[0]),
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(exported, f, indent=2)
+
+    print(json.dumps(evaluation, indent=2))
+    print(f"Wrote {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
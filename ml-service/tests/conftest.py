@@ -0,0 +1,6 @@
+"""Shared test setup: make the app package importable from any working directory."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
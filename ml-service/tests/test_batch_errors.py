@@ -0,0 +1,42 @@
+"""Tests for the per-item error mapping of batch endpoints and jobs."""
+
+import pytest
+from fastapi import HTTPException
+
+from app.utils.batch import to_batch_response
+from app.utils.errors import error_detail
+
+
+@pytest.mark.parametrize("error, code, message", [
+    (ValueError("TEXT_TOO_LONG: Text exceeds 5000 characters"), "TEXT_TOO_LONG", "Text exceeds 5000 characters"),
+    (ValueError("DETECTION_FAILED:"), "DETECTION_FAILED", "DETECTION_FAILED"),
+    (ConnectionError("refused"), "LLM_UNAVAILABLE", "refused"),
+    (RuntimeError("boom"), "SERVICE_ERROR", "boom"),
+    # A colon alone does not make a code
+    (ValueError("Invalid value: 3"), "SERVICE_ERROR", "Invalid value: 3"),
+])
+def test_error_detail(error, code, message):
+    assert error_detail(error) == {"success": False, "error": code, "message": message}
+
+
+def test_error_detail_default_code():
+    assert error_detail(RuntimeError("boom"), default_code="JOB_FAILED")["error"] == "JOB_FAILED"
+
+
+def test_error_detail_keeps_http_exception_detail():
+    detail = {"success": False, "error": "UNSUPPORTED_LANGUAGE", "message": "xx"}
+    assert error_detail(HTTPException(status_code=400, detail=detail)) == detail
+
+
+def test_to_batch_response_keeps_request_order():
+    response = to_batch_response([{"text": "a"}, ValueError("EMPTY_TEXT: empty"), {"text": "c"}])
+    assert response.success is True
+    assert [(item.index, item.success) for item in response.results] == [(0, True), (1, False), (2, True)]
+    assert response.results[0].result == {"text": "a"}
+    assert response.results[0].error is None
+    assert response.results[1].result is None
+    assert response.results[1].error == {"success": False, "error": "EMPTY_TEXT", "message": "empty"}
+
+
+def test_to_batch_response_empty():
+    assert to_batch_response([]).results == []
@@ -0,0 +1,143 @@
+"""Tests for the streaming document pipeline."""
+
+import asyncio
+
+import pytest
+
+from app.services.document_service import DocumentService, DocumentTooLargeError
+
+
+def _service(chunk_chars=100, read_size=7, max_bytes=10 ** 6, max_in_flight=2):
+    service = DocumentService()
+    service.CHUNK_CHARS = chunk_chars
+    service.READ_SIZE = read_size
+    service.MAX_BYTES = max_bytes
+    service.MAX_IN_FLIGHT = max_in_flight
+    return service
+
+
+def _reader(data: bytes):
+    position = 0
+
+    async def read(n):
+        nonlocal position
+        piece = data[position:position + n]
+        position += len(piece)
+        return piece
+
+    return read
+
+
+def _chunks(service, text, language="en"):
+    async def collect():
+        return [chunk async for chunk in service.iter_chunks(_reader(text.encode("utf-8")), language)]
+
+    return asyncio.run(collect())
+
+
+def _check_chunks(service, text):
+    chunks = _chunks(service, text)
+    assert "".join(chunk for _, chunk in chunks) == text
+    for offset, chunk in chunks:
+        assert text[offset:offset + len(chunk)] == chunk
+        assert len(chunk) <= service.CHUNK_CHARS
+    return chunks
+
+
+def test_chunks_follow_sentences():
+    service = _service()
+    text = " ".join(f"This is sentence {i}." for i in range(40))
+    chunks = _check_chunks(service, text)
+    assert len(chunks) > 1
+    assert all(chunk.rstrip().endswith(".") for _, chunk in chunks)
+
+
+def test_multibyte_characters_split_across_reads():
+    service = _service(read_size=3)
+    text = "Ünïcödé tëxt. 日本語の文。 Ещё одно предложение. " * 10
+    _check_chunks(service, text)
+
+
+def test_long_run_without_sentence_ends_is_cut_at_whitespace():
+    service = _service(chunk_chars=50, read_size=64)
+    text = " ".join(["word"] * 500)
+    chunks = _check_chunks(service, text)
+    assert all(not chunk.startswith("ord") for _, chunk in chunks)
+
+
+def test_text_without_whitespace_is_cut_anywhere():
+    service = _service(chunk_chars=50, read_size=64)
+    _check_chunks(service, "x" * 1000)
+
+
+def test_empty_document_has_no_chunks():
+    assert _chunks(_service(), "") == []
+
+
+def test_document_too_large():
+    service = _service(max_bytes=20)
+    with pytest.raises(DocumentTooLargeError):
+        _chunks(service, "A sentence. " * 10)
+
+
+def _process(service, text, handler):
+    async def collect():
+        return [line async for line in service.process(_reader(text.encode("utf-8")), handler)]
+
+    return asyncio.run(collect())
+
+
+def test_process_yields_results_in_order():
+    service = _service(chunk_chars=30)
+    text = " ".join(f"Sentence number {i}." for i in range(10))
+
+    async def handler(chunk):
+        # The first chunk finishes last
+        await asyncio.sleep(0.05 if "number 0" in chunk else 0)
+        if "number 5" in chunk:
+            raise ValueError("CHUNK_FAILED: bad chunk")
+        return chunk.upper()
+
+    lines = _process(service, text, handler)
+    summary = lines.pop()
+    assert [line["index"] for line in lines] == list(range(len(lines)))
+    assert summary == {"done": True, "chunks": len(lines), "failed": 1}
+    for line in lines:
+        if "error" in line:
+            assert "number 5" in text[line["start"]:line["end"]]
+        else:
+            assert line["result"] == text[line["start"]:line["end"]].upper()
+
+
+def test_process_reports_too_large():
+    service = _service(max_bytes=20)
+
+    async def handler(chunk):
+        return chunk
+
+    lines = _process(service, "A sentence. " * 10, handler)
+    assert lines[-1]["done"] is False
+
+
+def test_closing_the_stream_cancels_pending_chunks():
+    service = _service(chunk_chars=30, max_in_flight=3)
+    text = " ".join(f"Sentence number {i}." for i in range(10))
+    started = []
+
+    async def handler(chunk):
+        started.append(asyncio.current_task())
+        # Only the first chunk completes
+        await asyncio.sleep(10 if len(started) > 1 else 0)
+        return chunk
+
+    async def disconnect():
+        stream = service.process(_reader(text.encode("utf-8")), handler)
+        first = await stream.__anext__()
+        await stream.aclose()
+        await asyncio.sleep(0)
+        return first
+
+    first = asyncio.run(disconnect())
+    assert first["index"] == 0
+    assert len(started) > 1
+    assert all(task.cancelled() for task in started[1:])
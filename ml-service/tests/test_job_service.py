@@ -0,0 +1,81 @@
+"""Tests for job deduplication, failure handling and expiry."""
+
+import threading
+
+from pydantic import BaseModel
+
+from app.services.job_service import JobService
+
+
+class EchoRequest(BaseModel):
+    text: str
+    tone: str = "neutral"
+
+
+def _wait(job):
+    job.future.result(timeout=5)
+    return job
+
+
+def test_job_completes_with_result():
+    service = JobService(workers=1, ttl=60)
+    job = _wait(service.submit("echo", lambda request: request.text.upper(), EchoRequest(text="hi")))
+    assert job.status == "completed"
+    assert job.to_dict()["result"] == "HI"
+    assert job.finished_at is not None
+    assert service.get(job.id) is job
+
+
+def test_identical_requests_share_a_job():
+    service = JobService(workers=2, ttl=60)
+    release = threading.Event()
+    calls = []
+
+    def slow(request):
+        calls.append(request)
+        release.wait(5)
+        return request.text
+
+    first = service.submit("echo", slow, EchoRequest(text="same"))
+    assert service.submit("echo", slow, EchoRequest(text="same")) is first
+    other_kind = service.submit("other", slow, EchoRequest(text="same"))
+    other_field = service.submit("echo", slow, EchoRequest(text="same", tone="formal"))
+    release.set()
+    for job in (first, other_kind, other_field):
+        _wait(job)
+    assert len({first.id, other_kind.id, other_field.id}) == 3
+    assert len(calls) == 3
+    # Completed jobs are reused too
+    assert service.submit("echo", slow, EchoRequest(text="same")) is first
+
+
+def test_failed_job_reports_error_and_is_retried():
+    service = JobService(workers=1, ttl=60)
+
+    def fail(request):
+        raise ValueError("LLM_UNAVAILABLE: Ollama is down")
+
+    job = _wait(service.submit("echo", fail, EchoRequest(text="x")))
+    assert job.status == "failed"
+    assert job.error["error"] == "LLM_UNAVAILABLE"
+
+    retry = service.submit("echo", lambda request: "ok", EchoRequest(text="x"))
+    assert retry is not job
+    assert _wait(retry).status == "completed"
+
+
+def test_finished_jobs_expire_after_ttl():
+    service = JobService(workers=1, ttl=60)
+    job = _wait(service.submit("echo", lambda request: "ok", EchoRequest(text="x")))
+    job.finished_at -= 61
+    assert service.get(job.id) is None
+    assert service.submit("echo", lambda request: "ok", EchoRequest(text="x")) is not job
+
+
+def test_pending_jobs_do_not_expire():
+    service = JobService(workers=1, ttl=0)
+    release = threading.Event()
+    job = service.submit("echo", lambda request: release.wait(5), EchoRequest(text="x"))
+    assert service.get(job.id) is job
+    release.set()
+    _wait(job)
@@ -0,0 +1,44 @@
+"""Tests for Ollama context and output sizing."""
+
+from app.config import OLLAMA_NUM_CTX
+from app.services.llm_budget import JSON_STOP, estimate_tokens, output_budget, size_options
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("word " * 30) == 41
+    # Long words without spaces count by characters
+    assert estimate_tokens("x" * 400) == 101
+
+
+def test_output_budget():
+    assert output_budget("detect", 10_000) == 256
+    assert output_budget("humanize", 10) == 128
+    assert output_budget("humanize", 1000) == 1664
+    assert output_budget("unknown", 10) == 512
+
+
+def test_num_ctx_is_fixed():
+    short = size_options("grammar", "Hi.", "Check: Hi.")
+    long = size_options("grammar", "word " * 300, "Check: " + "word " * 300)
+    assert short["num_ctx"] == long["num_ctx"] == OLLAMA_NUM_CTX
+    assert short["num_predict"] < long["num_predict"]
+
+
+def test_num_predict_is_clipped_to_the_context():
+    # The prompt alone overflows: the reply keeps its 64-token minimum
+    text = "word " * 4000
+    options = size_options("translate", text, text, num_ctx=4096)
+    assert options["num_ctx"] == 4096
+    assert options["num_predict"] == 64
+
+    # The reply gets whatever room the prompt leaves
+    text = "word " * 1000
+    prompt_tokens = estimate_tokens(text) + 32
+    options = size_options("translate", text, text, num_ctx=4096)
+    assert options["num_predict"] == 4096 - prompt_tokens
+
+
+def test_json_output_adds_stop_sequences():
+    assert size_options("detect", "Hi.", "Hi.", json_output=True)["stop"] == JSON_STOP
+    assert "stop" not in size_options("detect", "Hi.", "Hi.")
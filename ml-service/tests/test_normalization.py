@@ -0,0 +1,45 @@
+"""Tests for request text normalization."""
+
+import pytest
+
+from app.utils.normalization import analyze_text, normalize_text, strip_text
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("  hello   world  ", "hello world"),
+    ("line one\n\n\tline two", "line one line two"),
+    ("word , word!!!", "word, word!"),
+    ("Really ?!", "Really!"),
+    ("Wait...", "Wait."),
+    ("a ; b :c", "a; b:c"),
+])
+def test_normalize_text(text, expected):
+    assert normalize_text(text) == expected
+
+
+def test_normalize_text_is_idempotent():
+    once = normalize_text("  So ,  this is   it !! Right ?? ")
+    assert normalize_text(once) == once
+
+
+@pytest.mark.parametrize("blank", ["", "   ", "\n\t "])
+def test_blank_text_is_rejected(blank):
+    with pytest.raises(ValueError):
+        normalize_text(blank)
+    with pytest.raises(ValueError):
+        strip_text(blank)
+
+
+def test_strip_text_keeps_inner_whitespace():
+    assert strip_text("  a  b\n") == "a  b"
+
+
+def test_analyze_text():
+    text = normalize_text("First sentence here.  Second one ,  with a comma!")
+    analysis = analyze_text(text)
+    assert analysis.text == text
+    assert analysis.word_count == 8
+    assert [text[start:end] for start, end in analysis.sentences] == [
+        "First sentence here.",
+        "Second one, with a comma!",
+    ]
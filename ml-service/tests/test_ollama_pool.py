@@ -0,0 +1,115 @@
+"""Tests for Ollama backend routing, slots and ejection."""
+
+import threading
+import time
+
+import pytest
+
+from app.services.ollama_pool import NoBackendAvailable, OllamaPool, parse_model_pins
+
+A, B, C = "http://a:11434", "http://b:11434", "http://c:11434"
+
+
+def _pool(urls=(A, B), pins=None, **kwargs):
+    kwargs.setdefault("eject_failures", 2)
+    kwargs.setdefault("eject_seconds", 60)
+    # No background health checker
+    return OllamaPool(list(urls), pins=pins or {}, health_interval=0, **kwargs)
+
+
+def _backend(pool, url):
+    return next(b for b in pool.backends if b.url == url)
+
+
+def test_parse_model_pins():
+    assert parse_model_pins("llama3.2:1b=http://a:11434/, http://b:11434;bad;mistral=http://c:11434") == {
+        "llama3.2:1b": [A, B],
+        "mistral": [C],
+    }
+
+
+def test_routes_to_fewest_outstanding_then_lowest_latency():
+    pool = _pool()
+    pool.record_success(_backend(pool, A), 2.0)
+    pool.record_success(_backend(pool, B), 1.0)
+    assert pool.choose().url == B
+
+    _backend(pool, B).outstanding = 1
+    assert pool.choose().url == A
+
+
+def test_pins_and_exclusions():
+    pool = _pool((A, B, C), pins={"mistral": [C]})
+    assert pool.choose("mistral").url == C
+    assert pool.choose("llama", exclude=(_backend(pool, A), _backend(pool, B))).url == C
+    with pytest.raises(NoBackendAvailable):
+        pool.choose("mistral", exclude=(_backend(pool, C),))
+
+
+def test_consecutive_failures_eject_and_success_readmits():
+    pool = _pool()
+    a = _backend(pool, A)
+    pool.record_failure(a)
+    assert a.available
+    pool.record_failure(a)
+    assert not a.available
+    # Ejected backends are skipped even when idle
+    _backend(pool, B).outstanding = 5
+    assert pool.choose().url == B
+
+    pool.record_success(a, 0.5)
+    assert a.available and a.failures == 0
+
+
+def test_all_ejected_fails_open_to_first_back():
+    pool = _pool(eject_failures=1)
+    a, b = _backend(pool, A), _backend(pool, B)
+    pool.record_failure(a)
+    pool.record_failure(b)
+    a.ejected_until = time.monotonic() + 120
+    assert pool.choose().url == B
+
+
+def test_acquire_takes_slots_per_backend():
+    pool = _pool(max_concurrency=1)
+    with pool.acquire() as first, pool.acquire() as second:
+        assert {first.url, second.url} == {A, B}
+        assert first.outstanding == second.outstanding == 1
+    assert all(b.outstanding == 0 for b in pool.backends)
+
+
+def test_acquire_waits_for_a_free_slot():
+    pool = _pool((A,), max_concurrency=1)
+    acquired = threading.Event()
+
+    def second_request():
+        with pool.acquire():
+            acquired.set()
+
+    with pool.acquire():
+        thread = threading.Thread(target=second_request)
+        thread.start()
+        assert not acquired.wait(0.2)
+        assert pool.waiting == 1
+    assert acquired.wait(2)
+    thread.join()
+    assert pool.waiting == 0
+
+
+def test_requests_wait_instead_of_using_an_ejected_backend():
+    pool = _pool(max_concurrency=1, eject_failures=1)
+    pool.record_failure(_backend(pool, B))
+    routed = []
+
+    def second_request():
+        with pool.acquire() as backend:
+            routed.append(backend.url)
+
+    with pool.acquire() as backend:
+        assert backend.url == A
+        thread = threading.Thread(target=second_request)
+        thread.start()
+        time.sleep(0.2)
+        assert routed == []
+    thread.join(2)
+    assert routed == [A]
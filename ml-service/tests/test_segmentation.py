@@ -0,0 +1,71 @@
+"""Tests for sentence segmentation and unit splitting."""
+
+import pytest
+
+from app.utils.segmentation import split_sentences, split_units
+
+
+@pytest.mark.parametrize("language, text, expected", [
+    ("en", "Dr. Smith arrived. He sat down!", ["Dr. Smith arrived.", "He sat down!"]),
+    ("en", "We met J. R. Tolkien. It went well.", ["We met J. R. Tolkien.", "It went well."]),
+    ("en", "Use tools, e.g. hammers. Then rest.", ["Use tools, e.g. hammers.", "Then rest."]),
+    ("en", "It costs 3.5 dollars. fine. Really?", ["It costs 3.5 dollars. fine.", "Really?"]),
+    ("en", '"Stop." She left.', ['"Stop."', "She left."]),
+    ("de", "Das ist z.B. gut. Ja.", ["Das ist z.B. gut.", "Ja."]),
+    ("hi", "यह एक वाक्य है। यह दूसरा है।", ["यह एक वाक्य है।", "यह दूसरा है।"]),
+    ("ar", "هل أنت بخير؟ نعم.", ["هل أنت بخير؟", "نعم."]),
+    ("zh", "你好。今天很好！", ["你好。", "今天很好！"]),
+    ("ko", "안녕하세요. 반갑습니다。좋아요", ["안녕하세요.", "반갑습니다。", "좋아요"]),
+])
+def test_split_sentences(language, text, expected):
+    assert split_sentences(text, language) == expected
+
+
+def test_blank_line_ends_a_sentence():
+    assert split_sentences("A heading\n\nBody text here.") == ["A heading", "Body text here."]
+
+
+def test_unknown_language_uses_latin_rules():
+    assert split_sentences("One. Two.", "xx") == ["One.", "Two."]
+
+
+def _check_units(text, max_chars):
+    spans = split_units(text, max_chars)
+    previous_end = 0
+    for start, end in spans:
+        assert end - start <= max_chars
+        assert start >= previous_end
+        # Only whitespace is left out between units
+        assert not text[previous_end:start].strip()
+        previous_end = end
+    assert not text[previous_end:].strip()
+    return spans
+
+
+def test_short_paragraphs_are_units():
+    text = "First paragraph.\n\nSecond one."
+    assert [text[s:e] for s, e in _check_units(text, 100)] == ["First paragraph.", "Second one."]
+
+
+def test_long_paragraph_is_cut_between_sentences():
+    text = " ".join(f"Sentence number {i} is here." for i in range(20))
+    units = [text[s:e] for s, e in _check_units(text, 80)]
+    assert len(units) > 1
+    assert all(unit.endswith(".") for unit in units)
+
+
+def test_long_sentence_is_cut_at_whitespace():
+    text = " ".join(["word"] * 100) + "."
+    units = [text[s:e] for s, e in _check_units(text, 50)]
+    assert len(units) > 1
+    assert all(not unit.startswith("ord") for unit in units)
+
+
+def test_text_without_whitespace_is_cut_anywhere():
+    text = "x" * 250
+    assert [e - s for s, e in _check_units(text, 100)] == [100, 100, 50]
+
+
+def test_empty_text_has_no_units():
+    assert split_units("", 100) == []
+    assert split_units("  \n\n  ", 100) == []